@@ -8,10 +8,12 @@ def main():
     parser.add_argument('-o', '--output', required=True, help='输出目录')
     parser.add_argument('--source-language', default='zh-CN', help='源语言代码，默认为zh-CN')
     parser.add_argument('--config', default='configs/tongyi_qwen_config.yaml', help='配置文件路径')
+    parser.add_argument('--concurrency', type=int, default=None, help='并发翻译的行块数，默认读取配置 concurrency 或 1')
+    parser.add_argument('--resume', action='store_true', default=None, help='从输出目录中的任务日志继续上次中断的任务')
     
     args = parser.parse_args()
     
-    processor = CSVProcessor(args.config)
+    processor = CSVProcessor(args.config, concurrency=args.concurrency, resume=args.resume)
     processor.source_language = args.source_language
     
     try:
@@ -20,6 +20,29 @@ def run_tests():
     cmd = [
         sys.executable, "-m", "pytest", 
         "tests/test_translators.py", 
+        "tests/test_async_engine.py",
+        "tests/test_rate_limiter.py",
+        "tests/test_batching.py",
+        "tests/test_translation_memory.py",
+        "tests/test_translation_cache.py",
+        "tests/test_incremental.py",
+        "tests/test_json_stream.py",
+        "tests/test_journal.py",
+        "tests/test_dedupe.py",
+        "tests/test_adaptive_concurrency.py",
+        "tests/test_resilience.py",
+        "tests/test_pool.py",
+        "tests/test_http_transport.py",
+        "tests/test_mock_server.py",
+        "tests/test_microbench.py",
+        "tests/test_metrics.py",
+        "tests/test_token_budget.py",
+        "tests/test_fuzzy_memory.py",
+        "tests/test_glossary.py",
+        "tests/test_parallel_languages.py",
+        "tests/test_progress.py",
+        "tests/test_registry.py",
+        "tests/test_excel_source.py",
         "-v",
         "--tb=short",
         "--color=yes"
@@ -40,6 +63,51 @@ def run_tests():
         return 1
 
 
+def run_benchmarks(args):
+    """运行本地热路径的微基准测试并与保存的基线比较，参数透传给 tools/microbench.py"""
+    project_root = Path(__file__).parent
+
+    print("⏱️ 运行微基准测试...")
+    print("-" * 50)
+
+    cmd = [sys.executable, "tools/microbench.py"] + args
+    result = subprocess.run(cmd, cwd=project_root)
+
+    if result.returncode == 0:
+        print("\n✅ 未发现性能回退！")
+    else:
+        print(f"\n❌ 发现性能回退，退出代码：{result.returncode}")
+
+    return result.returncode
+
+
+def run_importtime(args):
+    """测量各入口的导入耗时并与预算比较，参数透传给 tools/importtime.py"""
+    project_root = Path(__file__).parent
+
+    print("⏱️ 测量入口导入耗时...")
+    print("-" * 50)
+
+    cmd = [sys.executable, "tools/importtime.py"] + args
+    result = subprocess.run(cmd, cwd=project_root)
+
+    if result.returncode == 0:
+        print("\n✅ 导入耗时在预算之内！")
+    else:
+        print(f"\n❌ 导入耗时超出预算，退出代码：{result.returncode}")
+
+    return result.returncode
+
+
 if __name__ == "__main__":
-    exit_code = run_tests()
+    # python run_tests.py --bench [--sizes 1k,100k] [--update-baseline]
+    # python run_tests.py --importtime [--entries main,bunny] [--update-budget]
+    if "--bench" in sys.argv:
+        exit_code = run_benchmarks([arg for arg in sys.argv[1:] if arg != "--bench"])
+    elif "--importtime" in sys.argv:
+        exit_code = run_importtime(
+            [arg for arg in sys.argv[1:] if arg != "--importtime"]
+        )
+    else:
+        exit_code = run_tests()
     sys.exit(exit_code)
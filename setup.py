@@ -16,6 +16,7 @@ requirements = [
     "PyYAML>=6.0.1",
     "volcenginesdkarkruntime>=1.0.11",
     "openai>=1.0.0",
+    "httpx>=0.23.0",
     "pandas>=1.3.0",
     "openpyxl>=3.0.0"
 ]
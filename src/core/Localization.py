@@ -1,59 +1,309 @@
 import argparse
+import asyncio
 import json
+import os
+import threading
+import time
 from pathlib import Path
 
+from ..translators.adaptive_concurrency import AdaptiveConcurrency
+from ..translators.metrics import RequestMetrics, start_exporter
 from ..translators.BaseTranslator import BaseTranslator, LocalizationConfig
+from ..translators.pool import PooledTranslator
+from ..translators.registry import get_translator_factory, register_translator
+from ..translators.resilience import write_dead_letters
+from ..translators.translation_cache import TranslationCache
+from .async_engine import AsyncTranslationEngine
+from .dedupe import Deduplicator
+from .incremental import IncrementalManifest, fingerprint
+from .journal import JobJournal, job_id
+from .json_stream import JsonObjectWriter, iter_json_object
+
+# 并发模式下检查取消请求的间隔（秒）
+CANCEL_POLL_INTERVAL = 0.1
+# 窗口内逐条完成翻译时报告进度的最短间隔（秒），窗口写出时总是报告
+PROGRESS_INTERVAL = 0.5
+
+
+class LocalizationCancelled(Exception):
+    """本地化任务被用户取消"""
 
 
 class TranslatorFactory:
     @staticmethod
     def create_translator(config: LocalizationConfig) -> BaseTranslator:
+        """按 model_type 从注册表创建翻译器，只导入所用提供商的模块与 SDK"""
         model_type = config.get_config("model_type", "Doubao")
+        return get_translator_factory(model_type)(config)
+
+
+# 号池的每个成员再通过工厂按各自的 model_type 创建
+register_translator(
+    "Pool", lambda config: PooledTranslator(config, TranslatorFactory.create_translator)
+)
 
-        translators = {
-            "Doubao",
-            "DeepSeek",
-            "Kimi",
-            "TongYi",
-            "TongYiQwen",
-        }
 
-        if model_type not in translators:
-            raise ValueError(f"Unsupported model type: {model_type}")
+class LanguageRun:
+    """
+    单个目标语言的一次流式生成：逐窗口写出 {lang}.json 并记录增量清单（仅增量模式）与任务日志；
+    窗口内每完成一条译文更新该语言的进度（按 progress_interval 限制报告频率），
+    写出窗口时再按实际写出的条目数报告
+    """
 
-        if model_type == "Doubao":
-            from ..translators.DoubaoTranslator import DoubaoTranslator
+    def __init__(
+        self,
+        lang: str,
+        output_dir: str,
+        manifest: IncrementalManifest = None,
+        journal: JobJournal = None,
+        total: int = None,
+        on_progress=None,
+        progress_interval: float = PROGRESS_INTERVAL,
+    ):
+        self.lang = lang
+        # 增量清单，非增量模式下为 None
+        self.manifest = manifest
+        self.journal = journal
+        # 源文件的条目总数、已完成（已写出或当前窗口内已翻译）的条目数与已写出的条目数
+        self.total = total
+        self.done = 0
+        self.written = 0
+        # 进度回调 on_progress(lang, 已完成条目数, 条目总数)，为 None 时打印到标准输出
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+        self._reported = None
+        self.started = time.monotonic()
+        self.elapsed = None
+        output_path = Path(output_dir) / f"{lang}.json"
+        self.stats = {"added": 0, "changed": 0, "unchanged": 0, "removed": 0}
+        self.matched = 0
+        if manifest is not None:
+            # 已有译文读入清单数据库用于按窗口比对，不在内存中保存
+            manifest.load_existing(lang, output_path)
+            manifest.begin(lang)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        self.writer = JsonObjectWriter(output_path)
 
-            return DoubaoTranslator(config)
-        elif model_type == "DeepSeek":
-            from ..translators.OpenAIBaseedTranslator import OpenAIBaseedTranslator
+    def plan(self, window: dict):
+        """
+        返回 (需要翻译的条目, 可复用的译文)；非增量模式下全部翻译，
+        任务日志中已完成且源文未变的条目直接复用
+        """
+        if self.manifest is not None:
+            reused, pending, stats = self.manifest.plan(window, self.lang)
+            self.matched += stats.pop("matched")
+            for name, count in stats.items():
+                self.stats[name] += count
+        else:
+            reused, pending = {}, window
+        if self.journal is not None:
+            remaining = {}
+            for key, content in pending.items():
+                translated_text = self.journal.lookup(
+                    self.lang, key, fingerprint(content)
+                )
+                if translated_text is None:
+                    remaining[key] = content
+                else:
+                    reused[key] = translated_text
+            pending = remaining
+        self._advance(len(reused))
+        return pending, reused
 
-            return OpenAIBaseedTranslator(config)
-        elif model_type == "Kimi":
-            from ..translators.OpenAIBaseedTranslator import OpenAIBaseedTranslator
+    def record(self, key: str, content: dict, translated_text: str):
+        """译文完成时立即写入任务日志并更新进度"""
+        if self.journal is not None:
+            self.journal.record(self.lang, key, fingerprint(content), translated_text)
+        self._advance(1)
 
-            return OpenAIBaseedTranslator(config)
-        elif model_type == "TongYi":
-            from ..translators.OpenAIBaseedTranslator import OpenAIBaseedTranslator
+    def _advance(self, count: int):
+        """窗口内完成 count 条，距上次报告超过 progress_interval 时报告进度"""
+        if not count:
+            return
+        self.done += count
+        now = time.monotonic()
+        if self._reported is None or now - self._reported >= self.progress_interval:
+            self._report_progress(now)
 
-            return OpenAIBaseedTranslator(config)
-        elif model_type == "TongYiQwen":
-            from ..translators.TongYiQwenTranslator import TongYiQwenTranslator
+    def _report_progress(self, now: float):
+        self._reported = now
+        if self.on_progress is not None:
+            self.on_progress(self.lang, self.done, self.total)
+        elif self.total:
+            print(
+                f"{self.lang}: {self.done}/{self.total} "
+                f"({int(self.done / self.total * 100)}%)"
+            )
 
-            return TongYiQwenTranslator(config)
-        else:
-            raise ValueError(f"Unsupported model type: {model_type}")
+    def emit(self, window: dict, translated: dict, reused: dict):
+        """按源顺序写出一个窗口的译文"""
+        translated_data = {
+            key: reused[key] if key in reused else translated[key]
+            for key in window.keys()
+        }
+        for key, translated_text in translated_data.items():
+            self.writer.write(key, translated_text)
+        if self.manifest is not None:
+            self.manifest.update(window, self.lang, translated_data)
+        if self.journal is not None:
+            self.journal.sync()
+        # 命中缓存的条目不经过 record，写出后按实际写出的条目数校正
+        self.written += len(window)
+        self.done = self.written
+        self._report_progress(time.monotonic())
+
+    def report(self) -> dict:
+        """该语言的条目数与耗时"""
+        return {
+            "entries": self.written,
+            "seconds": round(
+                (
+                    self.elapsed
+                    if self.elapsed is not None
+                    else time.monotonic() - self.started
+                ),
+                3,
+            ),
+        }
+
+    def finish(self):
+        self.writer.close()
+        self.elapsed = time.monotonic() - self.started
+        if self.manifest is not None:
+            self.stats["removed"] = (
+                self.manifest.existing_count(self.lang) - self.matched
+            )
+            self.manifest.commit(self.lang)
+            print(
+                f"Incremental {self.lang}: {self.stats['added']} added, "
+                f"{self.stats['changed']} changed, {self.stats['unchanged']} unchanged, "
+                f"{self.stats['removed']} removed"
+            )
+        print(
+            f"Generated localization for {self.lang} at {self.writer.path} "
+            f"({self.elapsed:.1f}s)"
+        )
+
+    def abort(self):
+        self.writer.abort()
 
 
 class LocalizationProcessor:
-    def __init__(self, config: LocalizationConfig):
+    REPORT_FILE = ".localization_report.json"
+    DEAD_LETTER_FILE = "dead_letters.jsonl"
+
+    def __init__(
+        self,
+        config: LocalizationConfig,
+        concurrency: int = None,
+        incremental: bool = None,
+        resume: bool = None,
+    ):
         self.config = config
         self.translator = TranslatorFactory.create_translator(config)
         self.use_cache = config.get_config("use_cache", False)
+        self.cache = TranslationCache.from_translator(config, self.translator)
+        if self.cache.fuzzy is not None:
+            # 模糊翻译记忆：相似原文的已有译文作为参考示例随请求发送
+            self.translator.reference_source = self.cache.references
+        # 同时在途的最大请求数，1 表示按顺序逐条翻译
+        self.concurrency = int(
+            concurrency if concurrency else config.get_config("concurrency", 1)
+        )
+        # 自适应并发：根据提供商的延迟与 429/5xx 反馈在 concurrency 附近动态调整
+        self.controller = AdaptiveConcurrency.from_config(config, self.concurrency)
+        self.translator.concurrency_controller = self.controller
+        # 增量模式：只翻译相对上次输出新增或变化的键
+        self.incremental = bool(
+            incremental
+            if incremental is not None
+            else config.get_config("incremental", False)
+        )
+        # 断点续传：从任务日志恢复上次中断前已完成的翻译
+        self.resume = bool(
+            resume if resume is not None else config.get_config("resume", False)
+        )
+        # 相同的原文与注释只翻译一次
+        self.dedupe = Deduplicator(config.get_config("dedupe_memo_size", 10000))
+        # 流式处理时每次读入并翻译的条目数，内存占用与源文件大小无关
+        self.stream_window = max(1, int(config.get_config("stream_window", 2000)))
+        # 并发模式下同时处理的目标语言数，0 表示全部语言同时进行；
+        # 各语言共享同一个在途请求上限，先完成的语言立即写出输出文件
+        self.parallel_languages = max(
+            0, int(config.get_config("parallel_languages", 0) or 0)
+        )
+        # 多目标语言模式：并发模式下一次请求返回一批条目在所有目标语言下的译文，
+        # 系统提示词与原文只发送一次；各语言按窗口同步推进
+        self.multi_target = bool(config.get_config("multi_target", False))
+        # 每种语言的进度回调 on_progress(lang, 已完成条目数, 条目总数)，为 None 时打印进度；
+        # 窗口内按条目完成情况报告，两次报告至少间隔 progress_interval 秒
+        self.on_progress = None
+        self.progress_interval = PROGRESS_INTERVAL
+        # 本次运行各语言的条目数与耗时
+        self.languages = {}
+        # 读取源数据的函数 source_reader(source_path) -> 可迭代的 (key, {"text", "comment"})，
+        # 默认流式读取 JSON 文件；可以替换为其他来源（例如直接读取 Excel 的条目）
+        self.source_reader = iter_json_object
+        # 取消请求，可以从其他线程（例如 GUI）设置
+        self._cancel = threading.Event()
+        # 按提供商与语言统计请求指标，配置 metrics_port 时以 Prometheus 文本格式导出
+        self.metrics = RequestMetrics()
+        self.translator.metrics = self.metrics
+        self.cache.metrics = self.metrics
+        self.cache.provider = getattr(self.translator, "provider", self.cache.model)
+        start_exporter(config, self.metrics)
         print("translator created:", self.translator.model)
 
+    def _plan(self, value: dict, target_lang: str, style: str, is_use_comment: bool):
+        """
+        查询缓存，返回 (命中缓存的 {key: 译文}, 待翻译的键列表, 待翻译的 (text, comment) 列表)
+        """
+        cached = {}
+        keys = []
+        items = []
+        for content_key, content in value.items():
+            text = content["text"]
+            comment = content["comment"] if is_use_comment else None
+            cached_text = self.cache.get(text, comment, target_lang, style)
+            if cached_text is not None:
+                cached[content_key] = cached_text
+            else:
+                keys.append(content_key)
+                items.append((text, comment))
+        return cached, keys, items
+
+    def _merge(
+        self,
+        value: dict,
+        cached: dict,
+        keys: list,
+        items: list,
+        translations: list,
+        target_lang: str,
+        style: str,
+    ):
+        """写入缓存并按源文件的键顺序合并结果"""
+        results = {}
+        for content_key, (text, comment), translated_text in zip(
+            keys, items, translations
+        ):
+            self.cache.put(text, comment, target_lang, style, translated_text)
+            results[content_key] = translated_text
+
+        return {
+            content_key: (
+                cached[content_key] if content_key in cached else results[content_key]
+            )
+            for content_key in value.keys()
+        }
+
     def _process_value(
-        self, value: dict, target_lang: str, style: str, is_use_comment: bool
+        self,
+        value: dict,
+        target_lang: str,
+        style: str,
+        is_use_comment: bool,
+        on_translated=None,
     ):
         # 遍历字典，输入数据结构示例：
         # {
@@ -63,42 +313,453 @@ class LocalizationProcessor:
         #   }
         # }
         #
-        translated = {}
-        for content_key in value.keys():
-            content = value[content_key]
-            cache_key = self.translator._generate_hash_key(
-                content_key, target_lang, style
+        cached, keys, items = self._plan(value, target_lang, style, is_use_comment)
+        translations, unique, on_chunk = self._dedupe(
+            value, keys, items, target_lang, style, on_translated
+        )
+
+        # 支持批量请求的翻译器按 batch_size 与 token 预算打包
+        for start, end in self.translator.plan_batches(unique):
+            self._check_cancelled()
+            on_chunk(
+                start,
+                self.translator.translate_batch(unique[start:end], target_lang, style),
             )
-            if self.use_cache and cache_key in self.config.translation_cache:
-                translated[content_key] = self.config.translation_cache[cache_key]
-                continue
-            translated_text = self.translator.translate_text(
-                text=content["text"],
-                target_lang=target_lang,
-                style=style,
-                comment=content["comment"] if is_use_comment else None,
+
+        return self._merge(value, cached, keys, items, translations, target_lang, style)
+
+    async def _process_value_async(
+        self,
+        value: dict,
+        target_lang: str,
+        style: str,
+        is_use_comment: bool,
+        on_translated=None,
+        limiter: asyncio.Semaphore = None,
+    ):
+        """
+        _process_value 的并发版本，命中缓存的键不会发起请求；
+        limiter 为并行处理的各语言共享的在途请求上限
+        """
+        cached, keys, items = self._plan(value, target_lang, style, is_use_comment)
+        translations, unique, on_chunk = self._dedupe(
+            value, keys, items, target_lang, style, on_translated
+        )
+
+        engine = AsyncTranslationEngine(
+            self.translator, self.concurrency, self.controller, limiter
+        )
+        await engine.translate_items(unique, target_lang, style, on_chunk)
+
+        return self._merge(value, cached, keys, items, translations, target_lang, style)
+
+    def _use_multi_target(self, target_langs: list) -> bool:
+        """当前运行是否把多个目标语言合并在一次请求中"""
+        return (
+            self.multi_target
+            and getattr(self.translator, "IsSupportMultiTarget", False)
+            and len(target_langs) > 1
+        )
+
+    async def _process_values_multi_async(
+        self,
+        values: list,
+        target_langs: list,
+        style: str,
+        is_use_comment: bool,
+        recorders: list = None,
+        limiter: asyncio.Semaphore = None,
+    ) -> list:
+        """
+        多目标语言版本的 _process_value_async：values[i] 为 target_langs[i] 待翻译的条目，
+        相同的条目只发送一次，一次请求返回其缺少的所有语言的译文；
+        recorders[i] 为该语言的 on_translated。返回各语言按源顺序合并后的结果
+        """
+        planned = [
+            self._plan(value, lang, style, is_use_comment)
+            for value, lang in zip(values, target_langs)
+        ]
+        translations = [[""] * len(items) for _, _, items in planned]
+
+        def deliver(lang_index, position, translated_text):
+            translations[lang_index][position] = translated_text
+            if recorders:
+                content_key = planned[lang_index][1][position]
+                recorders[lang_index](
+                    content_key, values[lang_index][content_key], translated_text
+                )
+
+        # 唯一条目 -> {语言下标: 对应的位置}，本次运行中已翻译过的直接复用
+        needed = {}
+        unique = {}
+        requested = 0
+        for lang_index, (_, _, items) in enumerate(planned):
+            lang = target_langs[lang_index]
+            requested += len(items)
+            for position, item in enumerate(items):
+                translated_text = self.dedupe.lookup(item, lang, style)
+                if translated_text is not None:
+                    deliver(lang_index, position, translated_text)
+                    continue
+                item_key = self.dedupe.item_key(item)
+                unique.setdefault(item_key, item)
+                needed.setdefault(item_key, {}).setdefault(lang_index, []).append(
+                    position
+                )
+        self.dedupe.count(requested, sum(len(langs) for langs in needed.values()))
+
+        # 缺少的语言相同的条目合并为一组，每组一次请求所有缺少的语言
+        groups = {}
+        for item_key, langs in needed.items():
+            groups.setdefault(tuple(sorted(langs)), []).append(item_key)
+
+        engine = AsyncTranslationEngine(
+            self.translator, self.concurrency, self.controller, limiter
+        )
+
+        async def translate_group(lang_indices, item_keys):
+            langs = [target_langs[lang_index] for lang_index in lang_indices]
+            items = [unique[item_key] for item_key in item_keys]
+
+            def on_chunk(start, chunk):
+                for offset, result in enumerate(chunk):
+                    item_key = item_keys[start + offset]
+                    for lang_index, lang in zip(lang_indices, langs):
+                        translated_text = result.get(lang, "")
+                        self.dedupe.remember(
+                            unique[item_key], lang, style, translated_text
+                        )
+                        for position in needed[item_key][lang_index]:
+                            deliver(lang_index, position, translated_text)
+
+            if len(langs) == 1:
+                await engine.translate_items(
+                    items,
+                    langs[0],
+                    style,
+                    lambda start, chunk: on_chunk(
+                        start, [{langs[0]: text} for text in chunk]
+                    ),
+                )
+            else:
+                await engine.translate_items_multi(items, langs, style, on_chunk)
+
+        await asyncio.gather(
+            *(translate_group(langs, keys) for langs, keys in groups.items())
+        )
+        return [
+            self._merge(value, cached, keys, items, translations[index], lang, style)
+            for index, (value, lang, (cached, keys, items)) in enumerate(
+                zip(values, target_langs, planned)
             )
-            if translated_text.strip():
-                self.config.translation_cache[cache_key] = translated
-            translated[content_key] = translated_text
-        return translated
+        ]
+
+    def _dedupe(
+        self,
+        value: dict,
+        keys: list,
+        items: list,
+        target_lang: str,
+        style: str,
+        on_translated=None,
+    ):
+        """
+        归并相同的 (原文, 注释)，返回 (译文列表, 需要发送的唯一条目, on_chunk)；
+        唯一条目的译文通过 on_chunk(起始下标, 译文列表) 分发回每个对应的键
+        """
+        translations = [""] * len(items)
+
+        def deliver(position, translated_text):
+            translations[position] = translated_text
+            if on_translated:
+                content_key = keys[position]
+                on_translated(content_key, value[content_key], translated_text)
+
+        # 本次运行中已翻译过的相同条目直接复用
+        positions = []
+        for position, item in enumerate(items):
+            translated_text = self.dedupe.lookup(item, target_lang, style)
+            if translated_text is None:
+                positions.append(position)
+            else:
+                deliver(position, translated_text)
+
+        unique, groups = self.dedupe.group([items[p] for p in positions])
+        self.dedupe.count(len(items), len(unique))
+
+        def on_chunk(start, chunk):
+            for offset, translated_text in enumerate(chunk):
+                self.dedupe.remember(
+                    unique[start + offset], target_lang, style, translated_text
+                )
+                for member in groups[start + offset]:
+                    deliver(positions[member], translated_text)
+
+        return translations, unique, on_chunk
+
+    def _iter_windows(self, source_path: str):
+        """流式读取源数据，每次产出最多 stream_window 个条目"""
+        window = {}
+        for content_key, content in self.source_reader(source_path):
+            window[content_key] = content
+            if len(window) >= self.stream_window:
+                yield window
+                window = {}
+        if window:
+            yield window
+
+    def _count_entries(self, source_path: str) -> int:
+        """流式统计源数据的条目数，用于报告各语言的进度"""
+        return sum(1 for _ in self.source_reader(source_path))
+
+    def _language_run(
+        self,
+        lang: str,
+        output_dir: str,
+        manifest: IncrementalManifest,
+        journal: JobJournal,
+        total: int,
+    ) -> LanguageRun:
+        run = LanguageRun(
+            lang,
+            output_dir,
+            manifest,
+            journal,
+            total,
+            self.on_progress,
+            self.progress_interval,
+        )
+        self.languages[lang] = run
+        return run
+
+    def cancel(self):
+        """
+        请求停止当前运行，可以从其他线程调用；
+        已完成的语言保留输出文件，未完成语言已翻译的条目保存在任务日志与缓存中，可以断点续传
+        """
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def _check_cancelled(self):
+        if self._cancel.is_set():
+            raise LocalizationCancelled("本地化任务已取消")
+
+    async def _cancel_when_requested(self, tasks: list):
+        """收到取消请求时取消所有语言的任务，在途请求随之中止"""
+        while not self._cancel.is_set():
+            await asyncio.sleep(CANCEL_POLL_INTERVAL)
+        for task in tasks:
+            task.cancel()
+
+    def _open_manifest(self, output_dir: str, target_langs: list):
+        """
+        增量模式下打开输出目录中的增量清单；非增量模式不记录指纹，
+        只清除将被重新生成的语言的旧指纹
+        """
+        if self.incremental:
+            return IncrementalManifest(output_dir)
+        IncrementalManifest.invalidate(output_dir, target_langs)
+        return None
+
+    def _open_journal(self, source_path: str, output_dir: str, style: str):
+        """打开输出目录中的任务日志，源文件、风格、模型或提示词变化时不会恢复"""
+        return JobJournal(
+            Path(output_dir) / ".localization_journal.jsonl",
+            job_id(
+                os.path.abspath(source_path),
+                style,
+                self.cache.model,
+                self.cache.prompt_fingerprint,
+            ),
+            self.resume,
+        )
 
     def generate_localization(
         self, source_path: str, target_langs: list, output_dir: str, style: str = None
     ):
-        with open(source_path, "r", encoding="utf-8") as f:
-            source_data = json.load(f)
+        """
+        生成各目标语言的输出文件，调用 cancel() 后抛出 LocalizationCancelled；
+        取消请求在本次运行结束后清除，同一实例可以继续处理新任务
+        """
+        try:
+            if self.concurrency > 1 or self.controller is not None:
+                # 在常驻事件循环中运行，异步连接池在多次运行之间复用；
+                # 传输层依赖 httpx，使用时才导入
+                from ..translators.http_transport import run_async
 
-        for lang in target_langs:
-            translated_data = self._process_value(
-                source_data, lang, style, self.translator.IsUseComment
-            )
-            output_path = Path(output_dir) / f"{lang}.json"
+                run_async(
+                    self.generate_localization_async(
+                        source_path, target_langs, output_dir, style
+                    )
+                )
+            else:
+                self._generate_sequential(source_path, target_langs, output_dir, style)
+        finally:
+            self._cancel.clear()
+
+    def _generate_sequential(
+        self, source_path: str, target_langs: list, output_dir: str, style: str = None
+    ):
+        manifest = self._open_manifest(output_dir, target_langs)
+        journal = self._open_journal(source_path, output_dir, style)
+        self.translator.clear_dead_letters()
+        self.languages = {}
+        total = self._count_entries(source_path)
+
+        try:
+            for lang in target_langs:
+                run = self._language_run(lang, output_dir, manifest, journal, total)
+                try:
+                    for window in self._iter_windows(source_path):
+                        self._check_cancelled()
+                        pending, reused = run.plan(window)
+                        translated = self._process_value(
+                            pending,
+                            lang,
+                            style,
+                            self.translator.IsUseComment,
+                            run.record,
+                        )
+                        run.emit(window, translated, reused)
+                except BaseException:
+                    run.abort()
+                    raise
+                run.finish()
+        except BaseException:
+            journal.close()
+            print(f"任务已中断，可使用 --resume 从 {journal.path} 继续")
+            raise
+        finally:
+            if manifest is not None:
+                manifest.close()
+        journal.discard()
+        self._finish_run(output_dir, journal)
+
+    async def generate_localization_async(
+        self, source_path: str, target_langs: list, output_dir: str, style: str = None
+    ):
+        """
+        各目标语言作为独立的协程并行处理，共享同一个在途请求上限（自适应并发时为控制器），
+        每种语言完成后立即写出其输出文件，不必等待较慢的语言；
+        多目标语言模式下各语言按窗口同步推进，一次请求返回一批条目的所有语言
+        """
+        manifest = self._open_manifest(output_dir, target_langs)
+        journal = self._open_journal(source_path, output_dir, style)
+        self.translator.clear_dead_letters()
+        self.languages = {}
+        total = self._count_entries(source_path)
+        limiter = asyncio.Semaphore(self.concurrency)
+        lanes = asyncio.Semaphore(self.parallel_languages or max(1, len(target_langs)))
+
+        async def run_language(lang):
+            async with lanes:
+                run = self._language_run(lang, output_dir, manifest, journal, total)
+                try:
+                    for window in self._iter_windows(source_path):
+                        pending, reused = run.plan(window)
+                        translated = await self._process_value_async(
+                            pending,
+                            lang,
+                            style,
+                            self.translator.IsUseComment,
+                            run.record,
+                            limiter,
+                        )
+                        run.emit(window, translated, reused)
+                except BaseException:
+                    run.abort()
+                    raise
+                run.finish()
+
+        async def run_languages_together():
+            # 多目标语言模式：每个窗口一次请求所有语言，各语言的窗口同时写出
+            runs = [
+                self._language_run(lang, output_dir, manifest, journal, total)
+                for lang in target_langs
+            ]
+            try:
+                for window in self._iter_windows(source_path):
+                    plans = [run.plan(window) for run in runs]
+                    translated = await self._process_values_multi_async(
+                        [pending for pending, _ in plans],
+                        target_langs,
+                        style,
+                        self.translator.IsUseComment,
+                        [run.record for run in runs],
+                        limiter,
+                    )
+                    for run, (_, reused), result in zip(runs, plans, translated):
+                        run.emit(window, result, reused)
+            except BaseException:
+                for run in runs:
+                    run.abort()
+                raise
+            for run in runs:
+                run.finish()
 
-            with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(translated_data, f, ensure_ascii=False, indent=2)
+        if self._use_multi_target(target_langs):
+            tasks = [asyncio.ensure_future(run_languages_together())]
+        else:
+            tasks = [asyncio.ensure_future(run_language(lang)) for lang in target_langs]
+        watcher = asyncio.ensure_future(self._cancel_when_requested(tasks))
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # 一种语言失败或任务被取消时取消其余语言，已完成的语言保留输出文件
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            journal.close()
+            print(f"任务已中断，可使用 --resume 从 {journal.path} 继续")
+            if self._cancel.is_set():
+                raise LocalizationCancelled("本地化任务已取消") from None
+            raise
+        finally:
+            watcher.cancel()
+            if manifest is not None:
+                manifest.close()
+        journal.discard()
+        self._finish_run(output_dir, journal)
+
+    def run_report(self) -> dict:
+        """本次运行的统计报告"""
+        report = {
+            "cache": self.cache.stats(),
+            "dedupe": self.dedupe.stats(),
+            "dead_letters": len(self.translator.dead_letters),
+            "requests": self.metrics.report(),
+            "languages": {lang: run.report() for lang, run in self.languages.items()},
+        }
+        if self.controller is not None:
+            report["concurrency"] = self.controller.report()
+        if self.translator.glossary is not None:
+            report["glossary"] = self.translator.glossary_stats.report()
+        if isinstance(self.translator, PooledTranslator):
+            report["pool"] = self.translator.stats()
+        elif isinstance(self.translator, BaseTranslator):
+            report["token_budget"] = self.translator.token_budget.report()
+        return report
 
-            print(f"Generated localization for {lang} at {output_path}")
+    def _finish_run(self, output_dir: str, journal: JobJournal):
+        """打印统计信息并在输出目录写入运行报告"""
+        if journal.resumed:
+            print(f"从任务日志恢复 {journal.resumed} 条译文")
+        print(self.cache.summary())
+        print(self.dedupe.summary())
+        print(self.metrics.summary())
+        if self.translator.glossary is not None:
+            print(self.translator.glossary_stats.summary())
+        if self.controller is not None:
+            print(self.controller.summary())
+        write_dead_letters(
+            Path(output_dir) / self.DEAD_LETTER_FILE, self.translator.dead_letters
+        )
+        report_path = Path(output_dir) / self.REPORT_FILE
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(self.run_report(), f, ensure_ascii=False, indent=2)
 
 
 def main():
@@ -108,11 +769,34 @@ def main():
     )
     parser.add_argument("-o", "--output", required=True, help="Output directory")
     parser.add_argument("--config", default="config.yaml", help="Config file path")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Max in-flight requests per provider (default: config 'concurrency' or 1)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        default=None,
+        help="Only translate keys added or changed since the last run",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        default=None,
+        help="Resume an interrupted run from the job journal in the output directory",
+    )
 
     args = parser.parse_args()
 
     config = LocalizationConfig(args.config)
-    processor = LocalizationProcessor(config)
+    processor = LocalizationProcessor(
+        config,
+        concurrency=args.concurrency,
+        incremental=args.incremental,
+        resume=args.resume,
+    )
 
     try:
         processor.generate_localization(
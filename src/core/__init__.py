@@ -1,5 +1,9 @@
 """核心模块 - 包含主要的本地化处理逻辑"""
 
-from .Localization import LocalizationProcessor, TranslatorFactory
+from .Localization import (
+    LocalizationCancelled,
+    LocalizationProcessor,
+    TranslatorFactory,
+)
 
-__all__ = ["LocalizationProcessor", "TranslatorFactory"]
+__all__ = ["LocalizationCancelled", "LocalizationProcessor", "TranslatorFactory"]
@@ -0,0 +1,129 @@
+import asyncio
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..translators.adaptive_concurrency import AdaptiveConcurrency
+from ..translators.BaseTranslator import BaseTranslator
+
+
+class AsyncTranslationEngine:
+    """
+    异步并发翻译引擎
+
+    以固定数量的工作协程消费翻译任务，保证同一提供商同时在途的请求数不超过 concurrency，
+    翻译器支持批量请求时，每个任务包含按 batch_size 与 token 预算打包的一批文本，
+    支持多目标语言时一个任务可以同时请求多个目标语言；
+    结果按照任务的提交顺序返回，输出文件的键顺序与源文件保持一致；
+    提供自适应并发控制器时，同时在途的任务数由控制器根据提供商反馈动态调整；
+    多个引擎（例如并行处理的各目标语言）共享同一个 limiter 时，所有引擎合计的在途请求数不超过其上限
+    """
+
+    def __init__(
+        self,
+        translator: BaseTranslator,
+        concurrency: int = 8,
+        controller: AdaptiveConcurrency = None,
+        limiter: asyncio.Semaphore = None,
+    ):
+        """
+        初始化异步翻译引擎
+
+        参数:
+        translator (BaseTranslator): 翻译器实例
+        concurrency (int): 同时在途的最大请求数
+        controller (AdaptiveConcurrency): 自适应并发控制器，为 None 时使用固定并发数
+        limiter (asyncio.Semaphore): 多个引擎共享的全局并发上限，使用控制器时不生效
+        """
+        self.translator = translator
+        self.concurrency = max(1, int(concurrency))
+        self.controller = controller
+        self.limiter = limiter
+
+    async def _dispatch(self, items, plan, call, results, on_chunk=None):
+        """
+        以工作协程执行 plan 中的每个 [start, end) 区间：call(chunk) 返回该区间的结果，
+        写入 results 对应的位置，并以 (起始下标, 结果列表) 调用 on_chunk
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for start, end in plan:
+            queue.put_nowait((start, items[start:end]))
+
+        async def translate(chunk):
+            if self.controller is not None:
+                await self.controller.acquire_async()
+                try:
+                    return await call(chunk)
+                finally:
+                    self.controller.release()
+            if self.limiter is not None:
+                async with self.limiter:
+                    return await call(chunk)
+            return await call(chunk)
+
+        async def worker():
+            while True:
+                try:
+                    start, chunk = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                translations = await translate(chunk)
+                results[start : start + len(chunk)] = translations
+                if on_chunk:
+                    on_chunk(start, translations)
+
+        limit = self.controller.max_limit if self.controller else self.concurrency
+        workers = min(limit, queue.qsize())
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        return results
+
+    async def translate_items(
+        self,
+        items: List[Tuple[str, str]],
+        target_lang: str,
+        style: str,
+        on_chunk: Optional[Callable[[int, List[str]], None]] = None,
+    ) -> List[str]:
+        """
+        并发翻译一组文本
+
+        参数:
+        items (List[Tuple[str, str]]): (text, comment) 列表
+        target_lang (str): 目标语言
+        style (str): 翻译风格
+        on_chunk (Callable): 每个任务完成时以 (起始下标, 译文列表) 调用，用于即时记录结果
+
+        返回:
+        List[str]: 与 items 顺序一致的译文列表
+        """
+        return await self._dispatch(
+            items,
+            self.translator.plan_batches(items),
+            lambda chunk: self.translator.translate_batch_async(
+                chunk, target_lang, style
+            ),
+            [""] * len(items),
+            on_chunk,
+        )
+
+    async def translate_items_multi(
+        self,
+        items: List[Tuple[str, str]],
+        target_langs: List[str],
+        style: str,
+        on_chunk: Optional[Callable[[int, List[Dict[str, str]]], None]] = None,
+    ) -> List[Dict[str, str]]:
+        """
+        并发翻译一组文本到多个目标语言，每个任务一次请求返回一批文本在所有目标语言下的译文；
+        批次按目标语言数计算的 token 预算划分
+
+        返回:
+        List[Dict[str, str]]: 与 items 顺序一致的 {语言: 译文} 列表
+        """
+        return await self._dispatch(
+            items,
+            self.translator.plan_batches(items, len(target_langs)),
+            lambda chunk: self.translator.translate_multi_async(
+                chunk, target_langs, style
+            ),
+            [{lang: "" for lang in target_langs} for _ in items],
+            on_chunk,
+        )
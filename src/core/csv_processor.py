@@ -1,10 +1,19 @@
 import csv
-from typing import Dict, List, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Tuple
 import json
 from pathlib import Path
 import os
-from ..translators.TongYiQwenTranslator import TongYiQwenTranslator
-from ..core.Localization import LocalizationConfig
+from ..core.Localization import LocalizationConfig, TranslatorFactory
+from ..translators.adaptive_concurrency import AdaptiveConcurrency
+from ..translators.metrics import RequestMetrics, start_exporter
+from ..translators.resilience import write_dead_letters
+from ..translators.token_budget import TokenBudget
+from ..core.incremental import fingerprint
+from ..core.dedupe import Deduplicator
+from ..core.journal import JobJournal, job_id
+from ..translators.translation_cache import TranslationCache
 
 
 class CSVProcessor:
@@ -24,14 +33,54 @@ class CSVProcessor:
         "ru": "俄语",
     }
 
-    def __init__(self, config_path: str = "configs/tongyi_qwen_config.yaml"):
+    def __init__(
+        self,
+        config_path: str = "configs/tongyi_qwen_config.yaml",
+        concurrency: int = None,
+        resume: bool = None,
+    ):
         self.source_language = "zh-CN"  # 默认源语言
         self.target_languages = []
         self.data = {}
 
         # 初始化翻译器
         self.config = LocalizationConfig(config_path)
-        self.translator = TongYiQwenTranslator(self.config)
+        self.translator = TranslatorFactory.create_translator(self.config)
+        self.cache = TranslationCache.from_translator(self.config, self.translator)
+        if self.cache.fuzzy is not None:
+            # 模糊翻译记忆：相似原文的已有译文作为参考示例随请求发送
+            self.translator.reference_source = self.cache.references
+        # 按提供商与语言统计请求指标，配置 metrics_port 时以 Prometheus 文本格式导出
+        self.metrics = RequestMetrics()
+        self.cache.metrics = self.metrics
+        self.cache.provider = getattr(self.translator, "provider", self.cache.model)
+        start_exporter(self.config, self.metrics)
+        # 多目标语言模式：一次请求返回一行（或 multi_target_rows 行）的所有目标语言
+        self.multi_target = self.config.get_config("multi_target", True)
+        self.multi_target_rows = max(
+            1, int(self.config.get_config("multi_target_rows", 1))
+        )
+        # 并发翻译的行块数，1 为顺序处理
+        self.concurrency = max(
+            1,
+            int(
+                concurrency if concurrency else self.config.get_config("concurrency", 1)
+            ),
+        )
+        # 断点续传：从任务日志恢复上次中断前已完成的行
+        self.resume = bool(
+            resume if resume is not None else self.config.get_config("resume", False)
+        )
+        self.journal = None
+        # 相同的原文与注释只翻译一次
+        self.dedupe = Deduplicator(self.config.get_config("dedupe_memo_size", 10000))
+        # 自适应并发：根据提供商的延迟与 429/5xx 反馈动态调整在途的行块数
+        self.controller = AdaptiveConcurrency.from_config(self.config, self.concurrency)
+        # 重排缓冲区最多容纳的行块数，超过后等待最早的行块完成再继续读取
+        self.reorder_window = max(
+            self.controller.max_limit if self.controller else self.concurrency,
+            int(self.config.get_config("reorder_window", self.concurrency * 2)),
+        )
 
     def detect_languages(self, headers: List[str]) -> Tuple[List[str], int, int, int]:
         """
@@ -56,38 +105,200 @@ class CSVProcessor:
 
         return target_langs, id_index, source_index, comment_index
 
+    def read_headers(self, file_path: str) -> List[str]:
+        """
+        读取CSV表头并检测语言列
+        """
+        with open(file_path, "r", encoding="utf-8", newline="") as f:
+            headers = next(csv.reader(f))
+
+        # 检测语言列
+        self.target_languages, id_idx, source_idx, _ = self.detect_languages(headers)
+
+        if id_idx == -1 or source_idx == -1:
+            raise ValueError("CSV文件必须包含ID列和源语言列")
+        return headers
+
+    def iter_rows(self, file_path: str, id_idx: int) -> Iterator[List[str]]:
+        """
+        逐行读取CSV数据行（不含表头），跳过空行或无ID的行
+        """
+        with open(file_path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            next(reader, None)  # 跳过表头
+            for row in reader:
+                if not row or not row[id_idx].strip():
+                    continue
+                yield row
+
     def read_csv(self, file_path: str) -> Tuple[List[str], List[List[str]]]:
         """
         读取CSV文件并保留原始结构
         返回：(表头列表, 数据行列表)
         """
-        with open(file_path, "r", encoding="utf-8") as f:
-            reader = csv.reader(f)
-            headers = next(reader)  # 读取表头
+        headers = self.read_headers(file_path)
+        _, id_idx, _, _ = self.detect_languages(headers)
+        return headers, list(self.iter_rows(file_path, id_idx))
 
-            # 检测语言列
-            self.target_languages, id_idx, source_idx, comment_idx = (
-                self.detect_languages(headers)
+    @staticmethod
+    def _iter_blocks(
+        rows: Iterator[List[str]], block_size: int
+    ) -> Iterator[List[List[str]]]:
+        """把数据行按 block_size 分组"""
+        block = []
+        for row in rows:
+            block.append(row)
+            if len(block) >= block_size:
+                yield block
+                block = []
+        if block:
+            yield block
+
+    def use_multi_target(self) -> bool:
+        """当前翻译器是否使用多目标语言模式"""
+        return self.multi_target and self.translator.IsSupportMultiTarget
+
+    def _translate_rows(
+        self,
+        rows: List[List[str]],
+        target_langs: List[str],
+        lang_indices: Dict[str, int],
+        id_idx: int,
+        source_idx: int,
+        comment_idx: int,
+    ) -> List[List[str]]:
+        """
+        翻译一组数据行，返回填充了目标语言列的新行
+        """
+        use_comment = getattr(self.translator, "IsUseComment", True)
+        items = [
+            (
+                row[source_idx].strip(),
+                (
+                    row[comment_idx].strip()
+                    if comment_idx != -1 and use_comment
+                    else None
+                ),
             )
+            for row in rows
+        ]
+        # 创建新行，初始化为原始行的副本
+        new_rows = [row.copy() for row in rows]
 
-            if id_idx == -1 or source_idx == -1:
-                raise ValueError("CSV文件必须包含ID列和源语言列")
+        row_ids = [row[id_idx] for row in rows]
+        fingerprints = [
+            fingerprint({"text": source_text, "comment": comment})
+            for source_text, comment in items
+        ]
 
-            # 保存所有行数据
-            rows = []
-            for row in reader:
-                if not row or not row[id_idx].strip():  # 跳过空行或无ID的行
+        def record(index, lang, translated_text):
+            if self.journal is not None:
+                self.journal.record(
+                    lang, row_ids[index], fingerprints[index], translated_text
+                )
+
+        # 先查询任务日志、缓存与本次运行已翻译的相同文本，只翻译缺失的 (行, 语言)
+        missing = []
+        requested = 0
+        for index, (new_row, item) in enumerate(zip(new_rows, items)):
+            source_text, comment = item
+            missing_langs = []
+            for lang in target_langs:
+                cached_text = (
+                    self.journal.lookup(lang, row_ids[index], fingerprints[index])
+                    if self.journal is not None
+                    else None
+                )
+                if cached_text is None:
+                    cached_text = self.cache.get(source_text, comment, lang, "formal")
+                if cached_text is None:
+                    requested += 1
+                    cached_text = self.dedupe.lookup(item, lang, "formal")
+                    if cached_text is not None:
+                        record(index, lang, cached_text)
+                if cached_text is None:
+                    missing_langs.append(lang)
+                else:
+                    new_row[lang_indices[lang]] = cached_text
+            missing.append(missing_langs)
+
+        pending = [index for index, langs in enumerate(missing) if langs]
+        # 相同原文与注释的行只翻译一次，members 为每个唯一条目对应的行
+        unique, groups = self.dedupe.group([items[index] for index in pending])
+        members = [[pending[position] for position in group] for group in groups]
+        unique_langs = [
+            [
+                lang
+                for lang in target_langs
+                if any(lang in missing[i] for i in group_rows)
+            ]
+            for group_rows in members
+        ]
+        self.dedupe.count(requested, sum(len(langs) for langs in unique_langs))
+        if not pending:
+            return new_rows
+
+        def deliver(group, lang, translated_text):
+            source_text, comment = unique[group]
+            self.cache.put(source_text, comment, lang, "formal", translated_text)
+            self.dedupe.remember(unique[group], lang, "formal", translated_text)
+            for index in members[group]:
+                if lang in missing[index]:
+                    new_rows[index][lang_indices[lang]] = translated_text
+                    record(index, lang, translated_text)
+
+        # 每个唯一条目仍需逐语言翻译的语言，多目标翻译成功的语言从中移除
+        remaining = [list(langs) for langs in unique_langs]
+        if self.use_multi_target():
+            # 缺少的语言相同的条目合并为一组，每组只请求这些语言
+            lang_groups = {}
+            for group, langs in enumerate(unique_langs):
+                if len(langs) > 1:
+                    lang_groups.setdefault(tuple(langs), []).append(group)
+            for langs, group_ids in lang_groups.items():
+                try:
+                    results = self.translator.translate_multi(
+                        [unique[group] for group in group_ids], list(langs), "formal"
+                    )
+                except Exception as e:
+                    print(f"多语言翻译失败，改为逐语言翻译: {str(e)}")
                     continue
-                rows.append(row)
+                for group, translations in zip(group_ids, results):
+                    # 缺少某种语言的条目只对该语言逐语言重新请求
+                    for lang in langs:
+                        if lang in translations:
+                            deliver(group, lang, translations[lang])
+                            remaining[group].remove(lang)
 
-        return headers, rows
+        # 对每个目标语言进行翻译
+        for group, (source_text, comment) in enumerate(unique):
+            for lang in remaining[group]:
+                try:
+                    translated_text = self.translator.translate_text(
+                        text=source_text,
+                        target_lang=lang,
+                        style="formal",
+                        comment=comment,
+                    )
+                    deliver(group, lang, translated_text)
+                except Exception as e:
+                    row_id = row_ids[members[group][0]]
+                    print(f"翻译失败 (ID: {row_id}, 语言: {lang}): {str(e)}")
+                    for index in members[group]:
+                        if lang in missing[index]:
+                            new_rows[index][lang_indices[lang]] = ""  # 翻译失败时留空
+        return new_rows
 
     def process_file(self, csv_path: str, output_dir: str) -> None:
         """
         处理CSV文件并生成包含所有语言的CSV文件
+
+        逐块读取、翻译并写出数据行，内存占用与文件行数无关；
+        每个行块写出后立即刷新到磁盘，任务中断时已完成的行保留在输出文件中。
+        并发翻译时行块按完成顺序暂存在有界的重排缓冲区中，按源文件顺序写出
         """
-        # 读取CSV文件
-        headers, rows = self.read_csv(csv_path)
+        # 读取表头
+        headers = self.read_headers(csv_path)
 
         # 获取语言列索引映射
         lang_indices = {
@@ -107,54 +318,123 @@ class CSVProcessor:
         source_filename = os.path.basename(csv_path)
         output_file = output_path / source_filename
 
-        # 处理每一行，进行翻译
-        translated_rows = []
-        total_rows = len(rows)
-
-        for idx, row in enumerate(rows, 1):
-            if not row:  # 跳过空行
-                continue
-
-            # 获取源文本和注释
-            source_text = row[source_idx].strip()
-            comment = row[comment_idx].strip() if comment_idx != -1 else ""
-
-            # 创建新行，初始化为原始行的副本
-            new_row = row.copy()
-
-            # 对每个目标语言进行翻译
-            for lang, col_idx in lang_indices.items():
-                if lang != self.source_language:  # 跳过源语言
-                    try:
-                        translated_text = self.translator.translate_text(
-                            text=source_text,
-                            target_lang=lang,
-                            style="formal",
-                            comment=comment,
-                        )
-                        new_row[col_idx] = translated_text
-                    except Exception as e:
-                        print(f"翻译失败 (ID: {row[id_idx]}, 语言: {lang}): {str(e)}")
-                        new_row[col_idx] = ""  # 翻译失败时留空
-
-            translated_rows.append(new_row)
-            print(
-                f"\r处理进度: {idx}/{total_rows} ({int(idx/total_rows*100)}%)",
-                end="",
-                flush=True,
+        # 只统计行数用于显示进度，不保存行数据
+        total_rows = sum(1 for _ in self.iter_rows(csv_path, id_idx))
+        target_langs = [
+            lang for lang in lang_indices.keys() if lang != self.source_language
+        ]
+        block_size = self.multi_target_rows if self.use_multi_target() else 1
+        blocks = self._iter_blocks(self.iter_rows(csv_path, id_idx), block_size)
+
+        def translate(block):
+            return self._translate_rows(
+                block, target_langs, lang_indices, id_idx, source_idx, comment_idx
             )
 
-        print("\n")  # 换行
+        if self.controller is not None:
+            # 自适应并发：线程数取上限，实际在途的行块数由控制器动态调整
+            self.translator.concurrency_controller = self.controller
+            fixed_translate = translate
 
-        # 写入翻译后的文件
-        with open(output_file, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            # 写入表头
-            writer.writerow(headers)
-            # 写入翻译后的数据行
-            writer.writerows(translated_rows)
+            def translate(block):
+                self.controller.acquire()
+                try:
+                    return fixed_translate(block)
+                finally:
+                    self.controller.release()
+
+        workers = self.controller.max_limit if self.controller else self.concurrency
+        self.translator.metrics = self.metrics
+
+        self.journal = JobJournal(
+            output_path / f".{source_filename}.journal.jsonl",
+            job_id(
+                os.path.abspath(csv_path),
+                self.cache.model,
+                self.cache.prompt_fingerprint,
+            ),
+            self.resume,
+        )
+        if hasattr(self.translator, "clear_dead_letters"):
+            self.translator.clear_dead_letters()
+        dead_letters = getattr(self.translator, "dead_letters", [])
+        done = 0
+        try:
+            with open(output_file, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                # 写入表头
+                writer.writerow(headers)
+                f.flush()
+
+                def flush(translated_rows):
+                    nonlocal done
+                    writer.writerows(translated_rows)
+                    f.flush()
+                    done += len(translated_rows)
+                    print(
+                        f"\r处理进度: {done}/{total_rows} ({int(done/max(total_rows, 1)*100)}%)",
+                        end="",
+                        flush=True,
+                    )
+
+                if workers > 1:
+                    with ThreadPoolExecutor(max_workers=workers) as executor:
+                        # 重排缓冲区：按提交顺序保存未写出的行块
+                        in_flight = deque()
+                        for block in blocks:
+                            in_flight.append(executor.submit(translate, block))
+                            if len(in_flight) >= self.reorder_window:
+                                flush(in_flight.popleft().result())
+                        while in_flight:
+                            flush(in_flight.popleft().result())
+                else:
+                    for block in blocks:
+                        flush(translate(block))
+        except BaseException:
+            self.journal.close()
+            print(f"\n任务已中断，可使用 --resume 从 {self.journal.path} 继续")
+            raise
+        finally:
+            # 无论成功与否都保存翻译缓存
+            self.config.save_cache()
+        self.journal.discard()
+
+        print("\n")  # 换行
 
         print(f"处理完成！")
         print(f"检测到的目标语言：{', '.join(self.target_languages)}")
-        print(f"处理的记录数：{len(translated_rows)}")
+        print(f"处理的记录数：{done}")
         print(f"输出文件：{output_file}")
+        if self.journal.resumed:
+            print(f"从任务日志恢复 {self.journal.resumed} 条译文")
+        print(self.cache.summary())
+        print(self.dedupe.summary())
+        print(self.metrics.summary())
+        if getattr(self.translator, "glossary", None) is not None:
+            print(self.translator.glossary_stats.summary())
+        write_dead_letters(
+            output_path / f"{source_filename}.dead_letters.jsonl", dead_letters
+        )
+        if self.controller is not None:
+            print(self.controller.summary())
+        with open(
+            output_path / f"{source_filename}.report.json", "w", encoding="utf-8"
+        ) as f:
+            json.dump(self.run_report(), f, ensure_ascii=False, indent=2)
+
+    def run_report(self) -> dict:
+        """本次运行的统计报告"""
+        report = {
+            "cache": self.cache.stats(),
+            "dedupe": self.dedupe.stats(),
+            "dead_letters": len(getattr(self.translator, "dead_letters", [])),
+            "requests": self.metrics.report(),
+        }
+        if self.controller is not None:
+            report["concurrency"] = self.controller.report()
+        if getattr(self.translator, "glossary", None) is not None:
+            report["glossary"] = self.translator.glossary_stats.report()
+        budget = getattr(self.translator, "token_budget", None)
+        if isinstance(budget, TokenBudget):
+            report["token_budget"] = budget.report()
+        return report
@@ -0,0 +1,99 @@
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from ..translators.translation_cache import normalize_text
+
+
+class Deduplicator:
+    """
+    翻译请求去重
+
+    把原文与注释（规范化后）相同的条目归并为一个唯一条目，只发送一次请求，
+    再把译文分发给所有对应的键；同时用有界的 LRU 记住最近的译文，
+    跨窗口、跨行块重复出现的高频文本（"确定"、"取消"）同样只翻译一次
+    """
+
+    def __init__(self, memo_size: int = 10000):
+        """
+        初始化去重器
+
+        参数:
+        memo_size (int): 记住的最近译文数量上限，0 表示只在同一批条目内去重
+        """
+        self.memo_size = max(0, int(memo_size))
+        self.memo: "OrderedDict[tuple, str]" = OrderedDict()
+        self.requested = 0
+        self.dispatched = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def item_key(item: Tuple[str, Optional[str]]) -> tuple:
+        text, comment = item
+        return normalize_text(text), normalize_text(comment)
+
+    def lookup(self, item, target_lang: str, style: str) -> Optional[str]:
+        """查询本次运行中已经翻译过的相同条目"""
+        key = (self.item_key(item), target_lang, style)
+        with self._lock:
+            translated_text = self.memo.get(key)
+            if translated_text is not None:
+                self.memo.move_to_end(key)
+            return translated_text
+
+    def remember(self, item, target_lang: str, style: str, translated_text: str):
+        """记住译文，空译文（翻译失败）不记住"""
+        if not self.memo_size or not translated_text or not translated_text.strip():
+            return
+        key = (self.item_key(item), target_lang, style)
+        with self._lock:
+            self.memo[key] = translated_text
+            self.memo.move_to_end(key)
+            while len(self.memo) > self.memo_size:
+                self.memo.popitem(last=False)
+
+    def group(self, items: list) -> Tuple[list, List[List[int]]]:
+        """
+        把条目归并为唯一条目
+
+        返回:
+        Tuple[list, List[List[int]]]: (唯一条目列表, 每个唯一条目对应的原始下标列表)
+        """
+        unique = []
+        groups = []
+        index = {}
+        for position, item in enumerate(items):
+            key = self.item_key(item)
+            if key not in index:
+                index[key] = len(unique)
+                unique.append(item)
+                groups.append([])
+            groups[index[key]].append(position)
+        return unique, groups
+
+    def count(self, requested: int, dispatched: int):
+        """累计待翻译的条目数与实际发送的唯一条目数"""
+        with self._lock:
+            self.requested += requested
+            self.dispatched += dispatched
+
+    @property
+    def ratio(self) -> float:
+        """去重率：因重复而省去的条目占待翻译条目的比例"""
+        if not self.requested:
+            return 0.0
+        return 1 - self.dispatched / self.requested
+
+    def stats(self) -> dict:
+        return {
+            "requested": self.requested,
+            "dispatched": self.dispatched,
+            "deduplicated": self.requested - self.dispatched,
+            "ratio": round(self.ratio, 4),
+        }
+
+    def summary(self) -> str:
+        return (
+            f"去重: 待翻译 {self.requested} 条，实际发送 {self.dispatched} 条，"
+            f"合并重复 {self.requested - self.dispatched} 条，去重率 {self.ratio:.1%}"
+        )
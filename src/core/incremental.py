@@ -0,0 +1,207 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Tuple
+
+from ..translators.translation_cache import normalize_text
+from .json_stream import iter_json_object
+
+# 按键批量查询时每条 SQL 的最大参数数
+QUERY_CHUNK = 500
+
+
+def fingerprint(content: dict) -> str:
+    """计算源条目（原文 + 注释）的指纹"""
+    material = json.dumps(
+        [normalize_text(content.get("text")), normalize_text(content.get("comment"))],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
+
+
+class IncrementalManifest:
+    """
+    增量本地化清单
+
+    在输出目录的 SQLite 数据库中记录每种语言下每个键生成译文时的源文指纹，
+    下次运行时只翻译新增或源文/注释发生变化的键，已删除的键从输出中移除。
+    指纹与已有输出都保存在数据库中按窗口查询，内存占用与词条数量无关
+    """
+
+    FILE_NAME = ".localization_manifest.db"
+    # 早期版本保存的 JSON 清单，首次打开时迁移
+    LEGACY_FILE_NAME = ".localization_manifest.json"
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS manifest (
+            lang TEXT NOT NULL,
+            key TEXT NOT NULL,
+            fingerprint TEXT NOT NULL,
+            PRIMARY KEY (lang, key)
+        );
+        CREATE TABLE IF NOT EXISTS next_manifest (
+            lang TEXT NOT NULL,
+            key TEXT NOT NULL,
+            fingerprint TEXT NOT NULL,
+            PRIMARY KEY (lang, key)
+        );
+        CREATE TABLE IF NOT EXISTS existing (
+            lang TEXT NOT NULL,
+            key TEXT NOT NULL,
+            text TEXT,
+            PRIMARY KEY (lang, key)
+        );
+    """
+
+    def __init__(self, output_dir: str):
+        self.path = Path(output_dir) / self.FILE_NAME
+        self.legacy_path = Path(output_dir) / self.LEGACY_FILE_NAME
+        self._connection = None
+        # 并行生成的各语言共用同一个连接
+        self._lock = threading.RLock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._connection is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                connection = sqlite3.connect(str(self.path), check_same_thread=False)
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+                connection.executescript(self.SCHEMA)
+                self._connection = connection
+                self._migrate_legacy()
+            return self._connection
+
+    def _migrate_legacy(self):
+        """导入旧版 JSON 清单并删除原文件"""
+        if not self.legacy_path.exists():
+            return
+        with open(self.legacy_path, "r", encoding="utf-8") as f:
+            languages = json.load(f).get("languages", {})
+        with self._connection:
+            for lang, recorded in languages.items():
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO manifest (lang, key, fingerprint)"
+                    " VALUES (?, ?, ?)",
+                    ((lang, key, value) for key, value in recorded.items()),
+                )
+        self.legacy_path.unlink()
+
+    @classmethod
+    def invalidate(cls, output_dir: str, langs: Iterable[str]):
+        """
+        非增量运行重新生成了这些语言的输出，清除其指纹，
+        避免之后的增量运行把新输出与旧指纹对应起来
+        """
+        manifest = cls(output_dir)
+        if not manifest.path.exists() and not manifest.legacy_path.exists():
+            return
+        try:
+            with manifest.connection as connection:
+                for lang in langs:
+                    connection.execute("DELETE FROM manifest WHERE lang = ?", (lang,))
+        finally:
+            manifest.close()
+
+    def _lookup(self, table: str, column: str, lang: str, keys: list) -> dict:
+        found = {}
+        for start in range(0, len(keys), QUERY_CHUNK):
+            chunk = keys[start : start + QUERY_CHUNK]
+            rows = self.connection.execute(
+                f"SELECT key, {column} FROM {table}"
+                f" WHERE lang = ? AND key IN ({', '.join('?' * len(chunk))})",
+                [lang, *chunk],
+            )
+            found.update(rows)
+        return found
+
+    def load_existing(self, lang: str, output_path: str):
+        """把已有的 {lang}.json 流式读入数据库，生成期间按窗口查询"""
+        with self._lock, self.connection as connection:
+            connection.execute("DELETE FROM existing WHERE lang = ?", (lang,))
+            if Path(output_path).exists():
+                connection.executemany(
+                    "INSERT OR REPLACE INTO existing (lang, key, text) VALUES (?, ?, ?)",
+                    (
+                        (lang, key, value if isinstance(value, str) else None)
+                        for key, value in iter_json_object(output_path)
+                    ),
+                )
+
+    def existing_count(self, lang: str) -> int:
+        """已有输出中的键数"""
+        with self._lock:
+            return self.connection.execute(
+                "SELECT COUNT(*) FROM existing WHERE lang = ?", (lang,)
+            ).fetchone()[0]
+
+    def plan(self, source_data: dict, lang: str) -> Tuple[dict, dict, dict]:
+        """
+        对比源数据、清单与已有输出（load_existing 读入），可以对源文件按窗口分批调用
+
+        参数:
+        source_data (dict): 源数据（或其中一个窗口） {key: {"text", "comment"}}
+        lang (str): 目标语言
+
+        返回:
+        Tuple[dict, dict, dict]: (可复用的 {key: 译文}, 需要翻译的源数据子集, 统计信息)，
+        统计信息中的 matched 为已有输出中存在的键数
+        """
+        keys = list(source_data.keys())
+        with self._lock:
+            recorded = self._lookup("manifest", "fingerprint", lang, keys)
+            existing = self._lookup("existing", "text", lang, keys)
+        reused = {}
+        pending = {}
+        stats = {"added": 0, "changed": 0, "unchanged": 0, "matched": len(existing)}
+        for key, content in source_data.items():
+            translated_text = existing.get(key)
+            if (
+                isinstance(translated_text, str)
+                and translated_text.strip()
+                and recorded.get(key) == fingerprint(content)
+            ):
+                reused[key] = translated_text
+                stats["unchanged"] += 1
+            else:
+                pending[key] = content
+                stats["changed" if key in existing else "added"] += 1
+        return reused, pending, stats
+
+    def begin(self, lang: str):
+        """开始记录某个语言本次生成的指纹"""
+        with self._lock, self.connection as connection:
+            connection.execute("DELETE FROM next_manifest WHERE lang = ?", (lang,))
+
+    def update(self, source_data: dict, lang: str, translated_data: Dict[str, str]):
+        """记录本次生成的指纹，译文为空（翻译失败）的键不记录，下次运行会重新翻译"""
+        with self._lock, self.connection as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO next_manifest (lang, key, fingerprint)"
+                " VALUES (?, ?, ?)",
+                (
+                    (lang, key, fingerprint(content))
+                    for key, content in source_data.items()
+                    if (translated_data.get(key) or "").strip()
+                ),
+            )
+
+    def commit(self, lang: str):
+        """用本次记录的指纹替换该语言的清单，已删除的键随之移除"""
+        with self._lock, self.connection as connection:
+            connection.execute("DELETE FROM manifest WHERE lang = ?", (lang,))
+            connection.execute(
+                "INSERT INTO manifest (lang, key, fingerprint)"
+                " SELECT lang, key, fingerprint FROM next_manifest WHERE lang = ?",
+                (lang,),
+            )
+            connection.execute("DELETE FROM next_manifest WHERE lang = ?", (lang,))
+            connection.execute("DELETE FROM existing WHERE lang = ?", (lang,))
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+def job_id(*parts) -> str:
+    """根据源文件、模型、提示词等信息计算任务标识，用于判断日志是否属于同一任务"""
+    material = json.dumps([str(part) for part in parts], ensure_ascii=False)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
+
+
+class JobJournal:
+    """
+    追加写入的任务日志
+
+    每完成一个 (键, 语言) 的翻译就追加一行 JSON 并立即刷新，进程中断后已完成的结果不会丢失；
+    使用 resume 重新运行同一任务时，源文指纹未变的条目直接从日志恢复，不再发起请求。
+    任务全部完成后日志被删除
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: str, job: str, resume: bool = False):
+        """
+        初始化任务日志
+
+        参数:
+        path (str): 日志文件路径
+        job (str): 任务标识，与已有日志不一致时不会恢复
+        resume (bool): 是否从已有日志恢复，否则清空重新记录
+        """
+        self.path = Path(path)
+        self.job = job
+        self.completed: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        self.resumed = 0
+        self._lock = threading.Lock()
+
+        if resume and self.path.exists() and self._load():
+            self._file = open(self.path, "a", encoding="utf-8")
+            print(f"从任务日志恢复 {len(self.completed)} 条已完成的翻译: {self.path}")
+        else:
+            if resume and self.path.exists():
+                print(f"任务日志与当前任务不匹配，重新开始: {self.path}")
+            self.completed = {}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "w", encoding="utf-8")
+            self._write({"job": self.job, "version": self.VERSION})
+            self._file.flush()
+
+    def _load(self) -> bool:
+        """读取已有日志，返回是否属于当前任务；进程崩溃时写了一半的最后一行会被忽略"""
+        with open(self.path, "r", encoding="utf-8") as f:
+            try:
+                header = json.loads(f.readline())
+            except json.JSONDecodeError:
+                return False
+            if header.get("job") != self.job:
+                return False
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                self.completed[(record["l"], record["k"])] = (record["f"], record["t"])
+        return True
+
+    def _write(self, record: dict):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def lookup(self, lang: str, key: str, source_fingerprint: str) -> Optional[str]:
+        """查询已完成的译文，源文指纹变化时返回 None"""
+        entry = self.completed.get((lang, key))
+        if entry is None or entry[0] != source_fingerprint:
+            return None
+        self.resumed += 1
+        return entry[1]
+
+    def record(self, lang: str, key: str, source_fingerprint: str, translated_text):
+        """记录一条完成的译文，空译文（翻译失败）不记录，恢复时会重新翻译"""
+        if not translated_text or not str(translated_text).strip():
+            return
+        with self._lock:
+            self._write(
+                {"l": lang, "k": key, "f": source_fingerprint, "t": translated_text}
+            )
+            self._file.flush()
+
+    def sync(self):
+        """将日志落盘"""
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        """关闭日志并保留文件，供下次恢复"""
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def discard(self):
+        """任务完成后关闭并删除日志"""
+        if not self._file.closed:
+            self._file.close()
+        if self.path.exists():
+            self.path.unlink()
@@ -0,0 +1,136 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterator, Tuple
+
+_WHITESPACE = " \t\n\r"
+
+
+class _StreamBuffer:
+    """按块读取文件的缓冲区，记录是否已经读到文件末尾"""
+
+    def __init__(self, f, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.data = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """读入下一块数据，丢弃已经解析过的部分；文件结束时返回 False"""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.data = self.data[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def skip_whitespace(self) -> bool:
+        """跳过空白字符，返回是否还有可读字符"""
+        while True:
+            while self.pos < len(self.data) and self.data[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.data):
+                return True
+            if not self.fill():
+                return False
+
+    def expect(self, chars: str) -> str:
+        if not self.skip_whitespace():
+            raise ValueError(f"Unexpected end of JSON, expecting one of {chars!r}")
+        ch = self.data[self.pos]
+        if ch not in chars:
+            raise ValueError(f"Expecting one of {chars!r} at offset {self.pos}: {ch!r}")
+        self.pos += 1
+        return ch
+
+    def decode(self, decoder: json.JSONDecoder) -> Any:
+        """
+        解码下一个 JSON 值；数据不完整时继续读取。
+        值之后只剩空白时也会继续读取并重新解码，避免把被截断的数字当作完整值
+        """
+        self.skip_whitespace()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.data, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            rest = end
+            while rest < len(self.data) and self.data[rest] in _WHITESPACE:
+                rest += 1
+            if rest < len(self.data) or not self.fill():
+                self.pos = end
+                return value
+
+
+def iter_json_object(path: str, chunk_size: int = 1 << 16) -> Iterator[Tuple[str, Any]]:
+    """
+    流式遍历顶层为 JSON 对象的文件，逐个产出 (key, value)
+
+    参数:
+    path (str): JSON 文件路径
+    chunk_size (int): 每次读取的字符数
+
+    内存占用只与单个条目的大小有关，与文件中的条目数量无关
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = _StreamBuffer(f, chunk_size)
+        buffer.expect("{")
+        if not buffer.skip_whitespace():
+            raise ValueError("Unexpected end of JSON")
+        if buffer.data[buffer.pos] == "}":
+            return
+        while True:
+            key = buffer.decode(decoder)
+            if not isinstance(key, str):
+                raise ValueError(f"Expecting property name, got {key!r}")
+            buffer.expect(":")
+            value = buffer.decode(decoder)
+            yield key, value
+            if buffer.expect(",}") == "}":
+                return
+
+
+class JsonObjectWriter:
+    """
+    流式写出 JSON 对象，输出格式与 json.dump(..., ensure_ascii=False, indent=2) 一致
+
+    先写入临时文件，close() 时替换目标文件，中途出错可调用 abort() 丢弃临时文件
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self._file = open(self.tmp_path, "w", encoding="utf-8")
+        self.count = 0
+
+    def write(self, key: str, value: Any):
+        encoded = json.dumps(value, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+        prefix = "{\n  " if self.count == 0 else ",\n  "
+        self._file.write(f"{prefix}{json.dumps(key, ensure_ascii=False)}: {encoded}")
+        self.count += 1
+
+    def close(self):
+        self._file.write("\n}" if self.count else "{}")
+        self._file.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        self._file.close()
+        if self.tmp_path.exists():
+            self.tmp_path.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -0,0 +1,78 @@
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class ProgressTracker:
+    """
+    汇总各目标语言的进度，计算总体进度、吞吐量与预计剩余时间
+
+    只做计算，不依赖界面库；GUI 的后台任务在每次收到语言进度时调用 update，
+    把返回的快照通过信号发送给界面线程
+    """
+
+    def __init__(
+        self, languages: List[str], clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        参数:
+        languages (List[str]): 本次运行的目标语言
+        clock (Callable): 时钟函数，便于测试
+        """
+        self.clock = clock
+        self.started = clock()
+        # {语言: (已完成条目数, 条目总数)}，条目总数未知时为 None
+        self.languages: Dict[str, Tuple[int, Optional[int]]] = {
+            lang: (0, None) for lang in languages
+        }
+
+    def update(self, lang: str, done: int, total: Optional[int]) -> dict:
+        """记录某个语言的进度并返回当前快照"""
+        self.languages[lang] = (done, total)
+        return self.snapshot()
+
+    def snapshot(self) -> dict:
+        """
+        返回进度快照：
+        languages 为 {语言: {"done", "total"}}，done/total 为所有语言合计的条目数，
+        rate 为每秒完成的条目数，eta 为预计剩余秒数（尚无法估计时为 None）
+        """
+        elapsed = self.clock() - self.started
+        # 各语言条目总数相同，尚未报告进度的语言按已知的总数估计
+        known = [total for _, total in self.languages.values() if total is not None]
+        per_language = max(known) if known else None
+        done = sum(count for count, _ in self.languages.values())
+        total = (
+            sum(
+                per_language if lang_total is None else lang_total
+                for _, lang_total in self.languages.values()
+            )
+            if per_language is not None
+            else None
+        )
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if total is not None and rate > 0:
+            eta = max(0.0, (total - done) / rate)
+        return {
+            "languages": {
+                lang: {"done": count, "total": lang_total}
+                for lang, (count, lang_total) in self.languages.items()
+            },
+            "done": done,
+            "total": total,
+            "percent": int(done / total * 100) if total else 0,
+            "elapsed": elapsed,
+            "rate": rate,
+            "eta": eta,
+        }
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    """把秒数格式化为 1:02:03 或 02:03，无法估计时返回 --:--"""
+    if seconds is None:
+        return "--:--"
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes:02d}:{seconds:02d}"
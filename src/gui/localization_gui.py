@@ -17,13 +17,14 @@ from PySide6.QtWidgets import (
     QGroupBox,
     QListWidget,
     QAbstractItemView,
+    QProgressBar,
 )
-from PySide6.QtCore import Qt, QMimeData
+from PySide6.QtCore import Qt, QMimeData, QObject, QThread, Signal
 from PySide6.QtGui import QDragEnterEvent, QDropEvent
 import yaml
 import os
 
-from src.core.Localization import LocalizationProcessor, LocalizationConfig
+from src.core.progress import ProgressTracker, format_duration
 
 
 class DropArea(QWidget):
@@ -52,6 +53,84 @@ class DropArea(QWidget):
             self.label.setText(f"已选择文件: {os.path.basename(self.filepath)}")
 
 
+class LocalizationWorker(QObject):
+    """
+    在后台线程中运行本地化任务，通过信号向界面线程报告进度与结果
+
+    progress 信号携带 ProgressTracker 的快照以及缓存命中统计；
+    cancel() 可以直接从界面线程调用，任务在当前请求或窗口结束后停止
+    """
+
+    progress = Signal(dict)
+    finished = Signal(str)
+
+    def __init__(
+        self, config_path, source_path, target_langs, output_dir, processor=None
+    ):
+        super().__init__()
+        self.config_path = config_path
+        self.source_path = source_path
+        self.target_langs = target_langs
+        self.output_dir = output_dir
+        # 配置未变化时复用上次运行的处理器，翻译器、客户端与连接池保持不变
+        self.processor = processor
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+        if self.processor is not None:
+            self.processor.cancel()
+
+    def run(self):
+        # 本地化核心在后台线程中首次使用时才导入，窗口可以更快显示
+        from src.core.Localization import (
+            LocalizationCancelled,
+            LocalizationProcessor,
+            LocalizationConfig,
+        )
+
+        config = None
+        tracker = ProgressTracker(self.target_langs)
+        try:
+            if self.processor is None:
+                self.processor = LocalizationProcessor(
+                    LocalizationConfig(self.config_path)
+                )
+            config = self.processor.config
+            if self._cancelled:
+                self.processor.cancel()
+
+            def on_progress(lang, done, total):
+                snapshot = tracker.update(lang, done, total)
+                snapshot["cache"] = self.processor.cache.stats()
+                self.progress.emit(snapshot)
+
+            self.processor.on_progress = on_progress
+            self.processor.generate_localization(
+                source_path=self.source_path,
+                target_langs=self.target_langs,
+                output_dir=self.output_dir,
+                style="formal",
+            )
+            message = "本地化完成！"
+        except LocalizationCancelled:
+            message = "本地化已取消，已完成的语言已写出，勾选断点续传可继续未完成的部分"
+        except Exception as e:
+            message = f"本地化过程出错: {str(e)}"
+        finally:
+            # 无论成功、失败还是取消都保存翻译缓存
+            if config is not None:
+                config.save_cache()
+                # 每次运行都在新的 QThread 中进行，关闭本次运行各线程打开的
+                # 翻译记忆库连接，复用处理器的下次运行会重新打开
+                config.translation_cache.close_all()
+            # 清理临时配置文件
+            if self.config_path and os.path.exists(self.config_path):
+                os.remove(self.config_path)
+        print(message)
+        self.finished.emit(message)
+
+
 class LocalizationGUI(QMainWindow):
     MODEL_TYPES = {
         "通义千问": "TongYiQwen",
@@ -83,6 +162,11 @@ class LocalizationGUI(QMainWindow):
         self.config = {}
         self.ui_cache_path = os.path.join("cache", "ui_settings.yaml")
         self.localization_cache_path = os.path.join("cache", "localization.cache")
+        self.worker = None
+        self.worker_thread = None
+        # 上次运行的处理器及其配置，配置不变时再次运行直接复用
+        self.processor = None
+        self.processor_config = None
         self.load_config()
         self.load_ui_cache()
         self.initUI()
@@ -262,6 +346,11 @@ class LocalizationGUI(QMainWindow):
         clear_cache_btn.clicked.connect(self.clear_cache)
         cache_layout.addWidget(clear_cache_btn)
 
+        # 断点续传
+        self.resume = QCheckBox("断点续传")
+        self.resume.setToolTip("从输出目录中的任务日志继续上次中断的任务")
+        cache_layout.addWidget(self.resume)
+
         model_layout.addLayout(cache_layout)
 
         # 系统提示词
@@ -289,10 +378,29 @@ class LocalizationGUI(QMainWindow):
         lang_group.setLayout(lang_layout)
         main_layout.addWidget(lang_group)
 
-        # 开始按钮
-        start_btn = QPushButton("开始本地化")
-        start_btn.clicked.connect(self.start_localization)
-        main_layout.addWidget(start_btn)
+        # 开始与取消按钮
+        button_layout = QHBoxLayout()
+        self.start_btn = QPushButton("开始本地化")
+        self.start_btn.clicked.connect(self.start_localization)
+        button_layout.addWidget(self.start_btn)
+        self.cancel_btn = QPushButton("取消")
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self.cancel_localization)
+        button_layout.addWidget(self.cancel_btn)
+        main_layout.addLayout(button_layout)
+
+        # 进度显示：总体进度条、吞吐量与预计剩余时间、各语言进度
+        progress_group = QGroupBox("进度")
+        progress_layout = QVBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        progress_layout.addWidget(self.progress_bar)
+        self.stats_label = QLabel("尚未开始")
+        progress_layout.addWidget(self.stats_label)
+        self.language_progress = QLabel("")
+        progress_layout.addWidget(self.language_progress)
+        progress_group.setLayout(progress_layout)
+        main_layout.addWidget(progress_group)
 
         # 恢复保存的输出目录
         if self.config.get("output_dir"):
@@ -349,6 +457,7 @@ class LocalizationGUI(QMainWindow):
             "cache_path": self.localization_cache_path,
             "translation_style": "formal",
             "target_languages": self.get_selected_languages(),
+            "resume": self.resume.isChecked(),
         }
 
         # 处理系统提示词
@@ -378,42 +487,111 @@ class LocalizationGUI(QMainWindow):
             print("请至少选择一个目标语言！")
             return
 
-        # 创建临时配置文件
-        temp_config = self.create_config()
-        temp_config_path = "configs/temp_config.yaml"
+        if self.worker_thread is not None:
+            print("本地化任务正在进行中")
+            return
 
-        try:
-            # 保存临时配置
+        # 配置变化时创建临时配置文件，由后台任务重新创建处理器
+        temp_config = self.create_config()
+        temp_config_path = None
+        if temp_config != self.processor_config:
+            self.release_processor()
+            temp_config_path = "configs/temp_config.yaml"
+            os.makedirs(os.path.dirname(temp_config_path), exist_ok=True)
             with open(temp_config_path, "w", encoding="utf-8") as f:
                 yaml.dump(temp_config, f, allow_unicode=True)
-
-            # 创建本地化实例并运行
-            config = LocalizationConfig(temp_config_path)
-            processor = LocalizationProcessor(config)
-
-            # 执行本地化处理
-            processor.generate_localization(
-                source_path=self.drop_area.filepath,
-                target_langs=self.get_selected_languages(),
-                output_dir=self.output_path.text(),
-                style="formal",
-            )
-            print("本地化完成！")
-
-        except Exception as e:
-            print(f"本地化过程出错: {str(e)}")
-        finally:
-            config.save_cache()
-            print("缓存已保存。")
-            # 清理临时配置文件
-            if os.path.exists(temp_config_path):
-                os.remove(temp_config_path)
+            self.processor_config = temp_config
+
+        # 在后台线程中运行，界面保持响应
+        target_langs = self.get_selected_languages()
+        self.worker = LocalizationWorker(
+            temp_config_path,
+            self.drop_area.filepath,
+            target_langs,
+            self.output_path.text(),
+            self.processor,
+        )
+        self.worker_thread = QThread(self)
+        self.worker.moveToThread(self.worker_thread)
+        self.worker_thread.started.connect(self.worker.run)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.finished.connect(self.on_finished)
+        self.worker.finished.connect(self.worker_thread.quit)
+        self.worker_thread.finished.connect(self.on_thread_finished)
+
+        self.progress_bar.setValue(0)
+        self.stats_label.setText("正在准备...")
+        self.language_progress.setText(
+            "\n".join(f"{lang}: 等待中" for lang in target_langs)
+        )
+        self.start_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.worker_thread.start()
+
+    def cancel_localization(self):
+        """请求停止后台任务，已完成的语言与缓存会保留"""
+        if self.worker is not None:
+            self.worker.cancel()
+            self.cancel_btn.setEnabled(False)
+            self.stats_label.setText("正在取消...")
+
+    def on_progress(self, snapshot):
+        """更新总体进度、吞吐量、预计剩余时间、缓存命中与各语言进度"""
+        self.progress_bar.setValue(snapshot["percent"])
+        cache = snapshot["cache"]
+        total = snapshot["total"] if snapshot["total"] is not None else "?"
+        self.stats_label.setText(
+            f"总进度 {snapshot['done']}/{total}，"
+            f"{snapshot['rate']:.1f} 条/秒，"
+            f"已用 {format_duration(snapshot['elapsed'])}，"
+            f"预计剩余 {format_duration(snapshot['eta'])}，"
+            f"缓存命中 {cache['hits']} 条（模糊 {cache['fuzzy_hits']} 条），"
+            f"未命中 {cache['misses']} 条"
+        )
+        lines = []
+        for lang, progress in snapshot["languages"].items():
+            if progress["total"]:
+                percent = int(progress["done"] / progress["total"] * 100)
+                lines.append(
+                    f"{lang}: {progress['done']}/{progress['total']} ({percent}%)"
+                )
+            else:
+                lines.append(f"{lang}: 等待中")
+        self.language_progress.setText("\n".join(lines))
+
+    def on_finished(self, message):
+        self.stats_label.setText(message)
+        self.start_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+
+    def on_thread_finished(self):
+        self.processor = self.worker.processor
+        if self.processor is None:
+            self.processor_config = None
+        self.worker_thread.deleteLater()
+        self.worker.deleteLater()
+        self.worker_thread = None
+        self.worker = None
+
+    def release_processor(self):
+        """释放复用的处理器并关闭其缓存数据库在各线程中的连接"""
+        if self.processor is not None:
+            self.processor.config.translation_cache.close_all()
+        self.processor = None
+        self.processor_config = None
 
     def clear_cache(self):
         """清除本地化缓存文件"""
+        if self.worker_thread is not None:
+            print("本地化任务正在进行中")
+            return
+        self.release_processor()
         try:
             if os.path.exists(self.localization_cache_path):
-                os.remove(self.localization_cache_path)
+                # 同时清理 SQLite 翻译记忆库的 WAL 文件
+                for suffix in ("", "-wal", "-shm"):
+                    if os.path.exists(self.localization_cache_path + suffix):
+                        os.remove(self.localization_cache_path + suffix)
                 print("缓存已清除")
             else:
                 print("没有找到缓存文件")
@@ -422,8 +600,13 @@ class LocalizationGUI(QMainWindow):
             print(f"清除缓存失败: {str(e)}")
 
     def closeEvent(self, event):
-        """窗口关闭时保存界面设置"""
+        """窗口关闭时保存界面设置，并等待后台任务取消后保存缓存"""
         self.save_ui_cache()
+        if self.worker_thread is not None:
+            self.worker.cancel()
+            self.worker_thread.wait()
+            self.on_thread_finished()
+        self.release_processor()
         super().closeEvent(event)
 
 
@@ -1,13 +1,43 @@
 import argparse
+import asyncio
 import hashlib
 import json
+import threading
 import time
 from pathlib import Path
-from time import sleep
-from typing import Any, Dict
+from typing import Any, Dict, Generator, List, Tuple
 
 import yaml
 
+from .adaptive_concurrency import error_feedback
+from .glossary import GlossaryStats, get_glossary
+from .metrics import RequestMetrics, RequestTrace
+from .rate_limiter import default_shared_dir, estimate_tokens, get_rate_limiter
+from .resilience import (
+    FAIL_FAST,
+    RETRYABLE,
+    CircuitOpenError,
+    RetryPolicy,
+    classify_error,
+    failing_fast,
+    get_circuit_breaker,
+)
+from .token_budget import (
+    INSTRUCTION_TOKENS,
+    ITEM_OVERHEAD,
+    TokenBudget,
+    batch_size_from_config,
+)
+from .translation_memory import TranslationMemory
+
+# 翻译流程以生成器描述：产出需要执行的步骤，由 _run_flow / _run_flow_async
+# 执行后把结果（或请求异常）送回。规划、解析、拆分重试与降级只写一次，
+# 同步与异步版本只在执行请求的方式上不同。步骤为 (类型, 参数)：
+#   ("request", _request 的参数) -> 响应内容，失败时在 yield 处抛出异常
+#   ("text", translate_text 的参数) -> 单条译文
+#   ("flow", 子流程) -> 子流程的返回值
+Flow = Generator[Tuple[str, Any], Any, Any]
+
 
 class LocalizationConfig:
     """本地化配置管理类，负责加载配置和翻译缓存"""
@@ -19,6 +49,7 @@ class LocalizationConfig:
         参数:
         config_path (str): 配置文件路径，默认为config.yaml
         """
+        self.config_path = str(Path(config_path).resolve())
         self.config = self._load_config(config_path)
         self.cache_file = Path(self.config.get("cache_path", "translations.cache"))
         self.translation_cache = self._load_cache()
@@ -30,15 +61,13 @@ class LocalizationConfig:
         with open(path, "r", encoding="utf-8") as f:
             return yaml.safe_load(f)
 
-    def _load_cache(self) -> Dict[str, str]:
-        if self.cache_file.exists():
-            with open(self.cache_file, "r", encoding="utf-8") as f:
-                return json.load(f)
-        return {}
+    def _load_cache(self) -> TranslationMemory:
+        # 翻译记忆库按需打开，旧版 JSON 缓存会在首次访问时迁移
+        return TranslationMemory(self.cache_file)
 
     def save_cache(self):
-        with open(self.cache_file, "w", encoding="utf-8") as f:
-            json.dump(self.translation_cache, f, ensure_ascii=False)
+        # 译文在完成时已经写入，这里只需将 WAL 合并回数据库文件
+        self.translation_cache.flush()
 
 
 class BaseTranslator:
@@ -48,25 +77,759 @@ class BaseTranslator:
         self.base_url: str = config.get_config("base_url")
         self.api_key: str = config.get_config("api_key")
         self.model: str = config.get_config("model")
-        self.rate_limit: int = config.get_config("rate_limit", 3)  # 限制API请求频率
+        self.rate_limit: int = config.get_config("rate_limit", 3)  # 每分钟请求数上限
+        self.token_limit: int = config.get_config("token_limit")  # 每分钟token数上限
         self.temperature: float = config.get_config("temperature", 0.1)
         self.max_tokens = config.get_config("max_tokens", 1024)
         self.default_style = config.get_config(
             "translation_style", "formal"
         )  # 默认风格
-        self.last_request = 0
         self.IsUseComment: bool = True
+        self.IsSupportBatch: bool = False  # 是否支持多条文本打包请求
+        self.IsSupportMultiTarget: bool = False  # 是否支持一次请求返回多个目标语言
+        # 每次请求的条目数上限，实际打包的条目数同时受 token 预算限制
+        self.batch_size: int = batch_size_from_config(config)
+        # 按上下文窗口与输出上限规划批量请求，估算系数由实际 token 用量校正
+        self.token_budget = TokenBudget.from_config(config, self.max_tokens)
+        self._async_client = None
+        # 自适应并发控制器，由调度方设置，接收每次请求的延迟与错误反馈
+        self.concurrency_controller = None
+        # 按提供商与API Key共享的限流器，默认只在进程内共享；
+        # 开启 rate_limit_shared 后通过按配置文件区分的状态文件跨进程共享
+        shared_dir = None
+        if config.get_config("rate_limit_shared", False):
+            shared_dir = config.get_config("rate_limit_dir") or default_shared_dir(
+                getattr(config, "config_path", None)
+            )
+        self.rate_limiter = get_rate_limiter(
+            config.get_config("model_type", type(self).__name__),
+            self.api_key,
+            self.rate_limit,
+            self.token_limit,
+            shared_dir,
+        )
+        # 失败请求的分类重试与按提供商共享的熔断器
+        self.retry_policy = RetryPolicy(
+            config.get_config("max_retries", 3),
+            config.get_config("retry_base_delay", 1.0),
+            config.get_config("retry_max_delay", 30.0),
+        )
+        self.circuit_breaker = get_circuit_breaker(
+            config.get_config("model_type", type(self).__name__),
+            self.api_key,
+            config.get_config("circuit_failure_threshold", 5),
+            config.get_config("circuit_reset_timeout", 30.0),
+        )
+        # 重试后仍然失败的条目，输出中对应的译文为空
+        self.dead_letters: List[dict] = []
+        self._dead_letters_lock = threading.Lock()
+        # 相似原文的已有译文查询 (text, lang, style) -> [{"source", "target"}]，
+        # 由调度方在启用模糊翻译记忆时设置，作为参考示例随请求发送
+        self.reference_source = None
+        # 术语表：只为原文中出现的术语附带译法，并在本地检查译文
+        self.glossary = get_glossary(config)
+        self.glossary_stats = GlossaryStats()
+        # 请求指标，调度方可以替换为整个运行共享的实例
+        self.metrics = RequestMetrics()
+        self.provider = (
+            f"{config.get_config('model_type', type(self).__name__)}/{self.model}"
+        )
         print("BaseTranslator initialized:", self.model)
         pass
 
-    def _generate_hash_key(self, text: str, target_lang: str, style: str) -> str:
-        return hashlib.md5(f"{text}_{target_lang}_{style}".encode()).hexdigest()
+    @property
+    def prompt_fingerprint(self) -> str:
+        """提示词指纹：翻译器实现、系统提示词或术语表变化后，缓存中的旧译文不再命中"""
+        material = "|".join(
+            [
+                type(self).__name__,
+                self.config.get_config("system_prompt") or "",
+                str(self.IsUseComment),
+                self.glossary.digest if self.glossary is not None else "",
+            ]
+        )
+        return hashlib.md5(material.encode("utf-8")).hexdigest()
 
-    def translate_text(
+    def _estimate_tokens(self, text: str, comment: str = None) -> int:
+        """预估一次请求消耗的 token 数（输入 + 与原文等长的输出）"""
+        prompt = self.config.get_config("system_prompt") or ""
+        return (
+            estimate_tokens(prompt)
+            + estimate_tokens(comment)
+            + 2 * estimate_tokens(text)
+        )
+
+    def plan_batches(
+        self, items: List[Tuple[str, str]], langs: int = 1
+    ) -> List[Tuple[int, int]]:
+        """
+        将 (text, comment) 列表划分为连续的 [start, end) 区间，每个区间对应一次请求；
+        不支持批量请求时每条单独成为一个区间
+        """
+        if not self.IsSupportBatch:
+            return [(index, index + 1) for index in range(len(items))]
+        return self.token_budget.plan(
+            items, self._instruction_tokens(), langs, self.batch_size
+        )
+
+    def _instruction_tokens(self) -> int:
+        """批量请求中系统提示词与指令的 token 估计"""
+        system_prompt = self.config.get_config("system_prompt") or ""
+        return estimate_tokens(system_prompt) + INSTRUCTION_TOKENS
+
+    def _split_by_budget(
+        self, items: List[Tuple[str, str]], langs: int = 1
+    ) -> List[Tuple[int, int]]:
+        """条目数由调用方控制，这里只按 token 预算拆分"""
+        return self.token_budget.plan(items, self._instruction_tokens(), langs)
+
+    def _references(self, text: str, target_lang: str, style: str) -> List[dict]:
+        if self.reference_source is None:
+            return []
+        return self.reference_source(text, target_lang, style)
+
+    def _term_hint(self, text: str, target_lang: str) -> str:
+        """单条请求的术语提示，追加在用户消息之后"""
+        if self.glossary is None:
+            return ""
+        return self.glossary.hint(text, target_lang)
+
+    def _check_terms(self, text: str, target_lang: str, translation: str):
+        """检查译文是否使用了术语表规定的译法"""
+        if self.glossary is None or not translation:
+            return
+        missing = self.glossary.verify(text, target_lang, translation)
+        if missing is None:
+            return
+        if missing:
+            print(f"Glossary terms not applied ({target_lang}): {missing}")
+        self.glossary_stats.record(text, target_lang, translation, missing)
+
+    def _throttle(self, text: str, comment: str = None) -> int:
+        """限流控制，返回本次请求预约的 token 数"""
+        reserved = self._estimate_tokens(text, comment)
+        self.rate_limiter.acquire(reserved)
+        return reserved
+
+    async def _throttle_async(self, text: str, comment: str = None) -> int:
+        """异步限流控制，返回本次请求预约的 token 数"""
+        reserved = self._estimate_tokens(text, comment)
+        await self.rate_limiter.acquire_async(reserved)
+        return reserved
+
+    def _record_usage(self, reserved: int, completion, trace: RequestTrace = None):
+        """根据响应中的实际 token 用量校正限流器的预约值"""
+        usage = getattr(completion, "usage", None)
+        total_tokens = getattr(usage, "total_tokens", None)
+        if total_tokens:
+            self.rate_limiter.adjust_tokens(total_tokens - reserved)
+        if trace is not None and usage is not None:
+            trace.prompt_tokens = getattr(usage, "prompt_tokens", None) or 0
+            trace.completion_tokens = getattr(usage, "completion_tokens", None) or 0
+
+    def _build_payload(
         self, text: str, target_lang: str, style: str, comment: str
+    ) -> dict:
+        """构造单条翻译请求的参数，由子类实现"""
+        raise NotImplementedError
+
+    def _create_completion(self, payload: dict):
+        """发起同步请求并返回完整响应，由子类实现"""
+        raise NotImplementedError
+
+    async def _create_completion_async(self, payload: dict):
+        """发起异步请求，默认在线程中执行同步实现"""
+        return await asyncio.to_thread(self._create_completion, payload)
+
+    def _report(self, started: float, error: Exception = None):
+        """向自适应并发控制器反馈请求结果"""
+        controller = self.concurrency_controller
+        if controller is None:
+            return
+        if error is None:
+            controller.on_success(time.monotonic() - started)
+        else:
+            controller.on_error(*error_feedback(error), error=error)
+
+    def _retry_delay(self, error: Exception, started: float, attempt: int) -> float:
+        """
+        处理一次失败：反馈给并发控制器与熔断器，返回重试前的等待秒数；
+        不可重试或重试次数用尽时重新抛出异常
+        """
+        category = classify_error(error)
+        if isinstance(error, CircuitOpenError):
+            delay = error.retry_in
+        else:
+            self._report(started, error)
+            self.circuit_breaker.record_failure(category)
+            delay = self.retry_policy.delay(attempt, error_feedback(error)[1])
+        if category not in RETRYABLE or attempt >= self.retry_policy.max_retries:
+            raise error
+        if category in FAIL_FAST and failing_fast():
+            # 号池中还有其他成员可以接手，不在当前提供商上等待
+            raise error
+        print(f"Request failed ({category}), retry {attempt + 1} in {delay:.1f}s")
+        return delay
+
+    def _complete(self, payload: dict, trace: RequestTrace = None):
+        """发起请求并记录延迟与错误，可重试的错误按指数退避重试"""
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                self.circuit_breaker.check()
+                if attempt:
+                    self.rate_limiter.acquire(0)
+                completion = self._create_completion(payload)
+            except Exception as e:
+                time.sleep(self._retry_delay(e, started, attempt))
+                attempt += 1
+                if trace is not None:
+                    trace.retries = attempt
+                continue
+            self.circuit_breaker.record_success()
+            self._report(started)
+            if trace is not None:
+                trace.latency = time.monotonic() - started
+            return completion
+
+    async def _complete_async(self, payload: dict, trace: RequestTrace = None):
+        """_complete 的异步版本"""
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                self.circuit_breaker.check()
+                if attempt:
+                    await self.rate_limiter.acquire_async(0)
+                completion = await self._create_completion_async(payload)
+            except Exception as e:
+                await asyncio.sleep(self._retry_delay(e, started, attempt))
+                attempt += 1
+                if trace is not None:
+                    trace.retries = attempt
+                continue
+            self.circuit_breaker.record_success()
+            self._report(started)
+            if trace is not None:
+                trace.latency = time.monotonic() - started
+            return completion
+
+    def _calibrate(self, payload: dict, expected_output: int, trace: RequestTrace):
+        """用实际 token 用量校正 token 预算的估算系数"""
+        self.token_budget.observe(
+            self.token_budget.prompt_estimate(payload),
+            trace.prompt_tokens,
+            expected_output,
+            trace.completion_tokens,
+        )
+
+    def _request(
+        self,
+        payload: dict,
+        text: str,
+        comment: str,
+        lang: str,
+        items: int = 1,
+        expected_output: int = 0,
     ) -> str:
-        # 限流控制
-        elapsed = time.time() - self.last_request
-        if elapsed < 1 / self.rate_limit:
-            sleep(1 / self.rate_limit - elapsed)
-        pass
+        """
+        限流、发起请求并记录指标，返回响应内容；失败时抛出异常
+
+        expected_output 为预估的输出 token 数，用于校正 token 预算
+        """
+        trace = RequestTrace(self.provider, lang, items)
+        queued = time.monotonic()
+        reserved = self._throttle(text, comment)
+        trace.queue_wait = time.monotonic() - queued
+        try:
+            completion = self._complete(payload, trace)
+            self._record_usage(reserved, completion, trace)
+            self._calibrate(payload, expected_output, trace)
+            return completion.choices[0].message.content
+        except Exception as e:
+            trace.fail(e)
+            raise
+        finally:
+            self.metrics.observe(trace)
+
+    async def _request_async(
+        self,
+        payload: dict,
+        text: str,
+        comment: str,
+        lang: str,
+        items: int = 1,
+        expected_output: int = 0,
+    ) -> str:
+        """_request 的异步版本"""
+        trace = RequestTrace(self.provider, lang, items)
+        queued = time.monotonic()
+        reserved = await self._throttle_async(text, comment)
+        trace.queue_wait = time.monotonic() - queued
+        try:
+            completion = await self._complete_async(payload, trace)
+            self._record_usage(reserved, completion, trace)
+            self._calibrate(payload, expected_output, trace)
+            return completion.choices[0].message.content
+        except Exception as e:
+            trace.fail(e)
+            raise
+        finally:
+            self.metrics.observe(trace)
+
+    def _dead_letter(
+        self,
+        items: List[Tuple[str, str]],
+        target_langs,
+        style: str,
+        error: Exception,
+    ):
+        """记录重试后仍然失败的条目，替代静默的空译文"""
+        if isinstance(target_langs, str):
+            target_langs = [target_langs]
+        entries = [
+            {
+                "text": text,
+                "comment": comment,
+                "target_lang": lang,
+                "style": style,
+                "category": classify_error(error),
+                "error": str(error),
+            }
+            for text, comment in items
+            for lang in target_langs
+        ]
+        with self._dead_letters_lock:
+            self.dead_letters.extend(entries)
+
+    def clear_dead_letters(self):
+        """每次运行开始时清空上次运行的失败条目"""
+        with self._dead_letters_lock:
+            self.dead_letters.clear()
+
+    def _run_flow(self, flow: Flow):
+        """以同步请求执行翻译流程"""
+        reply, error = None, None
+        while True:
+            try:
+                step = flow.send(reply) if error is None else flow.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            reply, error = None, None
+            kind, args = step
+            if kind == "request":
+                try:
+                    reply = self._request(*args)
+                except Exception as e:
+                    error = e
+            elif kind == "text":
+                reply = self.translate_text(*args)
+            else:
+                reply = self._run_flow(args)
+
+    async def _run_flow_async(self, flow: Flow):
+        """_run_flow 的异步版本"""
+        reply, error = None, None
+        while True:
+            try:
+                step = flow.send(reply) if error is None else flow.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            reply, error = None, None
+            kind, args = step
+            if kind == "request":
+                try:
+                    reply = await self._request_async(*args)
+                except Exception as e:
+                    error = e
+            elif kind == "text":
+                reply = await self.translate_text_async(*args)
+            else:
+                reply = await self._run_flow_async(args)
+
+    def _text_flow(self, text: str, target_lang: str, style: str, comment: str) -> Flow:
+        payload = self._build_payload(text, target_lang, style, comment)
+        try:
+            translation = yield (
+                "request",
+                (
+                    payload,
+                    text,
+                    comment,
+                    target_lang,
+                    1,
+                    self.token_budget.output_estimate(text),
+                ),
+            )
+        except Exception as e:
+            print(f"Translation failed: {str(e)}")
+            self._dead_letter([(text, comment)], target_lang, style, e)
+            return ""  # 失败时返回空字符串，条目记录在 dead_letters 中
+        self._check_terms(text, target_lang, translation)
+        return translation
+
+    def translate_text(
+        self, text: str, target_lang: str, style: str = None, comment: str = None
+    ) -> str:
+        return self._run_flow(self._text_flow(text, target_lang, style, comment))
+
+    def _create_async_client(self):
+        """创建异步客户端，由支持原生异步请求的子类实现"""
+        raise NotImplementedError
+
+    @property
+    def async_client(self):
+        """当前事件循环对应的异步客户端（异步客户端的连接池与事件循环绑定）"""
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client[0] is not loop:
+            self._async_client = (loop, self._create_async_client())
+        return self._async_client[1]
+
+    async def translate_text_async(
+        self, text: str, target_lang: str, style: str = None, comment: str = None
+    ) -> str:
+        """translate_text 的异步版本"""
+        return await self._run_flow_async(
+            self._text_flow(text, target_lang, style, comment)
+        )
+
+    def _build_batch_payload(
+        self, items: List[Tuple[str, str]], target_lang: str, style: str
+    ) -> Tuple[dict, str]:
+        """
+        构造批量翻译请求，系统提示词每批只发送一次
+
+        返回:
+        Tuple[dict, str]: (请求参数, 用户消息内容)
+        """
+        system_prompt = self.config.get_config("system_prompt") or ""
+        batch = []
+        for index, (text, comment) in enumerate(items):
+            entry = {"id": str(index), "text": text}
+            if comment:
+                entry["comment"] = comment
+            references = self._references(text, target_lang, style)
+            if references:
+                entry["tm"] = references
+            if self.glossary is not None:
+                terms = self.glossary.terms_for(text, target_lang)
+                if terms:
+                    entry["terms"] = dict(terms)
+            batch.append(entry)
+        extras = []
+        if any("tm" in entry for entry in batch):
+            extras.append("tm（相似原文的已有译文，用于保持术语与句式一致）")
+        if any("terms" in entry for entry in batch):
+            extras.append("terms（术语及其必须使用的译法）")
+        instruction = (
+            f"用户会以JSON给出多条待翻译文本，每条包含id、text以及可选的comment"
+            f"{''.join('、' + extra for extra in extras)}。"
+            f"请参考comment将每条text直接翻译为{target_lang}"
+            f"{f'（翻译风格：{style}）' if style else ''}，"
+            f"只输出一个JSON对象，键为id，值为对应译文，不要输出其他内容。"
+        )
+        user_content = json.dumps(batch, ensure_ascii=False)
+
+        payload = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": f"{system_prompt}\n{instruction}"},
+                {"role": "user", "content": user_content},
+            ],
+            "temperature": self.temperature,
+            "max_tokens": self.token_budget.max_tokens(self._expected_output(items)),
+        }
+        if self.config.get_config("json_mode", True):
+            payload["response_format"] = {"type": "json_object"}
+        return payload, user_content
+
+    def _expected_output(self, items: List[Tuple[str, str]], langs: int = 1) -> int:
+        """批量请求的预估输出 token 数"""
+        return sum(
+            self.token_budget.output_estimate(text, langs, ITEM_OVERHEAD)
+            for text, _ in items
+        )
+
+    @staticmethod
+    def _parse_batch_response(content: str, count: int) -> Dict[int, str]:
+        """解析批量翻译的JSON响应，返回成功解析的 {序号: 译文}"""
+        if not content:
+            return {}
+        start = content.find("{")
+        end = content.rfind("}")
+        if start == -1 or end <= start:
+            return {}
+        try:
+            data = json.loads(content[start : end + 1])
+        except ValueError:
+            return {}
+        if not isinstance(data, dict):
+            return {}
+
+        result = {}
+        for index in range(count):
+            value = data.get(str(index))
+            if isinstance(value, str):
+                result[index] = value
+        return result
+
+    def _split_failed(
+        self, items: List[Tuple[str, str]], parsed: Dict[int, str]
+    ) -> List[List[int]]:
+        """
+        计算需要重试的分组：只重试缺失的条目；整批都失败时拆成两半，
+        保证每次重试的分组都严格变小
+        """
+        missing = [index for index in range(len(items)) if index not in parsed]
+        if not missing:
+            return []
+        if len(missing) < len(items):
+            return [missing]
+        half = len(items) // 2
+        return [missing[:half], missing[half:]]
+
+    def _batch_flow(
+        self, items: List[Tuple[str, str]], target_lang: str, style: str
+    ) -> Flow:
+        if not items:
+            return []
+        if not self.IsSupportBatch or len(items) == 1:
+            results = []
+            for text, comment in items:
+                results.append((yield ("text", (text, target_lang, style, comment))))
+            return results
+
+        plan = self._split_by_budget(items)
+        if len(plan) > 1:
+            # 超出 token 预算的批次按预算拆分，避免输出被截断
+            results = []
+            for start, end in plan:
+                results.extend(
+                    (
+                        yield (
+                            "flow",
+                            self._batch_flow(items[start:end], target_lang, style),
+                        )
+                    )
+                )
+            return results
+
+        payload, user_content = self._build_batch_payload(items, target_lang, style)
+        try:
+            content = yield (
+                "request",
+                (
+                    payload,
+                    user_content,
+                    None,
+                    target_lang,
+                    len(items),
+                    self._expected_output(items),
+                ),
+            )
+        except Exception as e:
+            # 请求本身在重试后仍然失败时拆分没有意义，整批进入 dead_letters
+            print(f"Batch translation failed: {str(e)}")
+            self._dead_letter(items, target_lang, style, e)
+            return [""] * len(items)
+
+        parsed = self._parse_batch_response(content, len(items))
+        for index, translation in parsed.items():
+            self._check_terms(items[index][0], target_lang, translation)
+        for group in self._split_failed(items, parsed):
+            retried = yield (
+                "flow",
+                self._batch_flow([items[index] for index in group], target_lang, style),
+            )
+            parsed.update(zip(group, retried))
+        return [parsed[index] for index in range(len(items))]
+
+    def translate_batch(
+        self, items: List[Tuple[str, str]], target_lang: str, style: str = None
+    ) -> List[str]:
+        """
+        批量翻译，将多条 (text, comment) 打包在一次请求中
+
+        响应格式错误或缺少部分条目时，只对失败的条目拆分重试，
+        单条时退化为 translate_text
+        """
+        return self._run_flow(self._batch_flow(items, target_lang, style))
+
+    async def translate_batch_async(
+        self, items: List[Tuple[str, str]], target_lang: str, style: str = None
+    ) -> List[str]:
+        """translate_batch 的异步版本"""
+        return await self._run_flow_async(self._batch_flow(items, target_lang, style))
+
+    def _build_multi_payload(
+        self, items: List[Tuple[str, str]], target_langs: List[str], style: str
+    ) -> Tuple[dict, str]:
+        """
+        构造多目标语言请求：一次请求返回每条文本在所有目标语言下的译文
+
+        返回:
+        Tuple[dict, str]: (请求参数, 用户消息内容)
+        """
+        system_prompt = self.config.get_config("system_prompt") or ""
+        rows = []
+        for index, (text, comment) in enumerate(items):
+            entry = {"id": str(index), "text": text}
+            if comment:
+                entry["comment"] = comment
+            if self.glossary is not None:
+                terms = {}
+                for lang in target_langs:
+                    for source, target in self.glossary.terms_for(text, lang):
+                        terms.setdefault(source, {})[lang] = target
+                if terms:
+                    entry["terms"] = terms
+            rows.append(entry)
+        has_terms = any("terms" in entry for entry in rows)
+        instruction = (
+            f"用户会以JSON给出多条待翻译文本，每条包含id、text以及可选的comment"
+            f"{'、terms（术语及其在各语言中必须使用的译法）' if has_terms else ''}。"
+            f"请参考comment将每条text分别直接翻译为以下语言：{', '.join(target_langs)}"
+            f"{f'（翻译风格：{style}）' if style else ''}。"
+            f"只输出一个JSON对象，键为id，值为以语言代码为键、译文为值的JSON对象，不要输出其他内容。"
+        )
+        user_content = json.dumps(rows, ensure_ascii=False)
+
+        payload = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": f"{system_prompt}\n{instruction}"},
+                {"role": "user", "content": user_content},
+            ],
+            "temperature": self.temperature,
+            "max_tokens": self.token_budget.max_tokens(
+                self._expected_output(items, len(target_langs))
+            ),
+        }
+        if self.config.get_config("json_mode", True):
+            payload["response_format"] = {"type": "json_object"}
+        return payload, user_content
+
+    @staticmethod
+    def _parse_multi_response(
+        content: str, count: int, target_langs: List[str]
+    ) -> Dict[int, Dict[str, str]]:
+        """解析多目标语言响应，只保留包含全部目标语言的条目"""
+        if not content:
+            return {}
+        start = content.find("{")
+        end = content.rfind("}")
+        if start == -1 or end <= start:
+            return {}
+        try:
+            data = json.loads(content[start : end + 1])
+        except ValueError:
+            return {}
+        if not isinstance(data, dict):
+            return {}
+
+        result = {}
+        for index in range(count):
+            value = data.get(str(index))
+            if isinstance(value, dict) and all(
+                isinstance(value.get(lang), str) for lang in target_langs
+            ):
+                result[index] = {lang: value[lang] for lang in target_langs}
+        return result
+
+    def _multi_flow(
+        self, items: List[Tuple[str, str]], target_langs: List[str], style: str
+    ) -> Flow:
+        if not items:
+            return []
+        if not self.IsSupportMultiTarget or len(target_langs) == 1:
+            return (
+                yield (
+                    "flow",
+                    self._multi_per_language_flow(items, target_langs, style),
+                )
+            )
+
+        plan = self._split_by_budget(items, len(target_langs))
+        if len(plan) > 1:
+            results = []
+            for start, end in plan:
+                results.extend(
+                    (
+                        yield (
+                            "flow",
+                            self._multi_flow(items[start:end], target_langs, style),
+                        )
+                    )
+                )
+            return results
+
+        payload, user_content = self._build_multi_payload(items, target_langs, style)
+        try:
+            # 多目标语言请求按语言列表记为一个序列
+            content = yield (
+                "request",
+                (
+                    payload,
+                    user_content,
+                    None,
+                    "+".join(target_langs),
+                    len(items),
+                    self._expected_output(items, len(target_langs)),
+                ),
+            )
+        except Exception as e:
+            print(f"Multi-target translation failed: {str(e)}")
+            self._dead_letter(items, target_langs, style, e)
+            return [{lang: "" for lang in target_langs} for _ in items]
+
+        parsed = self._parse_multi_response(content, len(items), target_langs)
+        for index, translations in parsed.items():
+            for lang, translation in translations.items():
+                self._check_terms(items[index][0], lang, translation)
+        if len(items) == 1 and not parsed:
+            # 单行仍然失败时逐语言翻译
+            return (
+                yield (
+                    "flow",
+                    self._multi_per_language_flow(items, target_langs, style),
+                )
+            )
+        for group in self._split_failed(items, parsed):
+            retried = yield (
+                "flow",
+                self._multi_flow(
+                    [items[index] for index in group], target_langs, style
+                ),
+            )
+            parsed.update(zip(group, retried))
+        return [parsed[index] for index in range(len(items))]
+
+    def _multi_per_language_flow(
+        self, items: List[Tuple[str, str]], target_langs: List[str], style: str
+    ) -> Flow:
+        """逐条逐语言翻译"""
+        results = []
+        for text, comment in items:
+            translations = {}
+            for lang in target_langs:
+                translations[lang] = yield ("text", (text, lang, style, comment))
+            results.append(translations)
+        return results
+
+    def translate_multi(
+        self, items: List[Tuple[str, str]], target_langs: List[str], style: str = None
+    ) -> List[Dict[str, str]]:
+        """
+        多目标语言翻译，一次请求返回若干行文本在所有目标语言下的译文
+
+        响应缺少的行会单独拆分重试；不支持该模式的翻译器（如 Qwen-MT 的
+        translation_options 一次只能指定一个目标语言）退化为逐语言请求
+        """
+        return self._run_flow(self._multi_flow(items, target_langs, style))
+
+    async def translate_multi_async(
+        self, items: List[Tuple[str, str]], target_langs: List[str], style: str = None
+    ) -> List[Dict[str, str]]:
+        """translate_multi 的异步版本"""
+        return await self._run_flow_async(self._multi_flow(items, target_langs, style))
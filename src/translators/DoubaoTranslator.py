@@ -1,8 +1,7 @@
-import time
-
-from volcenginesdkarkruntime import Ark
+from volcenginesdkarkruntime import Ark, AsyncArk
 
 from .BaseTranslator import BaseTranslator, LocalizationConfig
+from .http_transport import get_async_http_client, get_http_client
 
 
 class DoubaoTranslator(BaseTranslator):
@@ -12,13 +11,28 @@ class DoubaoTranslator(BaseTranslator):
 
     def __init__(self, config: LocalizationConfig):
         super().__init__(config)
-        self.client = Ark(base_url=self.base_url, api_key=self.api_key)
+        # 重试由 BaseTranslator 统一处理，关闭 SDK 自带的重试；连接池按 base_url 在进程内共享
+        self.client = Ark(
+            base_url=self.base_url,
+            api_key=self.api_key,
+            max_retries=0,
+            http_client=get_http_client(self.base_url, config),
+        )
+        self.IsSupportBatch = True
+        self.IsSupportMultiTarget = True
+
+    def _create_async_client(self):
+        return AsyncArk(
+            base_url=self.base_url,
+            api_key=self.api_key,
+            max_retries=0,
+            http_client=get_async_http_client(self.base_url, self.config),
+        )
 
-    def translate_text(
-        self, text: str, target_lang: str, style: str = "formal", comment: str = None
-    ) -> str:
-        super().translate_text(text, target_lang, style, comment)
-        payload = {
+    def _build_payload(
+        self, text: str, target_lang: str, style: str, comment: str
+    ) -> dict:
+        return {
             "model": self.model,
             "messages": [
                 {
@@ -28,30 +42,23 @@ class DoubaoTranslator(BaseTranslator):
                 },
                 {
                     "role": "user",
-                    "content": f"基于注释内容：{comment}，将以下文本直接翻译为{target_lang}: {text}",
+                    "content": f"基于注释内容：{comment}，将以下文本直接翻译为{target_lang}: {text}"
+                    + self._term_hint(text, target_lang),
                 },
             ],
             "temperature": self.temperature,
             "max_tokens": self.max_tokens,
         }
 
-        try:
-            completion = self.client.chat.completions.create(
-                model=payload["model"],
-                messages=payload["messages"],
-                # 开启推理会话应用层加密，访问 https://www.volcengine.com/docs/82379/1389905 了解更多
-                extra_headers={"x-is-encrypted": "true"},
-                max_tokens=payload["max_tokens"],
-                temperature=payload["temperature"],
-            )
-            self.last_request = time.time()
-
-            # 解析豆包API响应格式
-            return completion.choices[0].message.content
-        except KeyError:
-            print("Invalid API response format")
-        except Exception as e:
-            print(f"Translation failed: {str(e)}")
-
-        self.last_request = time.time()
-        return ""  # 失败时返回原文
+    def _create_completion(self, payload: dict):
+        return self.client.chat.completions.create(
+            **payload,
+            # 开启推理会话应用层加密，访问 https://www.volcengine.com/docs/82379/1389905 了解更多
+            extra_headers={"x-is-encrypted": "true"},
+        )
+
+    async def _create_completion_async(self, payload: dict):
+        return await self.async_client.chat.completions.create(
+            **payload,
+            extra_headers={"x-is-encrypted": "true"},
+        )
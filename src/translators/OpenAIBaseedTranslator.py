@@ -1,8 +1,7 @@
-import time
-
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from .BaseTranslator import BaseTranslator, LocalizationConfig
+from .http_transport import get_async_http_client, get_http_client
 
 
 class OpenAIBaseedTranslator(BaseTranslator):
@@ -12,13 +11,28 @@ class OpenAIBaseedTranslator(BaseTranslator):
 
     def __init__(self, config: LocalizationConfig):
         super().__init__(config)
-        self.client = OpenAI(base_url=self.base_url, api_key=self.api_key)
-
-    def translate_text(
-        self, text: str, target_lang: str, style: str = None, comment: str = None
-    ) -> str:
-        super().translate_text(text, target_lang, style, comment)
-        payload = {
+        # 重试由 BaseTranslator 统一处理，关闭 SDK 自带的重试；连接池按 base_url 在进程内共享
+        self.client = OpenAI(
+            base_url=self.base_url,
+            api_key=self.api_key,
+            max_retries=0,
+            http_client=get_http_client(self.base_url, config),
+        )
+        self.IsSupportBatch = True
+        self.IsSupportMultiTarget = True
+
+    def _create_async_client(self):
+        return AsyncOpenAI(
+            base_url=self.base_url,
+            api_key=self.api_key,
+            max_retries=0,
+            http_client=get_async_http_client(self.base_url, self.config),
+        )
+
+    def _build_payload(
+        self, text: str, target_lang: str, style: str, comment: str
+    ) -> dict:
+        return {
             "model": self.model,
             "messages": [
                 {
@@ -27,29 +41,16 @@ class OpenAIBaseedTranslator(BaseTranslator):
                 },
                 {
                     "role": "user",
-                    "content": f"将以下文本直接翻译为{target_lang}: {text}",
+                    "content": f"将以下文本直接翻译为{target_lang}: {text}"
+                    + self._term_hint(text, target_lang),
                 },
             ],
             "temperature": self.temperature,
             "max_tokens": self.max_tokens,
         }
 
-        try:
-            completion = self.client.chat.completions.create(
-                model=payload["model"],
-                messages=payload["messages"],
-                max_tokens=payload["max_tokens"],
-                temperature=payload["temperature"],
-                stream=False,
-            )
-            self.last_request = time.time()
-
-            # 解析豆包API响应格式
-            return completion.choices[0].message.content
-        except KeyError:
-            print("Invalid API response format")
-        except Exception as e:
-            print(f"Translation failed: {str(e)}")
-
-        self.last_request = time.time()
-        return ""  # 失败时返回原文
+    def _create_completion(self, payload: dict):
+        return self.client.chat.completions.create(**payload, stream=False)
+
+    async def _create_completion_async(self, payload: dict):
+        return await self.async_client.chat.completions.create(**payload, stream=False)
@@ -1,8 +1,7 @@
-import time
-
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from .BaseTranslator import BaseTranslator, LocalizationConfig
+from .http_transport import get_async_http_client, get_http_client
 
 
 class TongYiQwenTranslator(BaseTranslator):
@@ -15,14 +14,42 @@ class TongYiQwenTranslator(BaseTranslator):
 
     def __init__(self, config: LocalizationConfig):
         super().__init__(config)
-        self.client = OpenAI(base_url=self.base_url, api_key=self.api_key)
+        # 重试由 BaseTranslator 统一处理，关闭 SDK 自带的重试；连接池按 base_url 在进程内共享
+        self.client = OpenAI(
+            base_url=self.base_url,
+            api_key=self.api_key,
+            max_retries=0,
+            http_client=get_http_client(self.base_url, config),
+        )
         self.IsUseComment = False
 
-    def translate_text(
-        self, text: str, target_lang: str, style: str = None, comment: str = None
-    ) -> str:
-        super().translate_text(text, target_lang, style, comment)
-        payload = {
+    def _create_async_client(self):
+        return AsyncOpenAI(
+            base_url=self.base_url,
+            api_key=self.api_key,
+            max_retries=0,
+            http_client=get_async_http_client(self.base_url, self.config),
+        )
+
+    def _build_payload(
+        self, text: str, target_lang: str, style: str, comment: str
+    ) -> dict:
+        translation_options = {
+            "source_lang": "Chinese",
+            "target_lang": target_lang,
+        }
+        # 相似原文的已有译文作为翻译记忆传给 Qwen-MT
+        references = self._references(text, target_lang, style)
+        if references:
+            translation_options["tm_list"] = references
+        # 原文中出现的术语通过 Qwen-MT 的 terms 干预译法
+        if self.glossary is not None:
+            terms = self.glossary.terms_for(text, target_lang)
+            if terms:
+                translation_options["terms"] = [
+                    {"source": source, "target": target} for source, target in terms
+                ]
+        return {
             "model": self.model,
             "messages": [
                 {
@@ -30,26 +57,13 @@ class TongYiQwenTranslator(BaseTranslator):
                     "content": text,
                 }
             ],
-            "translation_options": {
-                "source_lang": "Chinese",
-                "target_lang": target_lang,
+            "extra_body": {
+                "translation_options": translation_options,
             },
         }
 
-        try:
-            completion = self.client.chat.completions.create(
-                model=payload["model"],
-                messages=payload["messages"],
-                extra_body={"translation_options": payload["translation_options"]},
-            )
-            self.last_request = time.time()
-
-            # 解析豆包API响应格式
-            return completion.choices[0].message.content
-        except KeyError:
-            print("Invalid API response format")
-        except Exception as e:
-            print(f"Translation failed: {str(e)}")
-
-        self.last_request = time.time()
-        return ""  # 失败时返回原文
+    def _create_completion(self, payload: dict):
+        return self.client.chat.completions.create(**payload)
+
+    async def _create_completion_async(self, payload: dict):
+        return await self.async_client.chat.completions.create(**payload)
@@ -1,12 +1,16 @@
 """翻译器模块 - 包含各种大语言模型的翻译器实现"""
 
 from .BaseTranslator import BaseTranslator, LocalizationConfig
+from .registry import available_translators, register_translator
 
-# 翻译器类将按需导入，以避免在模块导入时就需要所有依赖
+# 翻译器类将按需导入，以避免在模块导入时就需要所有依赖；
+# 按 model_type 创建翻译器时由 registry 导入对应的模块
 __all__ = [
     "BaseTranslator",
     "LocalizationConfig",
     "DoubaoTranslator",
-    "OpenAIBaseedTranslator", 
+    "OpenAIBaseedTranslator",
     "TongYiQwenTranslator",
+    "available_translators",
+    "register_translator",
 ]
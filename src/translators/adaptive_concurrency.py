@@ -0,0 +1,220 @@
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional, Tuple
+
+# 视为过载、需要退避的 HTTP 状态码
+OVERLOAD_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+def parse_retry_after(value) -> Optional[float]:
+    """解析 Retry-After 头，支持秒数与 HTTP 日期两种格式"""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(str(value)).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def error_feedback(error: Exception) -> Tuple[Optional[int], Optional[float]]:
+    """
+    从 SDK 异常中提取 (HTTP 状态码, Retry-After 秒数)
+
+    OpenAI 与方舟 SDK 的状态错误都带有 status_code 与 response.headers
+    """
+    status = getattr(error, "status_code", None)
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        retry_after = parse_retry_after(
+            headers.get("retry-after") or headers.get("Retry-After")
+        )
+    except AttributeError:
+        retry_after = None
+    return status, retry_after
+
+
+def is_network_error(error: Optional[Exception]) -> bool:
+    """是否为超时或连接错误（SDK 的 APIConnectionError/APITimeoutError 与内置网络异常）"""
+    if error is None:
+        return False
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    name = type(error).__name__
+    return "Timeout" in name or "Connection" in name
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD 自适应并发控制
+
+    请求成功且延迟正常时加性增加并发上限（每完成一轮约 +1），
+    遇到 429/5xx 或延迟明显高于基线时乘性减小，并按 Retry-After 暂停派发新请求。
+    与限流器（固定的 RPM/TPM 上限）配合使用：限流器保证不超过账户配额，
+    本控制器根据提供商的实时反馈在配额内寻找合适的并发数
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        初始化自适应并发控制器
+
+        参数:
+        initial (int): 初始并发上限
+        min_limit (int): 并发上限的下限
+        max_limit (int): 并发上限的上限
+        decrease_factor (float): 退避时并发上限乘以的系数
+        latency_tolerance (float): 近期延迟超过基线的倍数时视为拥塞
+        clock (Callable): 时钟函数，便于测试
+        """
+        self.min_limit = max(1, int(min_limit))
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self.limit = float(min(self.max_limit, max(self.min_limit, initial)))
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.clock = clock
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.baseline_latency = None
+        self.recent_latency = None
+        self.last_decrease = None
+        self.successes = 0
+        self.failures = 0
+        self.throttled = 0
+        self.history = [(0.0, int(self.limit), "start")]
+        self._started = clock()
+        self._lock = threading.Lock()
+
+    @property
+    def current_limit(self) -> int:
+        return int(self.limit)
+
+    def _set_limit(self, limit: float, reason: str):
+        previous = int(self.limit)
+        self.limit = min(float(self.max_limit), max(float(self.min_limit), limit))
+        if int(self.limit) != previous:
+            elapsed = round(self.clock() - self._started, 3)
+            self.history.append((elapsed, int(self.limit), reason))
+
+    def _decrease(self, reason: str):
+        """乘性减小；一个延迟周期内只退避一次，避免同一波失败把并发压到最低"""
+        now = self.clock()
+        cooldown = self.recent_latency or 0.0
+        if self.last_decrease is not None and now - self.last_decrease < cooldown:
+            return
+        self.last_decrease = now
+        self._set_limit(self.limit * self.decrease_factor, reason)
+
+    def try_acquire(self) -> float:
+        """尝试占用一个并发名额，成功返回 0，否则返回建议等待的秒数"""
+        with self._lock:
+            wait = self.blocked_until - self.clock()
+            if wait > 0:
+                return wait
+            if self.in_flight >= int(self.limit):
+                return 0.01
+            self.in_flight += 1
+            return 0.0
+
+    def acquire(self):
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def release(self):
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+
+    def on_success(self, latency: float):
+        """请求成功：延迟正常时加性增加，延迟升高时乘性减小"""
+        with self._lock:
+            self.successes += 1
+            if self.baseline_latency is None:
+                self.baseline_latency = self.recent_latency = latency
+            self.recent_latency = 0.7 * self.recent_latency + 0.3 * latency
+            if self.recent_latency > self.baseline_latency * self.latency_tolerance:
+                self._decrease("latency")
+                return
+            # 基线只用健康的样本缓慢更新，使持续升高的延迟能够被识别出来
+            self.baseline_latency = 0.95 * self.baseline_latency + 0.05 * latency
+            self._set_limit(self.limit + 1.0 / self.limit, "increase")
+
+    def on_error(
+        self,
+        status: Optional[int],
+        retry_after: Optional[float] = None,
+        error: Optional[Exception] = None,
+    ):
+        """
+        请求失败：过载类状态码与超时/连接错误退避，并按 Retry-After 暂停派发；
+        其他错误（如解析失败、参数错误）与拥塞无关，不调整并发上限
+        """
+        with self._lock:
+            self.failures += 1
+            if retry_after:
+                self.throttled += 1
+                self.blocked_until = max(self.blocked_until, self.clock() + retry_after)
+            if status in OVERLOAD_STATUS:
+                self._decrease(f"http {status}")
+            elif status is None and is_network_error(error):
+                self._decrease("network")
+
+    def report(self) -> dict:
+        """运行报告：当前并发上限与调整历史"""
+        limits = [limit for _, limit, _ in self.history]
+        return {
+            "current_limit": self.current_limit,
+            "min_limit_seen": min(limits),
+            "max_limit_seen": max(limits),
+            "successes": self.successes,
+            "failures": self.failures,
+            "retry_after_pauses": self.throttled,
+            "baseline_latency": (
+                round(self.baseline_latency, 4) if self.baseline_latency else None
+            ),
+            "history": [
+                {"t": elapsed, "limit": limit, "reason": reason}
+                for elapsed, limit, reason in self.history
+            ],
+        }
+
+    def summary(self) -> str:
+        limits = [limit for _, limit, _ in self.history]
+        return (
+            f"自适应并发: 当前上限 {self.current_limit}，"
+            f"范围 {min(limits)}-{max(limits)}，调整 {len(self.history) - 1} 次，"
+            f"Retry-After 暂停 {self.throttled} 次"
+        )
+
+    @classmethod
+    def from_config(cls, config, concurrency: int) -> Optional["AdaptiveConcurrency"]:
+        """根据配置创建控制器，未开启 adaptive_concurrency 时返回 None"""
+        if not config.get_config("adaptive_concurrency", False):
+            return None
+        return cls(
+            initial=concurrency,
+            min_limit=config.get_config("min_concurrency", 1),
+            max_limit=config.get_config("max_concurrency", max(concurrency * 4, 8)),
+        )
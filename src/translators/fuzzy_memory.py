@@ -0,0 +1,258 @@
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from .translation_memory import TranslationMemory
+
+# 数字（含千分位与小数）在模板中替换为占位符
+NUMBER_PATTERN = re.compile(r"\d+(?:[.,]\d+)*")
+# MinHash 签名长度与 LSH 分段：6 段 × 2 行，相似度 0.7 的文本成为候选的概率约 98%
+NUM_HASHES = 12
+BANDS = 6
+# 每次查询最多计算相似度的候选数
+MAX_CANDIDATES = 256
+# 每个 (语言, 风格) 索引最多保存的条目数
+MAX_ENTRIES = 50000
+_MASK = (1 << 61) - 1
+
+
+def template(text: str) -> Tuple[str, List[str]]:
+    """将数字替换为占位符，返回 (模板, 按出现顺序排列的数字)"""
+    numbers = NUMBER_PATTERN.findall(text)
+    return NUMBER_PATTERN.sub("\x00", text), numbers
+
+
+def fuzzy_key(text: str) -> str:
+    """数字统一为占位符并忽略大小写与多余空白，键相同的原文在索引中只保留一条"""
+    return " ".join(template(text)[0].lower().split())
+
+
+def shingles(text: str) -> set:
+    """
+    相似度计算使用的字符 n-gram 集合（基于 fuzzy_key），
+    含 CJK 字符时使用 2-gram，其余使用 3-gram
+    """
+    masked = fuzzy_key(text)
+    size = 2 if any(ord(ch) >= 0x2E80 for ch in masked) else 3
+    if len(masked) <= size:
+        return {masked} if masked else set()
+    return {masked[i : i + size] for i in range(len(masked) - size + 1)}
+
+
+def minhash(grams: set) -> Tuple[int, ...]:
+    """
+    单次哈希的 MinHash 签名（one permutation hashing）：每个 n-gram 只哈希一次，
+    按哈希值分到 NUM_HASHES 个桶中取最小值；空桶取循环方向上下一个非空桶的值，
+    使短文本的签名同样可以比较
+    """
+    signature = [None] * NUM_HASHES
+    for gram in grams:
+        value = hash(gram) & _MASK
+        slot = value % NUM_HASHES
+        value //= NUM_HASHES
+        if signature[slot] is None or value < signature[slot]:
+            signature[slot] = value
+    filled = [slot for slot in range(NUM_HASHES) if signature[slot] is not None]
+    if not filled:
+        return tuple(signature)
+    for slot in range(NUM_HASHES):
+        if signature[slot] is None:
+            distance, source = min(
+                ((other - slot) % NUM_HASHES, other) for other in filled
+            )
+            signature[slot] = (signature[source], distance)
+    return tuple(signature)
+
+
+def jaccard(left: set, right: set) -> float:
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def substitute_numbers(
+    cached_source: str, cached_target: str, text: str
+) -> Optional[str]:
+    """
+    原文与缓存原文只有数字不同时，把缓存译文中的数字替换为新原文中的数字
+
+    缓存原文中的数字必须互不相同，且在缓存译文中原样出现同样的次数，
+    否则无法确定对应关系，返回 None
+    """
+    cached_template, old_numbers = template(cached_source)
+    new_template, new_numbers = template(text)
+    if not old_numbers or cached_template != new_template:
+        return None
+    if len(set(old_numbers)) != len(old_numbers):
+        return None
+    if sorted(NUMBER_PATTERN.findall(cached_target)) != sorted(old_numbers):
+        return None
+    mapping = dict(zip(old_numbers, new_numbers))
+    return NUMBER_PATTERN.sub(lambda m: mapping[m.group(0)], cached_target)
+
+
+class _LangIndex:
+    """一个 (语言, 风格) 组合的近似重复索引"""
+
+    def __init__(self):
+        self.entries: List[Tuple[str, str, set]] = []
+        self.keys: Dict[str, int] = {}
+        self.templates: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        self.buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+
+    def add(self, source: str, target: str, comment: str = ""):
+        key = fuzzy_key(source)
+        index = self.keys.get(key)
+        if index is not None:
+            # 只有数字、大小写或空白不同的原文共用一个条目，保留最新的译文
+            self.entries[index] = (source, target, self.entries[index][2])
+        else:
+            index = len(self.entries)
+            self.keys[key] = index
+            grams = shingles(source)
+            self.entries.append((source, target, grams))
+            self._add_signature(index, grams)
+        masked, numbers = template(source)
+        if numbers:
+            # 注释不同的原文可能需要不同的译法，只在注释相同时复用
+            self.templates[(masked, comment)] = (source, target)
+
+    def _add_signature(self, index: int, grams: set):
+        if grams:
+            signature = minhash(grams)
+            rows = NUM_HASHES // BANDS
+            for band in range(BANDS):
+                key = (band, signature[band * rows : (band + 1) * rows])
+                self.buckets.setdefault(key, []).append(index)
+
+    def candidates(self, grams: set) -> set:
+        signature = minhash(grams)
+        rows = NUM_HASHES // BANDS
+        found = set()
+        for band in range(BANDS):
+            key = (band, signature[band * rows : (band + 1) * rows])
+            found.update(self.buckets.get(key, ())[-MAX_CANDIDATES:])
+            if len(found) >= MAX_CANDIDATES:
+                break
+        return found
+
+
+class FuzzyMemory:
+    """
+    翻译记忆库的模糊匹配索引
+
+    只有数字不同且注释相同的原文直接复用已有译文并替换数字；其余高相似度的已有译文作为
+    参考示例（Qwen-MT 的 tm_list 或批量请求中的 tm 字段）随请求发送。
+    只使用同一模型、同一提示词指纹下实际翻译得到的译文。
+    索引按 (语言, 风格) 在首次查询时从记忆库加载最近的 max_entries 条，之后随新译文增量
+    更新；超过上限时丢弃索引，下次查询时重新加载最近的一半
+    """
+
+    def __init__(
+        self,
+        memory: TranslationMemory,
+        model: str,
+        threshold: float = 0.7,
+        max_references: int = 3,
+        prompt_fingerprint: str = None,
+        max_entries: int = MAX_ENTRIES,
+    ):
+        """
+        参数:
+        memory (TranslationMemory): 底层翻译记忆库
+        model (str): 模型名称，只使用同一模型的译文
+        threshold (float): 作为参考示例的最低相似度（字符 n-gram 的 Jaccard 系数）
+        max_references (int): 每条文本最多附带的参考示例数
+        prompt_fingerprint (str): 提示词指纹，只使用同一提示词下的译文
+        max_entries (int): 每个 (语言, 风格) 索引最多保存的条目数
+        """
+        self.memory = memory
+        self.model = model
+        self.threshold = threshold
+        self.max_references = max_references
+        self.prompt_fingerprint = prompt_fingerprint
+        self.max_entries = max(2, int(max_entries))
+        self._indexes: Dict[Tuple[str, str], _LangIndex] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(
+        cls, config, memory, model: str, prompt_fingerprint: str = None
+    ) -> Optional["FuzzyMemory"]:
+        if not config.get_config("fuzzy_memory", False):
+            return None
+        return cls(
+            memory,
+            model,
+            config.get_config("fuzzy_threshold", 0.7),
+            config.get_config("fuzzy_references", 3),
+            prompt_fingerprint,
+            config.get_config("fuzzy_index_size", MAX_ENTRIES),
+        )
+
+    def _index(self, lang: str, style: str) -> _LangIndex:
+        with self._lock:
+            index = self._indexes.get((lang, style))
+            if index is None:
+                index = _LangIndex()
+                # 只加载最近的一半，其余空间留给之后新增的译文
+                rows = list(
+                    self.memory.sources(
+                        lang,
+                        style,
+                        self.model,
+                        self.prompt_fingerprint,
+                        self.max_entries // 2,
+                    )
+                )
+                # 从旧到新加入，原文重复时保留最新的译文
+                for source, target, comment in reversed(rows):
+                    index.add(source, target, comment)
+                self._indexes[(lang, style)] = index
+            return index
+
+    def add(self, source: str, lang: str, style: str, target: str, comment: str = ""):
+        """记录新译文，只更新已经加载的索引；索引达到上限时丢弃，下次查询时重新加载"""
+        with self._lock:
+            index = self._indexes.get((lang, style))
+            if index is None:
+                return
+            if len(index.entries) >= self.max_entries:
+                del self._indexes[(lang, style)]
+            else:
+                index.add(source, target, comment)
+
+    def reuse(
+        self, text: str, lang: str, style: str, comment: str = ""
+    ) -> Optional[str]:
+        """原文与某条注释相同的已有原文只有数字不同时，返回替换数字后的译文"""
+        masked, numbers = template(text)
+        if not numbers:
+            return None
+        index = self._index(lang, style)
+        with self._lock:
+            entry = index.templates.get((masked, comment))
+        if entry is None:
+            return None
+        return substitute_numbers(entry[0], entry[1], text)
+
+    def references(self, text: str, lang: str, style: str) -> List[dict]:
+        """按相似度从高到低返回 [{"source", "target"}]，不包含原文完全相同的条目"""
+        grams = shingles(text)
+        if not grams or self.max_references <= 0:
+            return []
+        index = self._index(lang, style)
+        with self._lock:
+            scored = []
+            for position in index.candidates(grams):
+                source, target, candidate = index.entries[position]
+                if source == text:
+                    continue
+                score = jaccard(grams, candidate)
+                if score >= self.threshold:
+                    scored.append((score, source, target))
+        scored.sort(key=lambda entry: -entry[0])
+        return [
+            {"source": source, "target": target}
+            for _, source, target in scored[: self.max_references]
+        ]
@@ -0,0 +1,259 @@
+import csv
+import hashlib
+import json
+import os
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import yaml
+
+# 运行报告中最多保留的术语违例示例数
+MAX_VIOLATION_SAMPLES = 100
+
+
+class TermMatcher:
+    """
+    Aho-Corasick 多模式匹配自动机
+
+    所有术语编译一次，之后每条文本只需扫描一遍即可找出其中出现的全部术语，
+    耗时与术语数量无关
+    """
+
+    def __init__(self, patterns: List[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        # 每个状态结束的模式长度（包括经失败链可达的后缀模式）
+        self.output: List[Tuple[int, ...]] = [()]
+        for pattern in patterns:
+            if pattern:
+                self._insert(pattern)
+        self._link()
+
+    def _insert(self, pattern: str):
+        state = 0
+        for ch in pattern:
+            next_state = self.goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][ch] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(())
+            state = next_state
+        if len(pattern) not in self.output[state]:
+            self.output[state] += (len(pattern),)
+
+    def _link(self):
+        """按广度优先计算失败链接，并把后缀模式合并到各状态的输出中"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(ch, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.output[next_state] += self.output[self.fail[next_state]]
+
+    def matches(self, text: str) -> List[Tuple[int, int]]:
+        """返回所有匹配的 (起始位置, 长度)"""
+        found = []
+        state = 0
+        for position, ch in enumerate(text):
+            while state and ch not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(ch, 0)
+            for length in self.output[state]:
+                found.append((position - length + 1, length))
+        return found
+
+    def find(self, text: str) -> List[Tuple[int, int]]:
+        """最左最长且互不重叠的匹配，例如“暗影刺客”优先于其中的“刺客”"""
+        chosen = []
+        end = 0
+        for start, length in sorted(self.matches(text), key=lambda m: (m[0], -m[1])):
+            if start >= end:
+                chosen.append((start, length))
+                end = start + length
+        return chosen
+
+
+class Glossary:
+    """
+    术语表
+
+    术语在加载时编译为匹配自动机；每次请求只附带原文中实际出现的术语，
+    并在本地检查译文是否使用了规定的译法。编译后的术语表只读，可以在线程间共享
+    """
+
+    def __init__(self, terms: Dict[str, Dict[str, str]]):
+        """
+        参数:
+        terms (Dict[str, Dict[str, str]]): {原文术语: {语言代码: 译法}}
+        """
+        # 匹配时忽略大小写，键为 casefold 后的原文术语
+        self.terms: Dict[str, Tuple[str, Dict[str, str]]] = {}
+        for source, targets in terms.items():
+            source = (source or "").strip()
+            targets = {
+                lang: str(target).strip()
+                for lang, target in (targets or {}).items()
+                if target is not None and str(target).strip()
+            }
+            if source and targets:
+                self.terms[source.casefold()] = (source, targets)
+        self.matcher = TermMatcher(list(self.terms))
+        # 术语内容的摘要，参与提示词指纹：术语表变化后缓存中的旧译文不再命中
+        self.digest = hashlib.md5(
+            json.dumps(
+                sorted(self.terms.values()), ensure_ascii=False, sort_keys=True
+            ).encode("utf-8")
+        ).hexdigest()
+        # 来源文件的修改时间，用于判断是否需要重新加载
+        self.mtime: Optional[float] = None
+
+    @classmethod
+    def load(cls, path: str) -> "Glossary":
+        """
+        从文件加载术语表
+
+        CSV：第一列为原文术语，其余列的表头为语言代码；
+        JSON/YAML：{原文术语: {语言代码: 译法}}
+        """
+        suffix = os.path.splitext(path)[1].lower()
+        if suffix == ".csv":
+            with open(path, "r", encoding="utf-8-sig", newline="") as f:
+                reader = csv.reader(f)
+                headers = [header.strip() for header in next(reader, [])]
+                terms = {}
+                for row in reader:
+                    if not row:
+                        continue
+                    terms[row[0]] = {
+                        lang: value for lang, value in zip(headers[1:], row[1:]) if lang
+                    }
+            return cls(terms)
+        with open(path, "r", encoding="utf-8") as f:
+            if suffix == ".json":
+                data = json.load(f)
+            else:
+                data = yaml.safe_load(f)
+        return cls(data or {})
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def find(self, text: str) -> List[str]:
+        """原文中出现的术语（casefold 后的键），按出现顺序去重"""
+        if not text or not self.terms:
+            return []
+        folded = text.casefold()
+        found = []
+        for start, length in self.matcher.find(folded):
+            key = folded[start : start + length]
+            if key not in found:
+                found.append(key)
+        return found
+
+    def terms_for(self, text: str, target_lang: str) -> List[Tuple[str, str]]:
+        """原文中出现且有目标语言译法的 (术语, 译法)"""
+        result = []
+        for key in self.find(text):
+            source, targets = self.terms[key]
+            if target_lang in targets:
+                result.append((source, targets[target_lang]))
+        return result
+
+    def hint(self, text: str, target_lang: str) -> str:
+        """单条请求的术语提示，没有相关术语时为空字符串"""
+        terms = self.terms_for(text, target_lang)
+        if not terms:
+            return ""
+        pairs = "；".join(f"{source}→{target}" for source, target in terms)
+        return f"\n术语（必须使用以下译法）：{pairs}"
+
+    def verify(
+        self, text: str, target_lang: str, translation: str
+    ) -> Optional[Dict[str, str]]:
+        """
+        检查译文是否包含规定的译法，返回缺失的 {术语: 译法}；
+        原文中没有需要检查的术语时返回 None
+        """
+        terms = self.terms_for(text, target_lang)
+        if not terms:
+            return None
+        folded = (translation or "").casefold()
+        return {
+            source: target
+            for source, target in terms
+            if target.casefold() not in folded
+        }
+
+
+class GlossaryStats:
+    """一次运行中术语检查的统计与违例示例"""
+
+    def __init__(self):
+        self.checked = 0
+        self.violations = 0
+        self.samples: List[dict] = []
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        text: str,
+        target_lang: str,
+        translation: str,
+        missing: Dict[str, str],
+    ):
+        with self._lock:
+            self.checked += 1
+            if not missing:
+                return
+            self.violations += 1
+            if len(self.samples) < MAX_VIOLATION_SAMPLES:
+                self.samples.append(
+                    {
+                        "text": text,
+                        "target_lang": target_lang,
+                        "translation": translation,
+                        "missing": missing,
+                    }
+                )
+
+    def report(self) -> dict:
+        with self._lock:
+            return {
+                "checked": self.checked,
+                "violations": self.violations,
+                "samples": list(self.samples),
+            }
+
+    def summary(self) -> str:
+        return f"术语检查 {self.checked} 条，未使用规定译法 {self.violations} 条"
+
+
+_glossaries: Dict[str, Glossary] = {}
+_glossaries_lock = threading.Lock()
+
+
+def get_glossary(config) -> Optional[Glossary]:
+    """
+    按配置的 glossary_path 加载术语表，同一进程内同一文件只编译一次，
+    文件修改后重新编译（号池的各成员与 GUI 的多次运行共享编译结果）
+    """
+    path = config.get_config("glossary_path")
+    if not path:
+        return None
+    path = os.path.abspath(path)
+    mtime = os.path.getmtime(path)
+    with _glossaries_lock:
+        glossary = _glossaries.get(path)
+        if glossary is None or glossary.mtime != mtime:
+            glossary = Glossary.load(path)
+            glossary.mtime = mtime
+            _glossaries[path] = glossary
+        return glossary
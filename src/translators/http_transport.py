@@ -0,0 +1,149 @@
+import atexit
+import asyncio
+import threading
+import weakref
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+try:
+    import h2  # noqa: F401  HTTP/2 需要安装 httpx[http2]
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+def _settings(config) -> Tuple[bool, int, int, float, float]:
+    """从配置读取连接池参数：(http2, 最大连接数, 最大空闲连接数, 空闲保持秒数, 建连超时)"""
+    get = config.get_config if config is not None else (lambda key, default: default)
+    return (
+        bool(get("http2", True)) and HTTP2_AVAILABLE,
+        int(get("http_max_connections", 64)),
+        int(get("http_max_keepalive", 32)),
+        float(get("http_keepalive_expiry", 60.0)),
+        float(get("http_connect_timeout", 10.0)),
+    )
+
+
+def _client_kwargs(settings) -> dict:
+    http2, max_connections, max_keepalive, keepalive_expiry, connect_timeout = settings
+    return {
+        "http2": http2,
+        "limits": httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        # 读超时与 SDK 默认值一致，大批量翻译的响应可能较慢
+        "timeout": httpx.Timeout(600.0, connect=connect_timeout),
+        "follow_redirects": True,
+    }
+
+
+_clients: Dict[tuple, httpx.Client] = {}
+# 异步客户端的连接池与事件循环绑定，按事件循环分别保存，事件循环销毁后自动释放
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = (
+    weakref.WeakKeyDictionary()
+)
+_lock = threading.Lock()
+# 进程内常驻的事件循环及其线程，所有并发运行共用，异步连接池在多次运行之间保持
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+
+
+def get_http_client(base_url: Optional[str], config=None) -> httpx.Client:
+    """
+    获取按 base_url 共享的 HTTP 客户端
+
+    同一进程内所有翻译器、所有运行（包括 GUI 多次点击翻译）复用同一个连接池，
+    保持长连接，避免每次请求重新建立 TCP/TLS 连接
+    """
+    settings = _settings(config)
+    key = (base_url or "", settings)
+    with _lock:
+        client = _clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.Client(**_client_kwargs(settings))
+            _clients[key] = client
+        return client
+
+
+def get_async_http_client(base_url: Optional[str], config=None) -> httpx.AsyncClient:
+    """获取当前事件循环中按 base_url 共享的异步 HTTP 客户端"""
+    loop = asyncio.get_running_loop()
+    settings = _settings(config)
+    key = (base_url or "", settings)
+    with _lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(**_client_kwargs(settings))
+            clients[key] = client
+        return client
+
+
+def _transport_loop() -> asyncio.AbstractEventLoop:
+    """获取常驻事件循环，首次使用时在守护线程中启动"""
+    global _loop, _loop_thread
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(
+                target=_loop.run_forever, name="http-transport", daemon=True
+            )
+            _loop_thread.start()
+        return _loop
+
+
+def run_async(coro):
+    """
+    在常驻事件循环中运行协程并等待结果，可以从任意线程调用
+
+    与 asyncio.run 不同，事件循环在多次运行（包括 GUI 多次点击翻译）之间保持，
+    绑定在其上的异步客户端和长连接可以继续复用；调用线程被中断时取消协程
+    """
+    loop = _transport_loop()
+    if threading.current_thread() is _loop_thread:
+        coro.close()
+        raise RuntimeError("run_async 不能在常驻事件循环中调用")
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result()
+    except BaseException:
+        future.cancel()
+        raise
+
+
+async def aclose_async_http_clients():
+    """关闭当前事件循环中的所有异步客户端"""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = list(_async_clients.pop(loop, {}).values())
+    for client in clients:
+        await client.aclose()
+
+
+def close_http_clients():
+    """关闭所有同步客户端与常驻事件循环中的异步客户端，进程退出时自动调用"""
+    global _loop, _loop_thread
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+        loop, thread = _loop, _loop_thread
+        _loop = _loop_thread = None
+    for client in clients:
+        client.close()
+    if loop is not None and not loop.is_closed():
+        try:
+            asyncio.run_coroutine_threadsafe(aclose_async_http_clients(), loop).result(
+                timeout=5
+            )
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+            if not loop.is_running():
+                loop.close()
+
+
+atexit.register(close_http_clients)
@@ -0,0 +1,297 @@
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+from .resilience import classify_error
+
+# 延迟直方图的桶上限（秒），与 Prometheus 直方图的 le 标签对应
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# 每个序列保留的最近样本数，用于计算 JSON 报告中的分位数
+SAMPLE_SIZE = 10000
+
+
+class RequestTrace:
+    """一次翻译请求的观测值，请求结束后交给 RequestMetrics 汇总"""
+
+    def __init__(self, provider: str, lang: str, items: int):
+        self.provider = provider
+        self.lang = lang
+        self.items = items
+        self.queue_wait = 0.0  # 限流器中的等待时间
+        self.latency = 0.0  # 最后一次请求的耗时
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.error: Optional[str] = None  # 错误分类，成功时为 None
+
+    def fail(self, error: Exception):
+        self.error = classify_error(error)
+
+
+class _Histogram:
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.samples = deque(maxlen=SAMPLE_SIZE)
+
+    def observe(self, value: float):
+        index = 0
+        while index < len(LATENCY_BUCKETS) and value > LATENCY_BUCKETS[index]:
+            index += 1
+        self.buckets[index] += 1
+        self.total += value
+        self.count += 1
+        self.samples.append(value)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        values = sorted(self.samples)
+        rank = min(len(values) - 1, max(0, int(round(pct / 100 * len(values))) - 1))
+        return round(values[rank], 4)
+
+
+class _Series:
+    """一个 (提供商, 语言) 组合的计数"""
+
+    def __init__(self):
+        self.requests = 0
+        self.items = 0
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.errors: Dict[str, int] = {}
+        self.latency = _Histogram()
+        self.queue_wait = _Histogram()
+
+
+class RequestMetrics:
+    """
+    翻译请求的指标汇总
+
+    按提供商与目标语言统计请求数、条目数、延迟、排队等待、重试、token 用量、
+    缓存命中与错误分类；可以输出 JSON 运行报告，也可以输出 Prometheus 文本格式
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, provider: str, lang: str) -> _Series:
+        key = (provider or "", lang or "")
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series()
+        return series
+
+    def observe(self, trace: RequestTrace):
+        """记录一次请求（包括失败的请求）"""
+        with self._lock:
+            series = self._get(trace.provider, trace.lang)
+            series.requests += 1
+            series.items += trace.items
+            series.retries += trace.retries
+            series.prompt_tokens += trace.prompt_tokens
+            series.completion_tokens += trace.completion_tokens
+            series.queue_wait.observe(trace.queue_wait)
+            if trace.error is None:
+                series.latency.observe(trace.latency)
+            else:
+                series.errors[trace.error] = series.errors.get(trace.error, 0) + 1
+
+    def record_cache(self, provider: str, lang: str, hit: bool):
+        with self._lock:
+            series = self._get(provider, lang)
+            if hit:
+                series.cache_hits += 1
+            else:
+                series.cache_misses += 1
+
+    def totals(self) -> dict:
+        with self._lock:
+            series = list(self._series.values())
+        return {
+            "requests": sum(s.requests for s in series),
+            "items": sum(s.items for s in series),
+            "retries": sum(s.retries for s in series),
+            "errors": sum(sum(s.errors.values()) for s in series),
+            "prompt_tokens": sum(s.prompt_tokens for s in series),
+            "completion_tokens": sum(s.completion_tokens for s in series),
+            "cache_hits": sum(s.cache_hits for s in series),
+        }
+
+    def report(self) -> dict:
+        """JSON 运行报告：总计与按提供商、语言划分的明细"""
+        with self._lock:
+            rows = [
+                {
+                    "provider": provider,
+                    "lang": lang,
+                    "requests": s.requests,
+                    "items": s.items,
+                    "retries": s.retries,
+                    "errors": dict(s.errors),
+                    "prompt_tokens": s.prompt_tokens,
+                    "completion_tokens": s.completion_tokens,
+                    "cache_hits": s.cache_hits,
+                    "cache_misses": s.cache_misses,
+                    "latency_p50": s.latency.percentile(50),
+                    "latency_p95": s.latency.percentile(95),
+                    "queue_wait_p95": s.queue_wait.percentile(95),
+                    "queue_wait_total": round(s.queue_wait.total, 4),
+                }
+                for (provider, lang), s in sorted(self._series.items())
+            ]
+        return {
+            "elapsed": round(time.time() - self.started, 3),
+            "totals": self.totals(),
+            "series": rows,
+        }
+
+    def summary(self) -> str:
+        totals = self.totals()
+        return (
+            f"请求 {totals['requests']} 次，翻译 {totals['items']} 条，"
+            f"重试 {totals['retries']} 次，失败 {totals['errors']} 次，"
+            f"token {totals['prompt_tokens']}+{totals['completion_tokens']}"
+        )
+
+    def to_prometheus(self) -> str:
+        """Prometheus 文本格式"""
+
+        def labels(provider, lang, **extra):
+            pairs = {"provider": provider, "lang": lang, **extra}
+            return ",".join(f'{key}="{_escape(value)}"' for key, value in pairs.items())
+
+        counters = [
+            ("requests", "Translation requests sent"),
+            ("items", "Strings included in requests"),
+            ("retries", "Request retries"),
+            ("prompt_tokens", "Prompt tokens reported by the provider"),
+            ("completion_tokens", "Completion tokens reported by the provider"),
+            ("cache_hits", "Translation cache hits"),
+            ("cache_misses", "Translation cache misses"),
+        ]
+        lines = []
+        with self._lock:
+            series = sorted(self._series.items())
+            for name, help_text in counters:
+                metric = f"localization_{name}_total"
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} counter")
+                for (provider, lang), s in series:
+                    lines.append(
+                        f"{metric}{{{labels(provider, lang)}}} {getattr(s, name)}"
+                    )
+
+            lines.append("# HELP localization_errors_total Failed requests by category")
+            lines.append("# TYPE localization_errors_total counter")
+            for (provider, lang), s in series:
+                for category, count in sorted(s.errors.items()):
+                    lines.append(
+                        f"localization_errors_total{{{labels(provider, lang, category=category)}}} {count}"
+                    )
+
+            for name, attribute, help_text in (
+                ("request_latency_seconds", "latency", "Successful request latency"),
+                (
+                    "queue_wait_seconds",
+                    "queue_wait",
+                    "Time spent waiting for the rate limiter",
+                ),
+            ):
+                metric = f"localization_{name}"
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} histogram")
+                for (provider, lang), s in series:
+                    histogram = getattr(s, attribute)
+                    cumulative = 0
+                    for bound, count in zip(
+                        list(LATENCY_BUCKETS) + ["+Inf"], histogram.buckets
+                    ):
+                        cumulative += count
+                        lines.append(
+                            f"{metric}_bucket{{{labels(provider, lang, le=bound)}}} {cumulative}"
+                        )
+                    lines.append(
+                        f"{metric}_sum{{{labels(provider, lang)}}} {histogram.total:.6f}"
+                    )
+                    lines.append(
+                        f"{metric}_count{{{labels(provider, lang)}}} {histogram.count}"
+                    )
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value) -> str:
+    """转义 Prometheus 标签值中的反斜杠、引号与换行"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _MetricsServer:
+    """在后台线程中提供 /metrics，可以切换为新的运行的指标（如 GUI 多次运行）"""
+
+    def __init__(self, metrics: RequestMetrics, host: str, port: int):
+        # 只有配置了 metrics_port 才需要 HTTP 服务，延迟导入以缩短启动时间
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        self.metrics = metrics
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split("?")[0].rstrip("/") not in ("", "/metrics"):
+                    self.send_error(404)
+                    return
+                data = server.metrics.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    @property
+    def port(self) -> int:
+        return self.httpd.server_address[1]
+
+
+_servers: Dict[Tuple[str, int], _MetricsServer] = {}
+_servers_lock = threading.Lock()
+
+
+def serve_metrics(metrics: RequestMetrics, port: int, host: str = "127.0.0.1"):
+    """
+    启动（或复用）Prometheus 文本格式的指标服务，返回实际监听的端口
+
+    同一端口只启动一次，再次调用时切换为新的指标对象
+    """
+    with _servers_lock:
+        server = _servers.get((host, port))
+        if server is None:
+            server = _MetricsServer(metrics, host, port)
+            # 端口 0 由系统分配，同时按实际端口登记，便于之后按实际端口复用
+            _servers[(host, port)] = _servers[(host, server.port)] = server
+            print(f"Metrics exporter listening on http://{host}:{server.port}/metrics")
+        server.metrics = metrics
+        return server.port
+
+
+def start_exporter(config, metrics: RequestMetrics) -> Optional[int]:
+    """配置了 metrics_port 时启动指标服务"""
+    port = config.get_config("metrics_port")
+    if port is None or port is False:
+        return None
+    return serve_metrics(
+        metrics, int(port), config.get_config("metrics_host", "127.0.0.1")
+    )
@@ -0,0 +1,440 @@
+import asyncio
+import hashlib
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .glossary import GlossaryStats
+from .resilience import fail_fast
+from .token_budget import batch_size_from_config
+
+
+class ProviderConfig:
+    """
+    号池中单个提供商的配置
+
+    继承顶层配置（系统提示词、翻译风格、batch_size 等），再用 providers 中的条目覆盖；
+    所有提供商共用顶层配置打开的翻译记忆库
+    """
+
+    def __init__(self, parent, overrides: Dict[str, Any]):
+        self.parent = parent
+        self.config_path = getattr(parent, "config_path", None)
+        self.config = {
+            key: value for key, value in parent.config.items() if key != "providers"
+        }
+        self.config.update(overrides)
+        self.cache_file = parent.cache_file
+        self.translation_cache = parent.translation_cache
+
+    def get_config(self, key: str, defaultValue: Any = None):
+        return self.config.get(key, defaultValue)
+
+    def save_cache(self):
+        self.parent.save_cache()
+
+
+class PoolMember:
+    """号池成员：翻译器及其权重、延迟与冷却状态"""
+
+    def __init__(self, translator, weight: float, name: str):
+        self.translator = translator
+        self.weight = max(0.01, float(weight))
+        self.name = name
+        self.current = 0.0  # 平滑加权轮询的当前值
+        self.latency = None  # 每条文本的平均延迟（指数移动平均）
+        self.cooldown_until = 0.0
+        self.successes = 0
+        self.failures = 0
+
+    def available(self, now: float) -> bool:
+        """冷却中或熔断中的成员暂不分配任务"""
+        breaker = getattr(self.translator, "circuit_breaker", None)
+        if breaker is not None and breaker.state == breaker.OPEN:
+            return False
+        return now >= self.cooldown_until
+
+    def wait_time(self, now: float) -> float:
+        """距离冷却与熔断结束的秒数，可以立即使用时为 0"""
+        wait = self.cooldown_until - now
+        breaker = getattr(self.translator, "circuit_breaker", None)
+        if breaker is not None and breaker.state == breaker.OPEN:
+            wait = max(
+                wait, breaker.opened_at + breaker.reset_timeout - breaker.clock()
+            )
+        return max(0.0, wait)
+
+
+class PooledTranslator:
+    """
+    多提供商号池翻译器
+
+    把任务按权重分配给多个提供商/API Key，突破单个账户的配额。
+    权重默认取各提供商的 rate_limit（RPM），并按观测到的延迟动态调整；
+    某个提供商被限流、熔断或请求失败时，失败的条目自动转给其他提供商，
+    全部提供商都失败的条目才进入 dead_letters
+    """
+
+    def __init__(
+        self,
+        config,
+        create_translator: Callable,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        初始化号池
+
+        参数:
+        config (LocalizationConfig): 顶层配置，providers 列出各提供商的配置
+        create_translator (Callable): 根据单个提供商的配置创建翻译器
+        clock (Callable): 时钟函数，便于测试
+        """
+        self.config = config
+        self.clock = clock
+        self.cooldown = float(config.get_config("pool_cooldown", 10.0))
+        providers = config.get_config("providers") or []
+        if not providers:
+            raise ValueError("Pool requires a non-empty 'providers' list")
+
+        self.members: List[PoolMember] = []
+        for index, overrides in enumerate(providers):
+            if overrides.get("model_type") == "Pool":
+                raise ValueError("Nested pools are not supported")
+            translator = create_translator(ProviderConfig(config, overrides))
+            weight = overrides.get("weight", translator.rate_limit or 1)
+            name = f"{overrides.get('model_type')}:{translator.model}#{index}"
+            self.members.append(PoolMember(translator, weight, name))
+
+        translators = [member.translator for member in self.members]
+        self.IsUseComment = any(t.IsUseComment for t in translators)
+        self.IsSupportBatch = any(t.IsSupportBatch for t in translators)
+        self.IsSupportMultiTarget = any(t.IsSupportMultiTarget for t in translators)
+        self.batch_size = batch_size_from_config(config)
+        # 缓存以号池整体作为模型标识：成员组成或提示词变化后旧译文不再命中
+        self.model = "pool:" + "+".join(sorted(t.model or "" for t in translators))
+        self.rate_limit = sum(t.rate_limit or 0 for t in translators)
+        self.provider = f"Pool/{self.model}"
+        self.dead_letters: List[dict] = []
+        self._concurrency_controller = None
+        self._metrics = None
+        self._reference_source = None
+        # 成员共用编译后的术语表，术语检查汇总到号池的统计中
+        self.glossary = translators[0].glossary if translators else None
+        self.glossary_stats = GlossaryStats()
+        for translator in translators:
+            translator.glossary_stats = self.glossary_stats
+        self._lock = threading.Lock()
+        print(f"Translator pool created: {', '.join(m.name for m in self.members)}")
+
+    @property
+    def prompt_fingerprint(self) -> str:
+        material = "|".join(m.translator.prompt_fingerprint for m in self.members)
+        return hashlib.md5(material.encode("utf-8")).hexdigest()
+
+    @property
+    def concurrency_controller(self):
+        return self._concurrency_controller
+
+    @concurrency_controller.setter
+    def concurrency_controller(self, controller):
+        """自适应并发控制器同时接收所有成员的反馈"""
+        self._concurrency_controller = controller
+        for member in self.members:
+            member.translator.concurrency_controller = controller
+
+    @property
+    def reference_source(self):
+        return self._reference_source
+
+    @reference_source.setter
+    def reference_source(self, source):
+        """模糊翻译记忆按号池的缓存查询，所有成员使用同一个查询函数"""
+        self._reference_source = source
+        for member in self.members:
+            member.translator.reference_source = source
+
+    @property
+    def metrics(self):
+        return self._metrics
+
+    @metrics.setter
+    def metrics(self, metrics):
+        """所有成员的请求记录到同一个指标对象，按各自的提供商区分"""
+        self._metrics = metrics
+        for member in self.members:
+            member.translator.metrics = metrics
+
+    def effective_weight(self, member: PoolMember) -> float:
+        """配置权重乘以延迟因子：比最快的成员慢多少倍，权重就降低多少倍"""
+        latencies = [m.latency for m in self.members if m.latency]
+        if not member.latency or not latencies:
+            return member.weight
+        return member.weight * min(latencies) / member.latency
+
+    def _select(self, exclude: set) -> Optional[PoolMember]:
+        """
+        平滑加权轮询选择成员；全部不可用时选择最早结束冷却的成员，
+        调用方需先按 _wait_time 等待其冷却结束
+        """
+        with self._lock:
+            now = self.clock()
+            candidates = [
+                m for m in self.members if m not in exclude and m.available(now)
+            ]
+            if not candidates:
+                remaining = [m for m in self.members if m not in exclude]
+                if not remaining:
+                    return None
+                return min(remaining, key=lambda m: m.cooldown_until)
+            weights = {id(m): self.effective_weight(m) for m in candidates}
+            total = sum(weights.values())
+            for member in candidates:
+                member.current += weights[id(member)]
+            chosen = max(candidates, key=lambda m: m.current)
+            chosen.current -= total
+            return chosen
+
+    def _record(self, member: PoolMember, started: float, count: int, failed: int):
+        with self._lock:
+            if failed:
+                member.failures += 1
+                member.cooldown_until = self.clock() + self.cooldown
+            if failed < count:
+                member.successes += 1
+                per_item = (self.clock() - started) / count
+                member.latency = (
+                    per_item
+                    if member.latency is None
+                    else 0.8 * member.latency + 0.2 * per_item
+                )
+
+    @staticmethod
+    def _failed(items, results) -> List[int]:
+        """原文非空而译文为空的条目视为失败"""
+        return [
+            index
+            for index, ((text, _), translated_text) in enumerate(zip(items, results))
+            if text and text.strip() and not (translated_text or "").strip()
+        ]
+
+    def _exhausted(self, items, target_langs, style, tried):
+        entries = [
+            {
+                "text": text,
+                "comment": comment,
+                "target_lang": lang,
+                "style": style,
+                "category": "failover_exhausted",
+                "error": f"All providers failed: {', '.join(m.name for m in tried)}",
+            }
+            for text, comment in items
+            for lang in (
+                [target_langs] if isinstance(target_langs, str) else target_langs
+            )
+        ]
+        with self._lock:
+            self.dead_letters.extend(entries)
+
+    def clear_dead_letters(self):
+        """清空号池与各成员上次运行的失败条目"""
+        with self._lock:
+            self.dead_letters.clear()
+        for member in self.members:
+            member.translator.clear_dead_letters()
+
+    def _wait_time(self, member: PoolMember) -> float:
+        """选中的成员仍在冷却或熔断中时需要等待的秒数"""
+        delay = member.wait_time(self.clock())
+        if delay > 0:
+            print(f"所有提供商都在冷却中，{delay:.1f} 秒后使用 {member.name}")
+        return delay
+
+    def _has_fallback(self, tried: set) -> bool:
+        """除已尝试的成员外是否还有可用的成员"""
+        now = self.clock()
+        return any(m not in tried and m.available(now) for m in self.members)
+
+    def _run(self, items, call, target_langs, style, is_failed=None) -> list:
+        """
+        依次在不同成员上执行 call(member, items)，只把失败的条目转给下一个成员；
+        还有其他可用成员时，成员遇到限流或熔断立即失败，不在该成员上退避等待
+        """
+        is_failed = is_failed or self._failed
+        results = [None] * len(items)
+        pending = list(range(len(items)))
+        tried = set()
+        while pending:
+            member = self._select(tried)
+            if member is None:
+                self._exhausted([items[i] for i in pending], target_langs, style, tried)
+                break
+            tried.add(member)
+            delay = self._wait_time(member)
+            if delay > 0:
+                time.sleep(delay)
+            subset = [items[i] for i in pending]
+            started = self.clock()
+            if self._has_fallback(tried):
+                with fail_fast():
+                    partial = call(member.translator, subset)
+            else:
+                partial = call(member.translator, subset)
+            failed = is_failed(subset, partial)
+            self._record(member, started, len(subset), len(failed))
+            for index, result in zip(pending, partial):
+                results[index] = result
+            if failed and len(tried) < len(self.members):
+                print(f"{member.name} 失败 {len(failed)} 条，转给其他提供商")
+            pending = [pending[i] for i in failed]
+        return results
+
+    async def _run_async(
+        self, items, call, target_langs, style, is_failed=None
+    ) -> list:
+        """_run 的异步版本"""
+        is_failed = is_failed or self._failed
+        results = [None] * len(items)
+        pending = list(range(len(items)))
+        tried = set()
+        while pending:
+            member = self._select(tried)
+            if member is None:
+                self._exhausted([items[i] for i in pending], target_langs, style, tried)
+                break
+            tried.add(member)
+            delay = self._wait_time(member)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            subset = [items[i] for i in pending]
+            started = self.clock()
+            if self._has_fallback(tried):
+                with fail_fast():
+                    partial = await call(member.translator, subset)
+            else:
+                partial = await call(member.translator, subset)
+            failed = is_failed(subset, partial)
+            self._record(member, started, len(subset), len(failed))
+            for index, result in zip(pending, partial):
+                results[index] = result
+            if failed and len(tried) < len(self.members):
+                print(f"{member.name} 失败 {len(failed)} 条，转给其他提供商")
+            pending = [pending[i] for i in failed]
+        return results
+
+    def plan_batches(
+        self, items: List[Tuple[str, str]], langs: int = 1
+    ) -> List[Tuple[int, int]]:
+        """
+        按支持批量请求的成员中划分最细的计划分批，
+        分配到预算更小的成员时由该成员在内部再拆分
+        """
+        plans = [
+            member.translator.plan_batches(items, langs)
+            for member in self.members
+            if member.translator.IsSupportBatch
+        ]
+        if not plans:
+            return [(index, index + 1) for index in range(len(items))]
+        return max(plans, key=len)
+
+    def translate_text(
+        self, text: str, target_lang: str, style: str = None, comment: str = None
+    ) -> str:
+        return self.translate_batch([(text, comment)], target_lang, style)[0]
+
+    async def translate_text_async(
+        self, text: str, target_lang: str, style: str = None, comment: str = None
+    ) -> str:
+        return (
+            await self.translate_batch_async([(text, comment)], target_lang, style)
+        )[0]
+
+    def translate_batch(
+        self, items: List[Tuple[str, str]], target_lang: str, style: str = None
+    ) -> List[str]:
+        return self._run(
+            items,
+            lambda translator, subset: translator.translate_batch(
+                subset, target_lang, style
+            ),
+            target_lang,
+            style,
+        )
+
+    async def translate_batch_async(
+        self, items: List[Tuple[str, str]], target_lang: str, style: str = None
+    ) -> List[str]:
+        return await self._run_async(
+            items,
+            lambda translator, subset: translator.translate_batch_async(
+                subset, target_lang, style
+            ),
+            target_lang,
+            style,
+        )
+
+    @staticmethod
+    def _multi_failed(target_langs: List[str]) -> Callable:
+        """多目标语言结果中缺少任一语言译文的条目视为失败"""
+
+        def is_failed(subset, results):
+            return [
+                index
+                for index, ((text, _), translations) in enumerate(zip(subset, results))
+                if text
+                and text.strip()
+                and not all(
+                    (translations.get(lang) or "").strip() for lang in target_langs
+                )
+            ]
+
+        return is_failed
+
+    @staticmethod
+    def _fill_multi(results: list, target_langs: List[str]) -> List[Dict[str, str]]:
+        return [
+            result if result is not None else {lang: "" for lang in target_langs}
+            for result in results
+        ]
+
+    def translate_multi(
+        self, items: List[Tuple[str, str]], target_langs: List[str], style: str = None
+    ) -> List[Dict[str, str]]:
+        results = self._run(
+            items,
+            lambda translator, subset: translator.translate_multi(
+                subset, target_langs, style
+            ),
+            target_langs,
+            style,
+            self._multi_failed(target_langs),
+        )
+        return self._fill_multi(results, target_langs)
+
+    async def translate_multi_async(
+        self, items: List[Tuple[str, str]], target_langs: List[str], style: str = None
+    ) -> List[Dict[str, str]]:
+        results = await self._run_async(
+            items,
+            lambda translator, subset: translator.translate_multi_async(
+                subset, target_langs, style
+            ),
+            target_langs,
+            style,
+            self._multi_failed(target_langs),
+        )
+        return self._fill_multi(results, target_langs)
+
+    def stats(self) -> List[dict]:
+        """各成员的权重、延迟与成功/失败次数"""
+        return [
+            {
+                "name": member.name,
+                "weight": member.weight,
+                "effective_weight": round(self.effective_weight(member), 3),
+                "latency": round(member.latency, 4) if member.latency else None,
+                "successes": member.successes,
+                "failures": member.failures,
+            }
+            for member in self.members
+        ]
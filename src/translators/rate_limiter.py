@@ -0,0 +1,239 @@
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    粗略估计文本的 token 数：CJK 字符约 1 token/字，其余字符约 4 字符/token
+    """
+    if not text:
+        return 0
+    cjk = sum(1 for ch in text if ord(ch) >= 0x2E80)
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+class TokenBucket:
+    """
+    令牌桶（允许欠账）
+
+    预约时直接扣减令牌，令牌不足时余额为负，返回需要等待的秒数。
+    这样在锁内只做计算，等待在锁外进行，线程与协程都不会互相阻塞
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.timestamp = None
+
+    def reserve(self, amount: float, now: float) -> float:
+        """扣减 amount 个令牌，返回可以开始请求前需要等待的秒数"""
+        if self.timestamp is not None:
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.timestamp) * self.rate
+            )
+        self.timestamp = now
+        self.tokens -= amount
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+    def refund(self, amount: float):
+        """归还（或在 amount 为负时追加扣减）令牌，用于按实际用量校正预估值"""
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def to_dict(self) -> dict:
+        return {"tokens": self.tokens, "timestamp": self.timestamp}
+
+    def load(self, state: dict):
+        self.tokens = state.get("tokens", self.tokens)
+        self.timestamp = state.get("timestamp", self.timestamp)
+
+
+class _FileLock:
+    """基于 fcntl / msvcrt 的跨进程文件锁"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path, "a+b")
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        else:
+            self._file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+class RateLimiter:
+    """
+    请求数/分钟（RPM）与 token 数/分钟（TPM）双令牌桶限流器
+
+    同一进程内的线程与协程共享一把线程锁；配置了 shared_dir 时，
+    令牌桶状态保存在文件中并通过文件锁在多个进程之间共享
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rpm: Optional[float],
+        tpm: Optional[float] = None,
+        shared_dir: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        初始化限流器
+
+        参数:
+        name (str): 限流器名称，通常由提供商和 API Key 摘要组成
+        rpm (float): 每分钟请求数上限，为空或 0 表示不限制
+        tpm (float): 每分钟 token 数上限，为空或 0 表示不限制
+        shared_dir (str): 跨进程共享状态的目录，为空时仅在进程内共享
+        clock (Callable): 时间函数，便于测试
+        """
+        self.name = name
+        self.clock = clock
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm, capacity=max(1.0, tpm / 60.0)) if tpm else None
+        self._lock = threading.Lock()
+        self._state_path = None
+        if shared_dir:
+            Path(shared_dir).mkdir(parents=True, exist_ok=True)
+            self._state_path = Path(shared_dir) / f"{name}.json"
+            self._lock_path = Path(shared_dir) / f"{name}.lock"
+
+    def _buckets(self) -> Dict[str, TokenBucket]:
+        buckets = {}
+        if self.requests is not None:
+            buckets["requests"] = self.requests
+        if self.tokens is not None:
+            buckets["tokens"] = self.tokens
+        return buckets
+
+    def _update(self, action: Callable[[], float]) -> float:
+        """在线程锁（以及可选的文件锁）内同步状态并执行 action"""
+        with self._lock:
+            if self._state_path is None:
+                return action()
+            with _FileLock(self._lock_path):
+                if self._state_path.exists():
+                    try:
+                        with open(self._state_path, "r", encoding="utf-8") as f:
+                            state = json.load(f)
+                    except (OSError, ValueError):
+                        state = {}
+                    for key, bucket in self._buckets().items():
+                        if key in state:
+                            bucket.load(state[key])
+                result = action()
+                tmp_path = self._state_path.with_suffix(".tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(
+                        {key: b.to_dict() for key, b in self._buckets().items()}, f
+                    )
+                os.replace(tmp_path, self._state_path)
+                return result
+
+    def reserve(self, tokens: int = 0) -> float:
+        """预约一次请求及 tokens 个 token，返回需要等待的秒数"""
+
+        def action():
+            now = self.clock()
+            wait = 0.0
+            if self.requests is not None:
+                wait = max(wait, self.requests.reserve(1, now))
+            if self.tokens is not None and tokens:
+                wait = max(wait, self.tokens.reserve(tokens, now))
+            return wait
+
+        return self._update(action)
+
+    def acquire(self, tokens: int = 0):
+        """阻塞直到允许发起请求"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: int = 0):
+        """异步等待直到允许发起请求"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def adjust_tokens(self, delta: int):
+        """按实际 token 用量校正预约值，delta 为实际用量减去预约量"""
+        if self.tokens is None or not delta:
+            return
+
+        def action():
+            self.tokens.refund(-delta)
+            return 0.0
+
+        self._update(action)
+
+
+_registry: Dict[str, RateLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def default_shared_dir(scope: Optional[str] = None) -> str:
+    """
+    跨进程共享状态的默认目录，scope（通常是配置文件路径）不同的任务使用不同的子目录，
+    互不影响
+    """
+    base = os.path.join(tempfile.gettempdir(), "multimodel_localization", "ratelimits")
+    if not scope:
+        return base
+    return os.path.join(base, hashlib.sha256(scope.encode()).hexdigest()[:12])
+
+
+def get_rate_limiter(
+    provider: str,
+    api_key: Optional[str],
+    rpm: Optional[float],
+    tpm: Optional[float] = None,
+    shared_dir: Optional[str] = None,
+) -> RateLimiter:
+    """
+    获取按提供商与 API Key 共享的限流器，同一进程内相同参数返回同一实例
+    """
+    key_digest = hashlib.sha256((api_key or "").encode()).hexdigest()[:12]
+    name = f"{provider}-{key_digest}"
+    registry_key = f"{name}:{rpm}:{tpm}:{shared_dir}"
+    with _registry_lock:
+        limiter = _registry.get(registry_key)
+        if limiter is None:
+            limiter = RateLimiter(name, rpm, tpm, shared_dir)
+            _registry[registry_key] = limiter
+        return limiter
@@ -0,0 +1,80 @@
+import importlib
+import threading
+from typing import Callable, Dict, List, Union
+
+# 第三方翻译器通过该入口点组注册：名称为 model_type，值为 "模块:工厂"
+ENTRY_POINT_GROUP = "multimodel_localization.translators"
+
+# 内置翻译器：model_type -> "模块:工厂"（以 . 开头的模块相对于本包），
+# 只有实际使用时才导入对应模块及其 SDK
+BUILTIN_TRANSLATORS = {
+    "Doubao": ".DoubaoTranslator:DoubaoTranslator",
+    "DeepSeek": ".OpenAIBaseedTranslator:OpenAIBaseedTranslator",
+    "Kimi": ".OpenAIBaseedTranslator:OpenAIBaseedTranslator",
+    "TongYi": ".OpenAIBaseedTranslator:OpenAIBaseedTranslator",
+    "TongYiQwen": ".TongYiQwenTranslator:TongYiQwenTranslator",
+}
+
+_registry: Dict[str, Union[str, Callable]] = dict(BUILTIN_TRANSLATORS)
+_entry_points_loaded = False
+_lock = threading.Lock()
+
+
+def register_translator(model_type: str, factory: Union[str, Callable]):
+    """
+    注册翻译器
+
+    参数:
+    model_type (str): 配置中的 model_type
+    factory (str | Callable): 以 config 为参数返回翻译器实例的可调用对象（通常是翻译器类），
+        或 "模块:属性" 形式的字符串，在首次创建该类型的翻译器时才导入
+    """
+    with _lock:
+        _registry[model_type] = factory
+
+
+def _load_entry_points():
+    """读取已安装包声明的翻译器入口点，只记录名称与位置，不导入模块"""
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+    from importlib.metadata import entry_points
+
+    try:
+        found = entry_points(group=ENTRY_POINT_GROUP)
+    except TypeError:  # Python 3.8/3.9 返回 {组名: [入口点]}
+        found = entry_points().get(ENTRY_POINT_GROUP, [])
+    for entry_point in found:
+        # 显式注册的同名翻译器优先
+        _registry.setdefault(entry_point.name, entry_point.value)
+
+
+def _resolve(target: str) -> Callable:
+    module_name, _, attribute = target.partition(":")
+    factory = importlib.import_module(module_name, __package__)
+    for name in attribute.split("."):
+        factory = getattr(factory, name)
+    return factory
+
+
+def get_translator_factory(model_type: str) -> Callable:
+    """返回 model_type 对应的工厂，必要时导入其模块；未注册的类型抛出 ValueError"""
+    with _lock:
+        factory = _registry.get(model_type)
+        if factory is None:
+            _load_entry_points()
+            factory = _registry.get(model_type)
+        if factory is None:
+            raise ValueError(f"Unsupported model type: {model_type}")
+        if isinstance(factory, str):
+            factory = _resolve(factory)
+            _registry[model_type] = factory
+        return factory
+
+
+def available_translators() -> List[str]:
+    """所有已注册（包括通过入口点声明）的 model_type"""
+    with _lock:
+        _load_entry_points()
+        return sorted(_registry)
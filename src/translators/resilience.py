@@ -0,0 +1,189 @@
+import contextvars
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+from .adaptive_concurrency import error_feedback, is_network_error
+
+# 错误分类
+RATE_LIMITED = "rate_limited"  # 429，稍后重试
+TRANSIENT = "transient"  # 超时、连接中断、5xx，稍后重试
+AUTH = "auth"  # 401/403，API Key 或权限问题，重试无意义
+FATAL = "fatal"  # 其余请求错误（400/404/422 等）或代码错误，重试无意义
+CIRCUIT_OPEN = "circuit_open"  # 熔断中，未发起请求
+
+RETRYABLE = {RATE_LIMITED, TRANSIENT, CIRCUIT_OPEN}
+# 调用方可以转给其他提供商时，这些错误不在当前提供商上等待重试
+FAIL_FAST = {RATE_LIMITED, CIRCUIT_OPEN}
+
+# 当前调用链是否快速失败，由号池在还有其他成员可以接手时设置；
+# 线程与协程各自持有独立的值，互不影响
+_fail_fast = contextvars.ContextVar("fail_fast", default=False)
+
+
+@contextmanager
+def fail_fast():
+    """在此范围内发起的请求遇到限流或熔断时立即失败，不按重试策略等待"""
+    token = _fail_fast.set(True)
+    try:
+        yield
+    finally:
+        _fail_fast.reset(token)
+
+
+def failing_fast() -> bool:
+    return _fail_fast.get()
+
+
+class CircuitOpenError(Exception):
+    """提供商处于熔断状态时快速失败，不发起请求"""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"Circuit open for {name}, retry in {retry_in:.1f}s")
+        self.retry_in = retry_in
+
+
+def classify_error(error: Exception) -> str:
+    """把 SDK 或网络异常归类，决定是否重试以及是否计入熔断"""
+    if isinstance(error, CircuitOpenError):
+        return CIRCUIT_OPEN
+    status, _ = error_feedback(error)
+    if status == 429:
+        return RATE_LIMITED
+    if status in (401, 403):
+        return AUTH
+    if status is not None:
+        return TRANSIENT if status in (408, 409) or status >= 500 else FATAL
+    return TRANSIENT if is_network_error(error) else FATAL
+
+
+class RetryPolicy:
+    """有上限的指数退避重试，使用 full jitter 避免多个工作线程同时重试"""
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        rng: random.Random = None,
+    ):
+        self.max_retries = max(0, int(max_retries))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rng = rng or random.Random()
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """第 attempt 次（从 0 开始）失败后的等待秒数，不短于服务端给出的 Retry-After"""
+        backoff = self.rng.uniform(
+            0, min(self.max_delay, self.base_delay * (2**attempt))
+        )
+        return max(backoff, retry_after or 0.0)
+
+
+class CircuitBreaker:
+    """
+    按提供商共享的熔断器
+
+    连续 failure_threshold 次超时/5xx/鉴权失败后熔断，reset_timeout 秒内所有请求快速失败，
+    工作线程按剩余时间等待，相当于暂停队列；到期后只放行一个探测请求，成功则恢复
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.opened = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def check(self):
+        """请求前调用，熔断中抛出 CircuitOpenError"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            remaining = self.opened_at + self.reset_timeout - self.clock()
+            if self.state == self.OPEN and remaining <= 0:
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            raise CircuitOpenError(self.name, max(remaining, 0.5))
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self, category: str):
+        """只有提供商层面的故障计入熔断，单条请求的错误（400）与限流（429）不计入"""
+        with self._lock:
+            if category not in (TRANSIENT, AUTH):
+                if self.state == self.HALF_OPEN:
+                    self._probing = False
+                return
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.opened += 1
+                    print(
+                        f"{self.name} 连续失败 {self.failures} 次，"
+                        f"熔断 {self.reset_timeout:.0f} 秒"
+                    )
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+                self._probing = False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(
+    provider: str,
+    api_key: Optional[str],
+    failure_threshold: int = 5,
+    reset_timeout: float = 30.0,
+) -> CircuitBreaker:
+    """获取按提供商与 API Key 共享的熔断器，同一进程内的翻译器共用同一实例"""
+    key_digest = hashlib.sha256((api_key or "").encode()).hexdigest()[:12]
+    name = f"{provider}-{key_digest}"
+    registry_key = f"{name}:{failure_threshold}:{reset_timeout}"
+    with _breakers_lock:
+        breaker = _breakers.get(registry_key)
+        if breaker is None:
+            breaker = CircuitBreaker(name, failure_threshold, reset_timeout)
+            _breakers[registry_key] = breaker
+        return breaker
+
+
+def write_dead_letters(path, entries: list):
+    """把失败条目逐行写入 JSON Lines 文件；没有失败条目时删除上次遗留的文件"""
+    if not entries:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    print(f"{len(entries)} 条翻译失败，已记录到 {path}")
@@ -0,0 +1,166 @@
+import math
+import threading
+from typing import List, Optional, Sequence, Tuple
+
+from .rate_limiter import estimate_tokens
+
+# 批量请求中每条文本的 JSON 开销（id、引号、分隔符）
+ITEM_OVERHEAD = 8
+# 批量请求的指令部分（不含系统提示词）的 token 数上限估计
+INSTRUCTION_TOKENS = 128
+# 请求中 max_tokens 参数的默认下限，避免极短文本的预估误差导致译文被截断
+MIN_OUTPUT_TOKENS = 64
+
+
+def batch_size_from_config(config) -> int:
+    """
+    读取 batch_size，"auto" 表示只按 token 预算打包，条目数上限取 max_batch_items
+    """
+    value = config.get_config("batch_size", 1)
+    if isinstance(value, str) and value.strip().lower() == "auto":
+        return max(1, int(config.get_config("max_batch_items", 200)))
+    return max(1, int(value or 1))
+
+
+class TokenBudget:
+    """
+    按模型的上下文窗口与输出上限规划每次请求打包的条目数
+
+    本地估算器按字符数估计 token，与各家分词器存在偏差；每次请求返回实际用量后，
+    以指数滑动平均校正输入与输出的估算系数，使打包的请求贴近而不超过上限
+    """
+
+    def __init__(
+        self,
+        context_window: int = 32768,
+        max_output_tokens: int = 4096,
+        headroom: float = 0.8,
+        output_ratio: float = 2.0,
+        min_output_tokens: int = MIN_OUTPUT_TOKENS,
+        alpha: float = 0.2,
+    ):
+        """
+        参数:
+        context_window (int): 模型上下文窗口（输入 + 输出）的 token 数
+        max_output_tokens (int): 模型单次输出的 token 上限
+        headroom (float): 预估输出占输出上限的最大比例，其余作为估算误差的余量
+        output_ratio (float): 译文 token 数相对原文的初始估计倍数
+        min_output_tokens (int): 请求中 max_tokens 参数的下限
+        alpha (float): 校正系数的滑动平均权重
+        """
+        self.context_window = int(context_window)
+        self.max_output_tokens = max(1, int(max_output_tokens))
+        self.headroom = min(1.0, max(0.1, float(headroom)))
+        self.output_ratio = float(output_ratio)
+        self.min_output_tokens = min(int(min_output_tokens), self.max_output_tokens)
+        self.alpha = alpha
+        self.prompt_scale = 1.0  # 实际输入 token / 估计值
+        self.output_scale = 1.0  # 实际输出 token / 估计值
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config, max_tokens: int) -> "TokenBudget":
+        """max_tokens 只作为输出上限的默认值参与计算，请求的 max_tokens 按批次预估输出收缩"""
+        return cls(
+            config.get_config("context_window", 32768),
+            config.get_config("max_output_tokens", max(4096, max_tokens)),
+            config.get_config("token_headroom", 0.8),
+            config.get_config("output_token_ratio", 2.0),
+            config.get_config("min_output_tokens", MIN_OUTPUT_TOKENS),
+        )
+
+    def prompt_estimate(self, payload: dict) -> int:
+        """请求消息的输入 token 估计"""
+        return sum(
+            estimate_tokens(message.get("content"))
+            for message in payload.get("messages", [])
+            if isinstance(message.get("content"), str)
+        )
+
+    def output_estimate(self, text: str, langs: int = 1, overhead: int = 0) -> int:
+        """一条文本译为 langs 种语言的输出 token 估计"""
+        return langs * (math.ceil(self.output_ratio * estimate_tokens(text)) + overhead)
+
+    def max_tokens(self, expected_output: int) -> int:
+        """请求的 max_tokens 参数：为校正后的预估输出留出余量，不超过模型输出上限"""
+        needed = math.ceil(expected_output * self.output_scale / self.headroom)
+        return min(self.max_output_tokens, max(self.min_output_tokens, needed))
+
+    def fits(self, prompt_tokens: int, output_tokens: int) -> bool:
+        """预估的输入与输出是否在上下文窗口与输出上限之内"""
+        scaled_output = output_tokens * self.output_scale
+        if scaled_output > self.headroom * self.max_output_tokens:
+            return False
+        scaled_prompt = prompt_tokens * self.prompt_scale
+        return scaled_prompt + self.max_tokens(output_tokens) <= self.context_window
+
+    def plan(
+        self,
+        items: Sequence[Tuple[str, Optional[str]]],
+        base_prompt: int,
+        langs: int = 1,
+        max_items: int = None,
+    ) -> List[Tuple[int, int]]:
+        """
+        将 (text, comment) 列表按顺序划分为连续的 [start, end) 区间，
+        每个区间的预估用量在预算之内且条目数不超过 max_items；
+        单条即超出预算时单独成为一个区间
+
+        参数:
+        items: 待翻译的 (text, comment) 列表
+        base_prompt (int): 系统提示词与指令的 token 估计
+        langs (int): 每条文本的目标语言数
+        max_items (int): 每个区间的条目数上限，None 表示不限
+        """
+        groups = []
+        start = 0
+        prompt = base_prompt
+        output = 0
+        for index, (text, comment) in enumerate(items):
+            item_prompt = (
+                estimate_tokens(text) + estimate_tokens(comment) + ITEM_OVERHEAD
+            )
+            item_output = self.output_estimate(text, langs, ITEM_OVERHEAD)
+            full = max_items is not None and index - start >= max_items
+            if index > start and (
+                full or not self.fits(prompt + item_prompt, output + item_output)
+            ):
+                groups.append((start, index))
+                start = index
+                prompt = base_prompt
+                output = 0
+            prompt += item_prompt
+            output += item_output
+        if start < len(items):
+            groups.append((start, len(items)))
+        return groups
+
+    def observe(
+        self,
+        prompt_estimate: int,
+        prompt_tokens: int,
+        output_estimate: int,
+        completion_tokens: int,
+    ):
+        """根据实际用量校正估算系数，系数限制在 [0.25, 4] 之内"""
+        with self._lock:
+            if prompt_estimate > 0 and prompt_tokens:
+                self.prompt_scale = self._blend(
+                    self.prompt_scale, prompt_tokens / prompt_estimate
+                )
+            if output_estimate > 0 and completion_tokens:
+                self.output_scale = self._blend(
+                    self.output_scale, completion_tokens / output_estimate
+                )
+
+    def _blend(self, current: float, sample: float) -> float:
+        sample = min(4.0, max(0.25, sample))
+        return (1 - self.alpha) * current + self.alpha * sample
+
+    def report(self) -> dict:
+        return {
+            "context_window": self.context_window,
+            "max_output_tokens": self.max_output_tokens,
+            "prompt_scale": round(self.prompt_scale, 3),
+            "output_scale": round(self.output_scale, 3),
+        }
@@ -0,0 +1,206 @@
+import hashlib
+import json
+import threading
+import unicodedata
+from typing import List, Optional
+
+from .fuzzy_memory import FuzzyMemory
+from .translation_memory import TranslationMemory
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """规范化文本：Unicode NFC、统一换行符并去除首尾空白"""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFC", text)
+    return text.replace("\r\n", "\n").replace("\r", "\n").strip()
+
+
+def source_hash(text: Optional[str]) -> str:
+    """规范化原文的摘要，用于翻译记忆库的索引"""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    """
+    内容寻址的翻译缓存
+
+    缓存键由规范化后的原文、注释、目标语言、翻译风格、模型以及提示词指纹共同决定，
+    与条目在源文件中的键名无关，因此不同文件、JSON/CSV/GUI 各入口之间都可以复用译文。
+    同时统计命中与未命中次数，用于估算节省的 API 调用
+    """
+
+    def __init__(
+        self,
+        memory: TranslationMemory,
+        model: str,
+        prompt_fingerprint: str,
+        enabled: bool = True,
+        fuzzy: FuzzyMemory = None,
+    ):
+        """
+        初始化翻译缓存
+
+        参数:
+        memory (TranslationMemory): 底层翻译记忆库
+        model (str): 模型名称
+        prompt_fingerprint (str): 提示词指纹，提示词变化后旧译文不会被命中
+        enabled (bool): 是否启用查询，关闭时仍然写入译文
+        fuzzy (FuzzyMemory): 可选的模糊匹配索引，精确未命中时复用只有数字不同的译文，
+            应与本缓存使用相同的模型与提示词指纹
+        """
+        self.memory = memory
+        self.model = model
+        self.prompt_fingerprint = prompt_fingerprint
+        self.enabled = enabled
+        self.fuzzy = fuzzy
+        # 可选的请求指标，按提供商与语言记录命中情况
+        self.metrics = None
+        self.provider = model
+        self.hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_translator(cls, config, translator) -> "TranslationCache":
+        """根据配置与翻译器创建缓存"""
+        return cls(
+            config.translation_cache,
+            translator.model,
+            translator.prompt_fingerprint,
+            config.get_config("use_cache", False),
+            FuzzyMemory.from_config(
+                config,
+                config.translation_cache,
+                translator.model,
+                translator.prompt_fingerprint,
+            ),
+        )
+
+    def make_key(
+        self, text: str, comment: Optional[str], target_lang: str, style: str
+    ) -> str:
+        material = json.dumps(
+            [
+                normalize_text(text),
+                normalize_text(comment),
+                target_lang,
+                style,
+                self.model,
+                self.prompt_fingerprint,
+            ],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(
+        self, text: str, comment: Optional[str], target_lang: str, style: str
+    ) -> Optional[str]:
+        """查询译文，未启用缓存时始终返回 None 且不计入统计"""
+        if not self.enabled:
+            return None
+        cache_key = self.make_key(text, comment, target_lang, style)
+        translated_text = self.memory.get(cache_key)
+        reused = False
+        if translated_text is None and self.fuzzy is not None:
+            translated_text = self.fuzzy.reuse(
+                normalize_text(text), target_lang, style, normalize_text(comment)
+            )
+            if translated_text is not None:
+                # 复用的译文按精确键写入并标记，之后的查询直接命中，
+                # 但不会作为模糊匹配的来源；实际翻译后写入的译文会覆盖它
+                reused = True
+                self._store(
+                    cache_key, text, comment, target_lang, style, translated_text, True
+                )
+        with self._lock:
+            if translated_text is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.fuzzy_hits += reused
+        if self.metrics is not None:
+            self.metrics.record_cache(
+                self.provider, target_lang, translated_text is not None
+            )
+        return translated_text
+
+    def put(
+        self,
+        text: str,
+        comment: Optional[str],
+        target_lang: str,
+        style: str,
+        translated_text: str,
+    ):
+        """写入译文，空译文（通常是请求失败）不会写入"""
+        if not translated_text or not translated_text.strip():
+            return
+        self._store(
+            self.make_key(text, comment, target_lang, style),
+            text,
+            comment,
+            target_lang,
+            style,
+            translated_text,
+        )
+        with self._lock:
+            self.stores += 1
+
+    def _store(
+        self,
+        cache_key: str,
+        text: str,
+        comment: Optional[str],
+        target_lang: str,
+        style: str,
+        translated_text: str,
+        reused: bool = False,
+    ):
+        source = normalize_text(text)
+        comment = normalize_text(comment)
+        self.memory.put(
+            cache_key,
+            translated_text,
+            source_hash=source_hash(text),
+            lang=target_lang,
+            style=style,
+            model=self.model,
+            source=source,
+            comment=comment,
+            prompt_fingerprint=self.prompt_fingerprint,
+            reused=reused,
+        )
+        if self.fuzzy is not None and not reused:
+            self.fuzzy.add(source, target_lang, style, translated_text, comment)
+
+    def references(self, text: str, target_lang: str, style: str) -> List[dict]:
+        """相似原文的已有译文，作为翻译请求的参考示例"""
+        if not self.enabled or self.fuzzy is None:
+            return []
+        return self.fuzzy.references(normalize_text(text), target_lang, style)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        """缓存统计：命中即节省的翻译请求数"""
+        return {
+            "hits": self.hits,
+            "fuzzy_hits": self.fuzzy_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_rate": round(self.hit_rate, 4),
+            "saved_requests": self.hits,
+        }
+
+    def summary(self) -> str:
+        fuzzy = f"（其中模糊匹配 {self.fuzzy_hits} 条）" if self.fuzzy_hits else ""
+        return (
+            f"缓存命中 {self.hits} 条{fuzzy}，未命中 {self.misses} 条，"
+            f"命中率 {self.hit_rate:.1%}，节省 {self.hits} 次翻译请求"
+        )
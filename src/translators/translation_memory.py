@@ -0,0 +1,276 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+SQLITE_HEADER = b"SQLite format 3\x00"
+
+
+class TranslationMemory:
+    """
+    基于 SQLite（WAL 模式）的翻译记忆库
+
+    每条译文在完成时立即写入，查询按键单点读取，不需要在启动时加载整个缓存；
+    WAL 模式下多个进程可以同时读取，写入由 SQLite 串行化。
+    数据库在首次访问时才会创建，旧版 JSON 缓存文件会在首次访问时自动迁移
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS translations (
+            cache_key TEXT PRIMARY KEY,
+            source_hash TEXT,
+            lang TEXT,
+            style TEXT,
+            model TEXT,
+            text TEXT NOT NULL,
+            updated_at REAL NOT NULL,
+            source TEXT,
+            comment TEXT,
+            prompt_fingerprint TEXT,
+            reused INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS idx_translations_source
+            ON translations (source_hash, lang, style, model);
+    """
+    # 旧版数据库缺少的列，打开时自动增加
+    MIGRATIONS = {
+        # 早期版本的数据库没有保存原文，模糊匹配只能使用之后写入的译文
+        "source": "source TEXT",
+        # 模糊匹配按注释与提示词指纹区分译文，没有记录的旧译文不参与模糊匹配
+        "comment": "comment TEXT",
+        "prompt_fingerprint": "prompt_fingerprint TEXT",
+        # 模糊复用（替换数字）得到的译文，不作为之后模糊匹配的来源
+        "reused": "reused INTEGER NOT NULL DEFAULT 0",
+    }
+    FUZZY_INDEX = """
+        CREATE INDEX IF NOT EXISTS idx_translations_fuzzy
+            ON translations (lang, style, model, prompt_fingerprint, updated_at);
+    """
+
+    def __init__(self, db_path: str):
+        """
+        初始化翻译记忆库
+
+        参数:
+        db_path (str): 数据库文件路径，若该路径是旧版 JSON 缓存则在首次访问时迁移
+        """
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        # 各线程打开的连接，线程结束后自动移除，close_all() 时统一关闭
+        self._connections = weakref.WeakKeyDictionary()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            str(self.db_path), timeout=30, check_same_thread=False
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """当前线程的数据库连接"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            self._initialize()
+            connection = self._connect()
+            self._local.connection = connection
+            with self._init_lock:
+                self._connections[threading.current_thread()] = connection
+        return connection
+
+    def _initialize(self):
+        with self._init_lock:
+            if self._initialized:
+                return
+            legacy = self._read_legacy_json()
+            if self.db_path.parent:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = self._connect()
+            try:
+                connection.executescript(self.SCHEMA)
+                columns = {
+                    row[1]
+                    for row in connection.execute("PRAGMA table_info(translations)")
+                }
+                for column, definition in self.MIGRATIONS.items():
+                    if column not in columns:
+                        connection.execute(
+                            f"ALTER TABLE translations ADD COLUMN {definition}"
+                        )
+                connection.executescript(self.FUZZY_INDEX)
+                if legacy:
+                    now = time.time()
+                    connection.executemany(
+                        "INSERT OR IGNORE INTO translations (cache_key, text, updated_at)"
+                        " VALUES (?, ?, ?)",
+                        [
+                            (key, value, now)
+                            for key, value in legacy.items()
+                            if isinstance(value, str)
+                        ],
+                    )
+                connection.commit()
+            finally:
+                connection.close()
+            self._initialized = True
+
+    def _read_legacy_json(self) -> Optional[dict]:
+        """若数据库路径上是旧版 JSON 缓存，读取其内容并将原文件改名为 .json.bak"""
+        if not self.db_path.exists() or self.db_path.stat().st_size == 0:
+            return None
+        with open(self.db_path, "rb") as f:
+            if f.read(len(SQLITE_HEADER)) == SQLITE_HEADER:
+                return None
+        with open(self.db_path, "r", encoding="utf-8") as f:
+            try:
+                legacy = json.load(f)
+            except ValueError:
+                legacy = {}
+        backup_path = self.db_path.with_name(self.db_path.name + ".json.bak")
+        os.replace(self.db_path, backup_path)
+        print(f"Migrated JSON cache to SQLite, backup at {backup_path}")
+        return legacy if isinstance(legacy, dict) else {}
+
+    def get(self, cache_key: str, default: Optional[str] = None) -> Optional[str]:
+        row = self.connection.execute(
+            "SELECT text FROM translations WHERE cache_key = ?", (cache_key,)
+        ).fetchone()
+        return row[0] if row else default
+
+    def put(
+        self,
+        cache_key: str,
+        text: str,
+        source_hash: str = None,
+        lang: str = None,
+        style: str = None,
+        model: str = None,
+        source: str = None,
+        comment: str = None,
+        prompt_fingerprint: str = None,
+        reused: bool = False,
+    ):
+        """写入（或覆盖）一条译文并立即提交，reused 标记模糊复用得到的译文"""
+        connection = self.connection
+        connection.execute(
+            "INSERT INTO translations"
+            " (cache_key, source_hash, lang, style, model, text, updated_at, source,"
+            " comment, prompt_fingerprint, reused)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT(cache_key) DO UPDATE SET"
+            " source_hash = excluded.source_hash, lang = excluded.lang,"
+            " style = excluded.style, model = excluded.model,"
+            " text = excluded.text, updated_at = excluded.updated_at,"
+            " source = excluded.source, comment = excluded.comment,"
+            " prompt_fingerprint = excluded.prompt_fingerprint,"
+            " reused = excluded.reused",
+            (
+                cache_key,
+                source_hash,
+                lang,
+                style,
+                model,
+                text,
+                time.time(),
+                source,
+                comment,
+                prompt_fingerprint,
+                int(reused),
+            ),
+        )
+        connection.commit()
+
+    def lookup(
+        self, source_hash: str, lang: str, style: str = None, model: str = None
+    ) -> Optional[str]:
+        """按原文摘要、语言、风格与模型查询最近的一条译文"""
+        row = self.connection.execute(
+            "SELECT text FROM translations"
+            " WHERE source_hash = ? AND lang = ? AND style IS ? AND model IS ?"
+            " ORDER BY updated_at DESC LIMIT 1",
+            (source_hash, lang, style, model),
+        ).fetchone()
+        return row[0] if row else None
+
+    def sources(
+        self,
+        lang: str,
+        style: str = None,
+        model: str = None,
+        prompt_fingerprint: str = None,
+        limit: int = None,
+    ) -> Iterator[Tuple[str, str, str]]:
+        """
+        从新到旧逐条遍历某个语言、风格、模型与提示词指纹下保存了原文的
+        (原文, 译文, 注释)，不包含模糊复用得到的译文；limit 限制返回的条数
+        """
+        cursor = self.connection.execute(
+            "SELECT source, text, comment FROM translations"
+            " WHERE lang = ? AND style IS ? AND model IS ? AND prompt_fingerprint IS ?"
+            " AND source IS NOT NULL AND reused = 0"
+            " ORDER BY updated_at DESC, rowid DESC LIMIT ?",
+            (lang, style, model, prompt_fingerprint, -1 if limit is None else limit),
+        )
+        for row in cursor:
+            yield row[0], row[1], row[2] or ""
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        """逐条遍历 (cache_key, text)，不会一次性加载全部数据"""
+        cursor = self.connection.execute("SELECT cache_key, text FROM translations")
+        for row in cursor:
+            yield row[0], row[1]
+
+    def clear(self):
+        connection = self.connection
+        connection.execute("DELETE FROM translations")
+        connection.commit()
+
+    def flush(self):
+        """提交未完成的事务并将 WAL 合并回主数据库文件"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            return
+        connection.commit()
+        connection.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def close(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+            with self._init_lock:
+                self._connections.pop(threading.current_thread(), None)
+
+    def close_all(self):
+        """提交并关闭所有线程打开的连接，只能在不再使用该记忆库时调用"""
+        with self._init_lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for connection in connections:
+            connection.commit()
+            connection.close()
+        self._local = threading.local()
+
+    def __contains__(self, cache_key: str) -> bool:
+        return self.get(cache_key) is not None
+
+    def __getitem__(self, cache_key: str) -> str:
+        text = self.get(cache_key)
+        if text is None:
+            raise KeyError(cache_key)
+        return text
+
+    def __setitem__(self, cache_key: str, text: str):
+        self.put(cache_key, text)
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM translations").fetchone()[
+            0
+        ]
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+自适应并发控制测试文件
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import yaml
+
+# 添加src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from src.core.Localization import LocalizationProcessor, TranslatorFactory
+from src.translators.adaptive_concurrency import (
+    AdaptiveConcurrency,
+    error_feedback,
+    parse_retry_after,
+)
+from src.translators.BaseTranslator import BaseTranslator, LocalizationConfig
+
+
+class FakeClock:
+    """可手动推进的时钟"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class StatusError(Exception):
+    """与 SDK 状态错误结构一致的异常"""
+
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        headers = {"retry-after": retry_after} if retry_after is not None else {}
+        self.response = SimpleNamespace(headers=headers)
+
+
+class ThrottledTranslator(BaseTranslator):
+    """前几次请求返回 429 的模拟翻译器"""
+
+    def __init__(self, config, failures=1):
+        super().__init__(config)
+        self.failures = failures
+
+    def _build_payload(self, text, target_lang, style, comment):
+        return {"text": text, "lang": target_lang}
+
+    def _create_completion(self, payload):
+        if self.failures:
+            self.failures -= 1
+            raise StatusError(429, "0")
+        content = f"{payload['lang']}:{payload['text']}"
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=None,
+        )
+
+
+class TestAdaptiveConcurrency(unittest.TestCase):
+    """自适应并发控制测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.clock = FakeClock()
+        self.controller = AdaptiveConcurrency(
+            initial=4, min_limit=1, max_limit=8, clock=self.clock
+        )
+
+    def test_additive_increase(self):
+        """测试健康的请求使并发上限每轮约增加 1"""
+        for _ in range(4):
+            self.controller.on_success(0.5)
+        self.assertEqual(self.controller.current_limit, 4)
+        self.controller.on_success(0.5)
+        self.assertEqual(self.controller.current_limit, 5)
+        for _ in range(100):
+            self.controller.on_success(0.5)
+        self.assertEqual(self.controller.current_limit, 8)
+
+    def test_multiplicative_decrease_once_per_latency(self):
+        """测试 429/5xx 乘性退避，同一延迟周期内的连续失败只退避一次"""
+        self.controller.on_success(1.0)
+        self.controller.on_error(429)
+        self.controller.on_error(503)
+        self.assertEqual(self.controller.current_limit, 2)
+        self.clock.now += 2
+        self.controller.on_error(502)
+        self.assertEqual(self.controller.current_limit, 1)
+        self.controller.on_error(400)
+        self.assertEqual(self.controller.failures, 4)
+        reasons = [entry["reason"] for entry in self.controller.report()["history"]]
+        self.assertEqual(reasons, ["start", "http 429", "http 502"])
+
+    def test_errors_without_status(self):
+        """测试没有状态码时只有超时与连接错误退避，其他错误不调整并发上限"""
+        self.controller.on_error(None)
+        self.controller.on_error(None, error=ValueError("bad json"))
+        self.assertEqual(self.controller.current_limit, 4)
+        self.controller.on_error(None, error=TimeoutError())
+        self.assertEqual(self.controller.current_limit, 2)
+        self.clock.now += 1
+        self.controller.on_error(
+            None, error=type("APIConnectionError", (Exception,), {})()
+        )
+        self.assertEqual(self.controller.current_limit, 1)
+        self.assertEqual(self.controller.history[-1][2], "network")
+
+    def test_rising_latency_backs_off(self):
+        """测试延迟明显高于基线时退避"""
+        for _ in range(3):
+            self.controller.on_success(0.2)
+        limit = self.controller.current_limit
+        for _ in range(5):
+            self.controller.on_success(2.0)
+        self.assertLess(self.controller.current_limit, limit)
+        self.assertEqual(self.controller.history[-1][2], "latency")
+
+    def test_retry_after_blocks_dispatch(self):
+        """测试 Retry-After 期间不派发新请求"""
+        self.controller.on_error(429, 3.0)
+        self.assertAlmostEqual(self.controller.try_acquire(), 3.0)
+        self.clock.now += 3.0
+        self.assertEqual(self.controller.try_acquire(), 0.0)
+        self.assertEqual(self.controller.in_flight, 1)
+        self.controller.release()
+        self.assertEqual(self.controller.in_flight, 0)
+
+    def test_limit_caps_in_flight(self):
+        """测试在途数达到上限后需要等待"""
+        for _ in range(4):
+            self.assertEqual(self.controller.try_acquire(), 0.0)
+        self.assertGreater(self.controller.try_acquire(), 0)
+
+    def test_error_feedback(self):
+        """测试从异常中提取状态码与 Retry-After"""
+        self.assertEqual(error_feedback(StatusError(429, "2")), (429, 2.0))
+        self.assertEqual(error_feedback(ValueError("x")), (None, None))
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+
+    def test_run_report_contains_history(self):
+        """测试开启自适应并发后运行报告包含当前上限与调整历史"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_path = os.path.join(temp_dir, "config.yaml")
+            with open(config_path, "w", encoding="utf-8") as f:
+                yaml.dump(
+                    {
+                        "model_type": "DeepSeek",
+                        "model": "test-model",
+                        "cache_path": os.path.join(temp_dir, "cache.db"),
+                        "rate_limit": 60000,
+                        "rate_limit_shared": False,
+                        "adaptive_concurrency": True,
+                        "concurrency": 4,
+                        "retry_base_delay": 0.01,
+                    },
+                    f,
+                )
+            source_path = os.path.join(temp_dir, "source.json")
+            with open(source_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {f"k{i}": {"text": f"t{i}", "comment": ""} for i in range(6)}, f
+                )
+
+            config = LocalizationConfig(config_path)
+            translator = ThrottledTranslator(config)
+            with mock.patch.object(
+                TranslatorFactory, "create_translator", return_value=translator
+            ):
+                processor = LocalizationProcessor(config)
+            processor.generate_localization(source_path, ["en"], temp_dir)
+            config.translation_cache.close()
+
+            with open(
+                os.path.join(temp_dir, LocalizationProcessor.REPORT_FILE),
+                encoding="utf-8",
+            ) as f:
+                report = json.load(f)["concurrency"]
+            self.assertEqual(report["failures"], 1)
+            # 429 的请求重试后成功
+            self.assertEqual(report["successes"], 6)
+            self.assertEqual(report["retry_after_pauses"], 0)
+            self.assertEqual(report["history"][1]["reason"], "http 429")
+            self.assertEqual(
+                report["current_limit"], processor.controller.current_limit
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+异步并发翻译引擎测试文件
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import yaml
+
+# 添加src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from src.core.async_engine import AsyncTranslationEngine
+from src.core.Localization import LocalizationProcessor, TranslatorFactory
+from src.translators.BaseTranslator import BaseTranslator, LocalizationConfig
+
+
+class FakeTranslator(BaseTranslator):
+    """不访问网络的模拟翻译器，记录同时在途的请求数"""
+
+    def __init__(self, config: LocalizationConfig, delay: float = 0.01):
+        super().__init__(config)
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+
+    def translate_text(self, text, target_lang, style=None, comment=None):
+        self.calls += 1
+        return f"{target_lang}:{text}"
+
+    async def translate_text_async(self, text, target_lang, style=None, comment=None):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        # 让靠前的任务更慢完成，验证结果顺序不依赖完成顺序
+        await asyncio.sleep(self.delay * (1 + len(text) % 3))
+        self.in_flight -= 1
+        return f"{target_lang}:{text}"
+
+
+class TestAsyncEngine(unittest.TestCase):
+    """异步引擎测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.temp_dir.name, "config.yaml")
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            yaml.dump(
+                {
+                    "model_type": "DeepSeek",
+                    "model": "test-model",
+                    "cache_path": os.path.join(self.temp_dir.name, "test.cache"),
+                    "rate_limit": 1000,
+                },
+                f,
+            )
+        self.config = LocalizationConfig(self.config_path)
+
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+
+    def test_bounded_concurrency_and_order(self):
+        """测试在途请求数受限且结果保持提交顺序"""
+        translator = FakeTranslator(self.config)
+        engine = AsyncTranslationEngine(translator, concurrency=4)
+        items = [(f"text{'x' * i}", None) for i in range(20)]
+
+        results = asyncio.run(engine.translate_items(items, "en", "formal"))
+
+        self.assertEqual(results, [f"en:{text}" for text, _ in items])
+        self.assertLessEqual(translator.max_in_flight, 4)
+        self.assertGreater(translator.max_in_flight, 1)
+
+    def test_generate_localization_concurrent_output_is_key_ordered(self):
+        """测试并发模式输出文件的键顺序与源文件一致"""
+        source = {
+            f"key{i}": {"text": f"文本{'x' * i}", "comment": ""} for i in range(10)
+        }
+        source_path = os.path.join(self.temp_dir.name, "source.json")
+        with open(source_path, "w", encoding="utf-8") as f:
+            json.dump(source, f, ensure_ascii=False)
+
+        translator = FakeTranslator(self.config)
+        with mock.patch.object(
+            TranslatorFactory, "create_translator", return_value=translator
+        ):
+            processor = LocalizationProcessor(self.config, concurrency=3)
+
+        processor.generate_localization(
+            source_path, ["en", "ja"], self.temp_dir.name, "formal"
+        )
+
+        for lang in ["en", "ja"]:
+            with open(
+                os.path.join(self.temp_dir.name, f"{lang}.json"), encoding="utf-8"
+            ) as f:
+                output = json.load(f)
+            self.assertEqual(list(output.keys()), list(source.keys()))
+            self.assertEqual(output["key3"], f"{lang}:{source['key3']['text']}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量翻译测试文件
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+import yaml
+
+# 添加src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from src.translators.BaseTranslator import BaseTranslator, LocalizationConfig
+
+
+def make_completion(content: str):
+    """构造与 SDK 响应结构一致的对象"""
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=None,
+    )
+
+
+class ScriptedTranslator(BaseTranslator):
+    """按预设规则返回响应的翻译器，记录每次请求的条目数"""
+
+    def __init__(self, config: LocalizationConfig, drop_ids=(), malformed_once=False):
+        super().__init__(config)
+        self.IsSupportBatch = True
+        self.drop_ids = set(drop_ids)
+        self.malformed_once = malformed_once
+        self.requests = []
+
+    def _build_payload(self, text, target_lang, style, comment):
+        return {"single": text, "target_lang": target_lang}
+
+    def _create_completion(self, payload):
+        if "single" in payload:
+            self.requests.append(1)
+            return make_completion(f"{payload['target_lang']}:{payload['single']}")
+
+        entries = json.loads(payload["messages"][1]["content"])
+        self.requests.append(len(entries))
+        if self.malformed_once:
+            self.malformed_once = False
+            return make_completion("not json")
+        if "分别直接翻译为以下语言" in payload["messages"][0]["content"]:
+            result = {
+                entry["id"]: {lang: f"{lang}:{entry['text']}" for lang in ("en", "ja")}
+                for entry in entries
+                if entry["text"] not in self.drop_ids
+            }
+            self.drop_ids = set()
+            return make_completion(json.dumps(result))
+        result = {
+            entry["id"]: f"en:{entry['text']}"
+            for entry in entries
+            if entry["text"] not in self.drop_ids
+        }
+        # 第一次缺失后不再丢弃，模拟偶发遗漏
+        self.drop_ids = set()
+        return make_completion("```json\n" + json.dumps(result) + "\n```")
+
+
+class TestBatching(unittest.TestCase):
+    """批量翻译测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        config_path = os.path.join(self.temp_dir.name, "config.yaml")
+        with open(config_path, "w", encoding="utf-8") as f:
+            yaml.dump(
+                {
+                    "model_type": "DeepSeek",
+                    "model": "test-model",
+                    "system_prompt": "你是一名翻译",
+                    "cache_path": os.path.join(self.temp_dir.name, "test.cache"),
+                    "rate_limit": 60000,
+                    "rate_limit_shared": False,
+                    "batch_size": 8,
+                },
+                f,
+            )
+        self.config = LocalizationConfig(config_path)
+        self.items = [(f"t{i}", "注释" if i % 2 else None) for i in range(8)]
+
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+
+    def test_single_request_for_whole_batch(self):
+        """测试整批文本只发起一次请求"""
+        translator = ScriptedTranslator(self.config)
+        results = translator.translate_batch(self.items, "en", "formal")
+
+        self.assertEqual(results, [f"en:{text}" for text, _ in self.items])
+        self.assertEqual(translator.requests, [8])
+
+    def test_only_missing_items_are_retried(self):
+        """测试响应缺少部分条目时只重试缺失的条目"""
+        translator = ScriptedTranslator(self.config, drop_ids={"t2", "t5"})
+        results = translator.translate_batch(self.items, "en", "formal")
+
+        self.assertEqual(results, [f"en:{text}" for text, _ in self.items])
+        self.assertEqual(translator.requests, [8, 2])
+
+    def test_malformed_response_splits_batch(self):
+        """测试响应格式错误时整批拆分为两半重试"""
+        translator = ScriptedTranslator(self.config, malformed_once=True)
+        results = asyncio.run(translator.translate_batch_async(self.items, "en"))
+
+        self.assertEqual(results, [f"en:{text}" for text, _ in self.items])
+        self.assertEqual(translator.requests, [8, 4, 4])
+
+    def test_sync_and_async_share_the_same_flow(self):
+        """测试同步与异步批量翻译的请求序列与结果一致"""
+        outcomes = []
+        for run in (
+            lambda t: t.translate_batch(self.items, "en"),
+            lambda t: asyncio.run(t.translate_batch_async(self.items, "en")),
+        ):
+            translator = ScriptedTranslator(self.config, drop_ids={"t0", "t7"})
+            outcomes.append((run(translator), translator.requests))
+        self.assertEqual(outcomes[0], outcomes[1])
+        self.assertEqual(outcomes[0][1], [8, 2])
+
+    def test_system_prompt_sent_once_per_batch(self):
+        """测试批量请求中系统提示词只出现一次"""
+        translator = ScriptedTranslator(self.config)
+        payload, user_content = translator._build_batch_payload(
+            self.items, "en", "formal"
+        )
+
+        self.assertEqual(len(payload["messages"]), 2)
+        self.assertNotIn("你是一名翻译", user_content)
+        self.assertEqual(len(json.loads(user_content)), 8)
+
+    def test_multi_target_one_request_per_block(self):
+        """测试多目标语言模式一次请求返回所有语言，缺失的行单独重试"""
+        translator = ScriptedTranslator(self.config, drop_ids={"t3"})
+        translator.IsSupportMultiTarget = True
+        results = translator.translate_multi(self.items[:4], ["en", "ja"], "formal")
+
+        self.assertEqual(
+            results,
+            [{"en": f"en:{text}", "ja": f"ja:{text}"} for text, _ in self.items[:4]],
+        )
+        self.assertEqual(translator.requests, [4, 1])
+
+    def test_multi_target_fallback_per_language(self):
+        """测试不支持多目标语言的翻译器逐语言请求"""
+        translator = ScriptedTranslator(self.config)
+        results = translator.translate_multi(self.items[:2], ["en", "ja"], "formal")
+
+        self.assertEqual(results[1], {"en": "en:t1", "ja": "ja:t1"})
+        self.assertEqual(translator.requests, [1, 1, 1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
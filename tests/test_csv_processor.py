@@ -2,6 +2,10 @@ import unittest
 import os
 import json
 import csv
+import tempfile
+import threading
+import time
+import yaml
 from src.core.csv_processor import CSVProcessor
 
 class TestCSVProcessor(unittest.TestCase):
@@ -54,5 +58,164 @@ class TestCSVProcessor(unittest.TestCase):
             self.assertIn("Comment", headers)
             self.assertTrue(len(rows) > 0)  # 确保有数据行
 
+class FakeMultiTranslator:
+    """记录调用方式的模拟翻译器"""
+
+    def __init__(self, multi_target=True):
+        self.IsSupportMultiTarget = multi_target
+        self.multi_calls = []
+        self.single_calls = []
+
+    def translate_multi(self, items, target_langs, style=None):
+        self.multi_calls.append((len(items), list(target_langs)))
+        return [{lang: f"{lang}:{text}" for lang in target_langs} for text, _ in items]
+
+    def translate_text(self, text, target_lang, style=None, comment=None):
+        self.single_calls.append(target_lang)
+        return f"{target_lang}:{text}"
+
+
+class TestCSVMultiTarget(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.temp_dir.name, "config.yaml")
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            yaml.dump(
+                {
+                    "model_type": "DeepSeek",
+                    "model": "test-model",
+                    "api_key": "test-key",
+                    "cache_path": os.path.join(self.temp_dir.name, "test.cache"),
+                    "multi_target_rows": 2,
+                },
+                f,
+            )
+        self.csv_path = os.path.join(self.temp_dir.name, "sheet.csv")
+        with open(self.csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["ID", "zh-CN", "Comment", "en", "ja", "ko"])
+            for i in range(3):
+                writer.writerow([f"id{i}", f"文本{i}", "", "", "", ""])
+        self.output_dir = os.path.join(self.temp_dir.name, "out")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def read_output(self):
+        with open(os.path.join(self.output_dir, "sheet.csv"), encoding="utf-8") as f:
+            return list(csv.reader(f))
+
+    def test_one_request_per_block_of_rows(self):
+        processor = CSVProcessor(self.config_path)
+        processor.translator = FakeMultiTranslator()
+        processor.process_file(self.csv_path, self.output_dir)
+
+        self.assertEqual(
+            processor.translator.multi_calls,
+            [(2, ["en", "ja", "ko"]), (1, ["en", "ja", "ko"])],
+        )
+        self.assertEqual(processor.translator.single_calls, [])
+        rows = self.read_output()
+        self.assertEqual(rows[3], ["id2", "文本2", "", "en:文本2", "ja:文本2", "ko:文本2"])
+
+    def test_rows_grouped_by_missing_languages(self):
+        with open(self.config_path, encoding="utf-8") as f:
+            config = yaml.safe_load(f)
+        config["use_cache"] = True
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            yaml.dump(config, f)
+        processor = CSVProcessor(self.config_path)
+        processor.cache.put("文本0", "", "en", "formal", "cached:文本0")
+        processor.translator = DroppingTranslator("文本1", "ko")
+        processor.process_file(self.csv_path, self.output_dir)
+
+        # 每组只请求缺少的语言，缺少某种语言的条目只对该语言单独请求
+        self.assertEqual(
+            processor.translator.multi_calls,
+            [(1, ["ja", "ko"]), (1, ["en", "ja", "ko"]), (1, ["en", "ja", "ko"])],
+        )
+        self.assertEqual(processor.translator.single_calls, ["ko"])
+        rows = self.read_output()
+        self.assertEqual(rows[1][3:], ["cached:文本0", "ja:文本0", "ko:文本0"])
+        self.assertEqual(rows[2][3:], ["en:文本1", "ja:文本1", "ko:文本1"])
+
+    def test_fallback_to_per_language_calls(self):
+        processor = CSVProcessor(self.config_path)
+        processor.translator = FakeMultiTranslator(multi_target=False)
+        processor.process_file(self.csv_path, self.output_dir)
+
+        self.assertEqual(processor.translator.multi_calls, [])
+        self.assertEqual(len(processor.translator.single_calls), 9)
+        self.assertEqual(self.read_output()[1][3], "en:文本0")
+
+    def test_concurrent_rows_written_in_source_order(self):
+        processor = CSVProcessor(self.config_path, concurrency=3)
+        processor.translator = SlowTranslator()
+        processor.process_file(self.csv_path, self.output_dir)
+
+        self.assertGreater(processor.translator.max_active, 1)
+        rows = self.read_output()
+        self.assertEqual([row[0] for row in rows[1:]], ["id0", "id1", "id2"])
+        self.assertEqual(rows[3][4], "ja:文本2")
+
+    def test_partial_output_kept_on_failure(self):
+        processor = CSVProcessor(self.config_path)
+        processor.translator = FakeMultiTranslator()
+        processor._translate_rows = FailingAfter(processor._translate_rows, 1)
+        with self.assertRaises(RuntimeError):
+            processor.process_file(self.csv_path, self.output_dir)
+
+        rows = self.read_output()
+        self.assertEqual([row[0] for row in rows[1:]], ["id0", "id1"])
+
+
+class DroppingTranslator(FakeMultiTranslator):
+    """多目标结果中缺少指定条目某种语言的模拟翻译器"""
+
+    def __init__(self, text, lang):
+        super().__init__()
+        self.dropped = (text, lang)
+
+    def translate_multi(self, items, target_langs, style=None):
+        results = super().translate_multi(items, target_langs, style)
+        for (text, _), result in zip(items, results):
+            if text == self.dropped[0]:
+                result.pop(self.dropped[1], None)
+        return results
+
+
+class SlowTranslator(FakeMultiTranslator):
+    """耗时与行号相反、记录最大并发数的模拟翻译器"""
+
+    def __init__(self):
+        super().__init__()
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def translate_multi(self, items, target_langs, style=None):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.05 if items[0][0].endswith("0") else 0.01)
+        with self.lock:
+            self.active -= 1
+        return super().translate_multi(items, target_langs, style)
+
+
+class FailingAfter:
+    """调用指定次数后抛出异常的包装器"""
+
+    def __init__(self, func, calls):
+        self.func = func
+        self.calls = calls
+
+    def __call__(self, *args, **kwargs):
+        if self.calls <= 0:
+            raise RuntimeError("job died")
+        self.calls -= 1
+        return self.func(*args, **kwargs)
+
+
 if __name__ == '__main__':
     unittest.main()
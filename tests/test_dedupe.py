@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+翻译请求去重测试文件
+"""
+
+import csv
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import yaml
+
+# 添加src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from src.core.csv_processor import CSVProcessor
+from src.core.dedupe import Deduplicator
+from src.core.Localization import LocalizationProcessor, TranslatorFactory
+from src.translators.BaseTranslator import BaseTranslator, LocalizationConfig
+
+
+class RecordingTranslator(BaseTranslator):
+    """记录请求的模拟翻译器"""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.IsSupportMultiTarget = True
+        self.requests = []
+
+    def translate_text(self, text, target_lang, style=None, comment=None):
+        self.requests.append((target_lang, text))
+        return f"{target_lang}:{text}"
+
+    def translate_multi(self, items, target_langs, style=None):
+        self.requests.append((tuple(target_langs), [text for text, _ in items]))
+        return [{lang: f"{lang}:{text}" for lang in target_langs} for text, _ in items]
+
+
+class TestDeduplicator(unittest.TestCase):
+    """去重器测试类"""
+
+    def test_group_and_memo(self):
+        """测试规范化后相同的条目归为一组，LRU 超出上限时淘汰最旧的译文"""
+        dedupe = Deduplicator(memo_size=1)
+        unique, groups = dedupe.group(
+            [("确定", None), ("取消", ""), (" 确定\r\n", ""), ("确定", "按钮")]
+        )
+        self.assertEqual(unique, [("确定", None), ("取消", ""), ("确定", "按钮")])
+        self.assertEqual(groups, [[0, 2], [1], [3]])
+
+        dedupe.remember(("确定", None), "en", "formal", "OK")
+        self.assertEqual(dedupe.lookup(("确定", ""), "en", "formal"), "OK")
+        self.assertIsNone(dedupe.lookup(("确定", ""), "ja", "formal"))
+        dedupe.remember(("取消", None), "en", "formal", "Cancel")
+        self.assertIsNone(dedupe.lookup(("确定", ""), "en", "formal"))
+
+        dedupe.count(4, 1)
+        self.assertEqual(dedupe.stats()["deduplicated"], 3)
+        self.assertAlmostEqual(dedupe.ratio, 0.75)
+
+
+class TestDedupePipelines(unittest.TestCase):
+    """JSON 与 CSV 流程去重测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.temp_dir.name, "config.yaml")
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            yaml.dump(
+                {
+                    "model_type": "DeepSeek",
+                    "model": "test-model",
+                    "api_key": "test-key",
+                    "use_cache": False,
+                    "cache_path": os.path.join(self.temp_dir.name, "cache.db"),
+                    "stream_window": 2,
+                },
+                f,
+            )
+        self.output_dir = os.path.join(self.temp_dir.name, "out")
+
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+
+    def test_json_duplicates_translated_once(self):
+        """测试重复文本在窗口内和跨窗口都只请求一次"""
+        source_path = os.path.join(self.temp_dir.name, "source.json")
+        data = {
+            "ok1": {"text": "确定", "comment": ""},
+            "ok2": {"text": "确定", "comment": ""},
+            "cancel": {"text": "取消", "comment": ""},
+            "ok3": {"text": "确定 ", "comment": ""},
+            "ok4": {"text": "确定", "comment": "按钮"},
+        }
+        with open(source_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+        config = LocalizationConfig(self.config_path)
+        translator = RecordingTranslator(config)
+        with mock.patch.object(
+            TranslatorFactory, "create_translator", return_value=translator
+        ):
+            processor = LocalizationProcessor(config)
+        processor.generate_localization(source_path, ["en"], self.output_dir)
+        config.translation_cache.close()
+
+        self.assertEqual(
+            translator.requests, [("en", "确定"), ("en", "取消"), ("en", "确定")]
+        )
+        with open(os.path.join(self.output_dir, "en.json"), encoding="utf-8") as f:
+            output = json.load(f)
+        self.assertEqual(output["ok3"], "en:确定")
+        self.assertEqual(set(output), set(data))
+        self.assertEqual(processor.dedupe.stats()["requested"], 5)
+        self.assertEqual(processor.dedupe.stats()["dispatched"], 3)
+
+    def test_csv_duplicate_rows_translated_once(self):
+        """测试 CSV 中重复的行只请求一次，并分发到每一行"""
+        csv_path = os.path.join(self.temp_dir.name, "sheet.csv")
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["ID", "zh-CN", "en", "ja"])
+            for i, text in enumerate(["确定", "取消", "确定", "确定"]):
+                writer.writerow([f"id{i}", text, "", ""])
+
+        processor = CSVProcessor(self.config_path)
+        processor.multi_target_rows = 2
+        processor.translator = RecordingTranslator(processor.config)
+        processor.process_file(csv_path, self.output_dir)
+        processor.config.translation_cache.close()
+
+        self.assertEqual(
+            processor.translator.requests, [(("en", "ja"), ["确定", "取消"])]
+        )
+        with open(os.path.join(self.output_dir, "sheet.csv"), encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[4], ["id3", "确定", "en:确定", "ja:确定"])
+        self.assertAlmostEqual(processor.dedupe.ratio, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Excel 源文件读取测试文件
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import yaml
+
+# 添加src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from src.core.Localization import LocalizationProcessor, TranslatorFactory
+from src.translators.BaseTranslator import BaseTranslator, LocalizationConfig
+from tools.BunnyLocalization import (
+    Configuration,
+    excel_to_json,
+    find_duplicate_keys,
+    iter_config_entries,
+    iter_excel_entries,
+    read_excel_entries,
+)
+
+try:
+    import openpyxl
+except ImportError:  # pragma: no cover
+    openpyxl = None
+
+
+class EchoTranslator(BaseTranslator):
+    """原样返回带语言前缀文本的模拟翻译器"""
+
+    def translate_text(self, text, target_lang, style=None, comment=None):
+        return f"{target_lang}:{text}"
+
+
+@unittest.skipIf(openpyxl is None, "openpyxl is not installed")
+class TestExcelSource(unittest.TestCase):
+    """Excel 源文件读取测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "source.xlsx")
+
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+
+    def _write_workbook(self, sheets):
+        """sheets: {工作表名称: [行]}，第一行为表头"""
+        workbook = openpyxl.Workbook()
+        workbook.remove(workbook.active)
+        for name, rows in sheets.items():
+            sheet = workbook.create_sheet(name)
+            for row in rows:
+                sheet.append(row)
+        workbook.save(self.path)
+
+    def test_entries_from_first_sheet(self):
+        """测试默认读取第一个工作表，空单元格为空字符串，数字键不带小数"""
+        self._write_workbook(
+            {
+                "First": [
+                    ["extra", "key", "value", "comment"],
+                    [1, "a", "文本A", "按钮"],
+                    [2, "b", "文本B", None],
+                    [3, None, "没有键", None],
+                    [4, 7.0, 42, None],
+                ],
+                "Second": [["key", "value"], ["c", "文本C"]],
+            }
+        )
+        entries = list(iter_excel_entries(self.path, "key", "value", "comment"))
+        self.assertEqual(
+            entries,
+            [
+                ("a", {"text": "文本A", "comment": "按钮"}),
+                ("b", {"text": "文本B", "comment": ""}),
+                ("7", {"text": "42", "comment": ""}),
+            ],
+        )
+
+    def test_multiple_sheets(self):
+        """测试 "*" 读取所有包含所需列的工作表，指定的工作表缺少列时报错"""
+        self._write_workbook(
+            {
+                "UI": [["key", "value"], ["a", "文本A"]],
+                "Notes": [["title"], ["说明"]],
+                "Items": [["value", "key", "comment"], ["文本B", "b", "道具"]],
+            }
+        )
+        self.assertEqual(
+            dict(iter_excel_entries(self.path, "key", "value", "comment", "*")),
+            {
+                "a": {"text": "文本A", "comment": ""},
+                "b": {"text": "文本B", "comment": "道具"},
+            },
+        )
+        self.assertEqual(
+            list(iter_excel_entries(self.path, "key", "value", None, ["Items"])),
+            [("b", {"text": "文本B", "comment": ""})],
+        )
+        with self.assertRaises(ValueError):
+            list(iter_excel_entries(self.path, "key", "value", None, "Notes"))
+        with self.assertRaises(ValueError):
+            list(iter_excel_entries(self.path, "key", "value", None, "Missing"))
+
+    def test_excel_to_json(self):
+        """测试转换为中间 JSON 文件"""
+        self._write_workbook({"UI": [["key", "value"], ["a", "文本A"]]})
+        out_json_path = os.path.join(self.temp_dir.name, "source.json")
+        config_path = os.path.join(self.temp_dir.name, "bunny.yaml")
+        with open(config_path, "w", encoding="utf-8") as f:
+            yaml.dump(
+                {
+                    "excel_file_path": self.path,
+                    "key_name": "key",
+                    "value_name": "value",
+                    "comment_name": "comment",
+                    "out_json_path": out_json_path,
+                },
+                f,
+            )
+        excel_to_json(Configuration(config_path))
+        with open(out_json_path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f), {"a": {"text": "文本A", "comment": ""}})
+
+    def test_header_below_blank_and_title_rows(self):
+        """测试表头上方有空行或标题行时，数据从表头的下一行开始"""
+        self._write_workbook(
+            {
+                "UI": [
+                    [None, None, None],
+                    ["本地化文本", None, None],
+                    ["key", "value", "comment"],
+                    ["a", "文本A", "按钮"],
+                ]
+            }
+        )
+        self.assertEqual(
+            list(iter_excel_entries(self.path, "key", "value", "comment")),
+            [("a", {"text": "文本A", "comment": "按钮"})],
+        )
+        self._write_workbook({"UI": [[None, None], ["key", "value"], ["b", "文本B"]]})
+        self.assertEqual(
+            list(iter_excel_entries(self.path, "key", "value")),
+            [("b", {"text": "文本B", "comment": ""})],
+        )
+
+    def test_duplicate_keys_keep_last_row(self):
+        """测试重复的键以最后一行为准（位置不变），并只在查找时警告一次"""
+        self._write_workbook(
+            {
+                "UI": [
+                    ["key", "value"],
+                    ["a", "文本A"],
+                    ["b", "文本B"],
+                    ["a", "重复的A"],
+                ]
+            }
+        )
+        config_path = os.path.join(self.temp_dir.name, "bunny.yaml")
+        with open(config_path, "w", encoding="utf-8") as f:
+            yaml.dump(
+                {
+                    "excel_file_path": self.path,
+                    "key_name": "key",
+                    "value_name": "value",
+                },
+                f,
+            )
+        config = Configuration(config_path)
+        expected = [
+            ("a", {"text": "重复的A", "comment": ""}),
+            ("b", {"text": "文本B", "comment": ""}),
+        ]
+        with mock.patch("builtins.print") as printed:
+            duplicates = find_duplicate_keys(
+                iter_excel_entries(self.path, "key", "value")
+            )
+            for _ in range(2):
+                self.assertEqual(
+                    list(iter_config_entries(config, duplicates)), expected
+                )
+            self.assertEqual(read_excel_entries(config), dict(expected))
+        self.assertEqual(printed.call_count, 2)
+        for call in printed.call_args_list:
+            self.assertIn("a", call[0][0])
+
+    def test_entries_feed_localization_directly(self):
+        """测试条目通过 source_reader 直接送入本地化流程，不需要中间 JSON 文件"""
+        self._write_workbook({"UI": [["key", "value"], ["a", "文本A"], ["b", "文本B"]]})
+        config_path = os.path.join(self.temp_dir.name, "config.yaml")
+        with open(config_path, "w", encoding="utf-8") as f:
+            yaml.dump(
+                {
+                    "model_type": "DeepSeek",
+                    "model": "test-model",
+                    "cache_path": os.path.join(self.temp_dir.name, "cache.db"),
+                },
+                f,
+            )
+        config = LocalizationConfig(config_path)
+        self.addCleanup(config.translation_cache.close)
+        with mock.patch.object(
+            TranslatorFactory,
+            "create_translator",
+            return_value=EchoTranslator(config),
+        ):
+            processor = LocalizationProcessor(config)
+
+        # 每次调用都重新流式读取 Excel（先统计条目数，再按语言逐窗口读取）
+        processor.source_reader = lambda _: iter_excel_entries(
+            self.path, "key", "value"
+        )
+        output_dir = os.path.join(self.temp_dir.name, "output")
+        processor.generate_localization(self.path, ["en"], output_dir)
+
+        with open(os.path.join(output_dir, "en.json"), encoding="utf-8") as f:
+            self.assertEqual(json.load(f), {"a": "en:文本A", "b": "en:文本B"})
+        self.assertEqual(
+            [name for name in os.listdir(self.temp_dir.name) if name.endswith(".json")],
+            [],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+模糊翻译记忆测试文件
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import yaml
+
+# 添加src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from src.translators.BaseTranslator import BaseTranslator, LocalizationConfig
+from src.translators.fuzzy_memory import FuzzyMemory, substitute_numbers
+from src.translators.translation_cache import TranslationCache
+from src.translators.translation_memory import TranslationMemory
+
+
+class PayloadTranslator(BaseTranslator):
+    """只用于构造请求参数的翻译器"""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.IsSupportBatch = True
+
+
+class TestFuzzyMemory(unittest.TestCase):
+    """模糊翻译记忆测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "tm.db")
+        self.memory = TranslationMemory(self.db_path)
+
+    def tearDown(self):
+        """测试后清理"""
+        self.memory.close()
+        self.temp_dir.cleanup()
+
+    def _cache(self, prompt_fingerprint="prompt-1", **options):
+        return TranslationCache(
+            self.memory,
+            "model-a",
+            prompt_fingerprint,
+            True,
+            FuzzyMemory(
+                self.memory,
+                "model-a",
+                prompt_fingerprint=prompt_fingerprint,
+                **options,
+            ),
+        )
+
+    def test_substitute_numbers(self):
+        """测试只有数字不同时替换译文中的数字，无法确定对应关系时放弃"""
+        self.assertEqual(
+            substitute_numbers(
+                "Level 3 unlocked", "Niveau 3 débloqué", "Level 4 unlocked"
+            ),
+            "Niveau 4 débloqué",
+        )
+        self.assertEqual(
+            substitute_numbers(
+                "第3关，得分1,200", "Level 3, score 1,200", "第12关，得分900"
+            ),
+            "Level 12, score 900",
+        )
+        # 译文中的数字与原文不一致
+        self.assertIsNone(
+            substitute_numbers(
+                "Level 3 unlocked", "Third level unlocked", "Level 4 unlocked"
+            )
+        )
+        # 原文中的数字重复，无法确定对应关系
+        self.assertIsNone(substitute_numbers("3 / 3", "3 of 3", "2 / 5"))
+        # 模板不同
+        self.assertIsNone(substitute_numbers("Level 3", "Niveau 3", "Stage 4"))
+
+    def test_cache_reuses_number_variants(self):
+        """测试精确未命中时复用只有数字不同的译文，并按精确键写入"""
+        cache = self._cache()
+        cache.put("第3关已解锁", "提示", "en", "formal", "Level 3 unlocked")
+
+        self.assertEqual(
+            cache.get("第4关已解锁", "提示", "en", "formal"), "Level 4 unlocked"
+        )
+        self.assertEqual(cache.fuzzy_hits, 1)
+        # 不含数字的文本不会模糊复用
+        self.assertIsNone(cache.get("关卡已解锁", "提示", "en", "formal"))
+        # 其他语言没有可复用的译文
+        self.assertIsNone(cache.get("第4关已解锁", "提示", "ja", "formal"))
+
+        # 新的缓存对象从数据库加载，之前复用的译文直接精确命中
+        cache = self._cache()
+        self.assertEqual(
+            cache.get("第4关已解锁", "提示", "en", "formal"), "Level 4 unlocked"
+        )
+        self.assertEqual(cache.fuzzy_hits, 0)
+        self.assertEqual(
+            cache.get("第5关已解锁", "提示", "en", "formal"), "Level 5 unlocked"
+        )
+        self.assertEqual(cache.stats()["fuzzy_hits"], 1)
+
+    def test_reuse_is_scoped_and_flagged(self):
+        """测试模糊复用只使用注释与提示词指纹相同的译文，复用结果不作为之后的来源"""
+        cache = self._cache()
+        cache.put("第3关已解锁", "按钮", "en", "formal", "Level 3 unlocked")
+
+        # 注释不同时不复用
+        self.assertIsNone(cache.get("第4关已解锁", "标题", "en", "formal"))
+        # 提示词变化后不复用旧译文
+        self.assertIsNone(
+            self._cache("prompt-2").get("第4关已解锁", "按钮", "en", "formal")
+        )
+
+        self.assertEqual(
+            cache.get("第4关已解锁", "按钮", "en", "formal"), "Level 4 unlocked"
+        )
+        key = cache.make_key("第4关已解锁", "按钮", "en", "formal")
+        reused = dict(
+            self.memory.connection.execute(
+                "SELECT cache_key, reused FROM translations"
+            ).fetchall()
+        )
+        self.assertEqual(reused[key], 1)
+        self.assertEqual(
+            [
+                row[0]
+                for row in self.memory.sources("en", "formal", "model-a", "prompt-1")
+            ],
+            ["第3关已解锁"],
+        )
+
+        # 实际翻译后写入的译文覆盖复用结果并清除标记
+        cache.put("第4关已解锁", "按钮", "en", "formal", "Stage 4 unlocked")
+        self.assertEqual(
+            self.memory.connection.execute(
+                "SELECT reused FROM translations WHERE cache_key = ?", (key,)
+            ).fetchone()[0],
+            0,
+        )
+
+    def test_index_is_bounded(self):
+        """测试索引只加载最近的译文，超过上限时丢弃并在下次查询时重新加载"""
+        writer = self._cache()
+        for i in range(6):
+            writer.put(f"Quest {chr(65 + i)} done", None, "fr", "formal", f"Q{i}")
+
+        cache = self._cache(max_entries=4)
+        cache.references("Quest F done!", "fr", "formal")
+        index = cache.fuzzy._indexes[("fr", "formal")]
+        self.assertEqual(
+            [entry[0] for entry in index.entries], ["Quest E done", "Quest F done"]
+        )
+
+        cache.put("Quest G done", None, "fr", "formal", "Q6")
+        cache.put("Quest H done", None, "fr", "formal", "Q7")
+        self.assertEqual(len(index.entries), 4)
+        cache.put("Quest I done", None, "fr", "formal", "Q8")
+        self.assertNotIn(("fr", "formal"), cache.fuzzy._indexes)
+        self.assertEqual(
+            cache.references("Quest I done!", "fr", "formal")[0]["source"],
+            "Quest I done",
+        )
+        self.assertEqual(len(cache.fuzzy._indexes[("fr", "formal")].entries), 2)
+
+    def test_references_by_similarity(self):
+        """测试按相似度返回参考示例，排除原文相同与相似度过低的条目"""
+        cache = self._cache()
+        cache.put("Open the settings menu", None, "fr", "formal", "Ouvrir le menu")
+        cache.put("Open the settings page", None, "fr", "formal", "Ouvrir la page")
+        cache.put("Buy gems now", None, "fr", "formal", "Acheter des gemmes")
+
+        references = cache.references("Open the settings menu!", "fr", "formal")
+        self.assertEqual(references[0]["source"], "Open the settings menu")
+        self.assertNotIn("Buy gems now", [r["source"] for r in references])
+        self.assertNotIn(
+            "Open the settings menu",
+            [
+                r["source"]
+                for r in cache.references("Open the settings menu", "fr", "formal")
+            ],
+        )
+        self.assertEqual(
+            cache.references("Open the settings menu!", "de", "formal"), []
+        )
+
+        # 索引加载后写入的译文同样可以查询到
+        cache.put("Open the settings panel", None, "fr", "formal", "Ouvrir le panneau")
+        sources = [
+            r["source"]
+            for r in cache.references("Open the settings pane", "fr", "formal")
+        ]
+        self.assertIn("Open the settings panel", sources)
+
+    def test_legacy_schema_gains_source_column(self):
+        """测试没有原文列的旧数据库在打开时自动增加该列"""
+        self.memory.close()
+        legacy_path = os.path.join(self.temp_dir.name, "legacy.db")
+        connection = sqlite3.connect(legacy_path)
+        connection.executescript("""
+            CREATE TABLE translations (
+                cache_key TEXT PRIMARY KEY, source_hash TEXT, lang TEXT,
+                style TEXT, model TEXT, text TEXT NOT NULL, updated_at REAL NOT NULL
+            );
+            INSERT INTO translations (cache_key, text, updated_at) VALUES ('k', 'v', 0);
+            """)
+        connection.commit()
+        connection.close()
+
+        memory = TranslationMemory(legacy_path)
+        self.assertEqual(memory.get("k"), "v")
+        memory.put(
+            "k2", "Level 1", lang="en", style="formal", model="m", source="第1关"
+        )
+        self.assertEqual(
+            list(memory.sources("en", "formal", "m")), [("第1关", "Level 1", "")]
+        )
+        memory.close()
+
+    def test_batch_payload_includes_references(self):
+        """测试批量请求为有参考示例的条目附带 tm 字段"""
+        config_path = os.path.join(self.temp_dir.name, "config.yaml")
+        with open(config_path, "w", encoding="utf-8") as f:
+            yaml.dump(
+                {
+                    "model_type": "DeepSeek",
+                    "model": "test-model",
+                    "cache_path": self.db_path,
+                    "rate_limit_shared": False,
+                    "use_cache": True,
+                    "fuzzy_memory": True,
+                },
+                f,
+            )
+        config = LocalizationConfig(config_path)
+        translator = PayloadTranslator(config)
+        cache = TranslationCache.from_translator(config, translator)
+        self.assertIsNotNone(cache.fuzzy)
+        cache.put("Open the settings menu", None, "fr", "formal", "Ouvrir le menu")
+        translator.reference_source = cache.references
+
+        payload, user_content = translator._build_batch_payload(
+            [("Open the settings menu!", None), ("Buy gems", None)], "fr", "formal"
+        )
+        entries = json.loads(user_content)
+        self.assertEqual(
+            entries[0]["tm"],
+            [{"source": "Open the settings menu", "target": "Ouvrir le menu"}],
+        )
+        self.assertNotIn("tm", entries[1])
+        self.assertIn("tm", payload["messages"][0]["content"])
+        config.translation_cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+术语表测试文件
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+import yaml
+
+# 添加src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from src.translators.BaseTranslator import BaseTranslator, LocalizationConfig
+from src.translators.glossary import Glossary, TermMatcher, get_glossary
+
+
+class GlossaryTranslator(BaseTranslator):
+    """批量请求原样返回预设译文的翻译器，记录请求内容"""
+
+    def __init__(self, config, translations):
+        super().__init__(config)
+        self.IsSupportBatch = True
+        self.translations = translations
+        self.payloads = []
+
+    def _build_payload(self, text, target_lang, style, comment):
+        return {
+            "messages": [
+                {"role": "user", "content": text + self._term_hint(text, target_lang)}
+            ]
+        }
+
+    def _create_completion(self, payload):
+        self.payloads.append(payload)
+        if len(payload["messages"]) == 1:
+            content = self.translations[0]
+        else:
+            entries = json.loads(payload["messages"][1]["content"])
+            content = json.dumps(
+                {entry["id"]: self.translations[int(entry["id"])] for entry in entries}
+            )
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=None,
+        )
+
+
+class TestGlossary(unittest.TestCase):
+    """术语表测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.glossary_path = os.path.join(self.temp_dir.name, "glossary.csv")
+        with open(self.glossary_path, "w", encoding="utf-8") as f:
+            f.write("zh-CN,en,ja\n刺客,Assassin,アサシン\n暗影刺客,Shadow Assassin,\n")
+            f.write("金币,Gold,ゴールド\nVIP,VIP Pass,\n")
+
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+
+    def test_matcher_finds_all_and_longest(self):
+        """测试自动机找出所有重叠匹配，并按最左最长选取互不重叠的术语"""
+        matcher = TermMatcher(["he", "she", "his", "hers"])
+        self.assertEqual(sorted(matcher.matches("ushers")), [(1, 3), (2, 2), (2, 4)])
+        self.assertEqual(matcher.find("ushers"), [(1, 3)])
+        self.assertEqual(TermMatcher([]).matches("anything"), [])
+
+    def test_terms_for_text(self):
+        """测试只返回原文中出现且有目标语言译法的术语，匹配忽略大小写"""
+        glossary = Glossary.load(self.glossary_path)
+        self.assertEqual(len(glossary), 4)
+        self.assertEqual(
+            glossary.terms_for("暗影刺客获得100金币", "en"),
+            [("暗影刺客", "Shadow Assassin"), ("金币", "Gold")],
+        )
+        # 日语没有“暗影刺客”的译法
+        self.assertEqual(glossary.terms_for("暗影刺客", "ja"), [])
+        self.assertEqual(glossary.terms_for("开通vip", "en"), [("VIP", "VIP Pass")])
+        self.assertEqual(glossary.terms_for("没有术语", "en"), [])
+        self.assertEqual(glossary.hint("没有术语", "en"), "")
+        self.assertIn("金币→Gold", glossary.hint("获得金币", "en"))
+
+    def test_verify_translation(self):
+        """测试检查译文是否使用规定的译法"""
+        glossary = Glossary({"金币": {"en": "Gold"}, "钻石": {"en": "Gem"}})
+        self.assertEqual(glossary.verify("金币和钻石", "en", "gold and gems"), {})
+        self.assertIsNone(glossary.verify("你好", "en", "Hello"))
+        self.assertEqual(
+            glossary.verify("金币和钻石", "en", "Coins and gems"), {"金币": "Gold"}
+        )
+
+    def test_get_glossary_compiles_once(self):
+        """测试同一文件只编译一次，未配置时返回 None"""
+        config = SimpleNamespace(get_config=lambda key, default=None: None)
+        self.assertIsNone(get_glossary(config))
+        config = SimpleNamespace(
+            get_config=lambda key, default=None: (
+                self.glossary_path if key == "glossary_path" else default
+            )
+        )
+        self.assertIs(get_glossary(config), get_glossary(config))
+
+    def test_glossary_changes_prompt_fingerprint(self):
+        """测试添加或修改术语表后提示词指纹变化，缓存中未经术语检查的译文不再命中"""
+        config_path = os.path.join(self.temp_dir.name, "config.yaml")
+        fingerprints = []
+        for glossary_path in (None, self.glossary_path, self.glossary_path):
+            if fingerprints:
+                with open(self.glossary_path, "a", encoding="utf-8") as f:
+                    f.write(f"钻石{len(fingerprints)},Gem,\n")
+                # 修改时间精度不足时确保重新加载
+                mtime = os.path.getmtime(self.glossary_path) + len(fingerprints)
+                os.utime(self.glossary_path, (mtime, mtime))
+            with open(config_path, "w", encoding="utf-8") as f:
+                yaml.dump(
+                    {
+                        "model_type": "DeepSeek",
+                        "model": "test-model",
+                        "cache_path": os.path.join(self.temp_dir.name, "cache.db"),
+                        "glossary_path": glossary_path,
+                    },
+                    f,
+                )
+            config = LocalizationConfig(config_path)
+            fingerprints.append(BaseTranslator(config).prompt_fingerprint)
+            config.translation_cache.close()
+        self.assertEqual(len(set(fingerprints)), 3)
+        self.assertEqual(
+            Glossary({"金币": {"en": "Gold"}}).digest,
+            Glossary({"金币": {"en": "Gold"}}).digest,
+        )
+
+    def test_translator_sends_and_checks_terms(self):
+        """测试批量请求只附带出现的术语，并统计未使用规定译法的译文"""
+        config_path = os.path.join(self.temp_dir.name, "config.yaml")
+        with open(config_path, "w", encoding="utf-8") as f:
+            yaml.dump(
+                {
+                    "model_type": "DeepSeek",
+                    "model": "test-model",
+                    "api_key": uuid.uuid4().hex,
+                    "cache_path": os.path.join(self.temp_dir.name, "cache.db"),
+                    "rate_limit": 60000,
+                    "rate_limit_shared": False,
+                    "glossary_path": self.glossary_path,
+                },
+                f,
+            )
+        config = LocalizationConfig(config_path)
+        translator = GlossaryTranslator(config, ["Got 5 Gold", "Got 5 coins", "Hi"])
+        results = translator.translate_batch(
+            [("获得5金币", None), ("获得5金币", None), ("你好", None)], "en"
+        )
+        self.assertEqual(results, ["Got 5 Gold", "Got 5 coins", "Hi"])
+
+        entries = json.loads(translator.payloads[0]["messages"][1]["content"])
+        self.assertEqual(entries[0]["terms"], {"金币": "Gold"})
+        self.assertNotIn("terms", entries[2])
+        self.assertIn("terms", translator.payloads[0]["messages"][0]["content"])
+
+        report = translator.glossary_stats.report()
+        self.assertEqual((report["checked"], report["violations"]), (2, 1))
+        self.assertEqual(report["samples"][0]["missing"], {"金币": "Gold"})
+
+        translator.translate_text("获得金币", "en")
+        self.assertIn("金币→Gold", translator.payloads[-1]["messages"][0]["content"])
+        config.translation_cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
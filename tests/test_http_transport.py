@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+共享 HTTP 连接池测试文件
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import yaml
+
+# 添加src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from src.translators.BaseTranslator import LocalizationConfig
+from src.translators.http_transport import (
+    aclose_async_http_clients,
+    get_async_http_client,
+    get_http_client,
+    run_async,
+)
+from src.translators.OpenAIBaseedTranslator import OpenAIBaseedTranslator
+
+
+class TestHttpTransport(unittest.TestCase):
+    """共享 HTTP 连接池测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        config_path = os.path.join(self.temp_dir.name, "config.yaml")
+        with open(config_path, "w", encoding="utf-8") as f:
+            yaml.dump(
+                {
+                    "model_type": "DeepSeek",
+                    "model": "test-model",
+                    "base_url": "https://api.example.com/v1",
+                    "api_key": "test-key",
+                    "cache_path": os.path.join(self.temp_dir.name, "cache.db"),
+                    "rate_limit_shared": False,
+                    "http_max_connections": 16,
+                },
+                f,
+            )
+        self.config = LocalizationConfig(config_path)
+
+    def tearDown(self):
+        """测试后清理"""
+        self.config.translation_cache.close()
+        self.temp_dir.cleanup()
+
+    def test_client_is_shared_per_base_url(self):
+        """测试同一 base_url 复用同一个客户端，不同 base_url 使用各自的客户端"""
+        client = get_http_client("https://api.example.com/v1", self.config)
+        self.assertIs(
+            get_http_client("https://api.example.com/v1", self.config), client
+        )
+        self.assertIsNot(
+            get_http_client("https://other.example.com", self.config), client
+        )
+
+    def test_translators_reuse_transport(self):
+        """测试多次创建翻译器（如 GUI 多次运行）复用同一个连接池"""
+        first = OpenAIBaseedTranslator(self.config)
+        second = OpenAIBaseedTranslator(self.config)
+        self.assertIs(first.client._client, second.client._client)
+        self.assertIs(
+            first.client._client,
+            get_http_client("https://api.example.com/v1", self.config),
+        )
+        pool = first.client._client._transport._pool
+        self.assertEqual(pool._max_connections, 16)
+
+    def test_async_client_is_bound_to_loop(self):
+        """测试异步客户端在同一事件循环内共享，不同事件循环各自创建"""
+
+        async def fetch():
+            return (
+                get_async_http_client("https://api.example.com/v1", self.config),
+                get_async_http_client("https://api.example.com/v1", self.config),
+            )
+
+        first, same = asyncio.run(fetch())
+        second, _ = asyncio.run(fetch())
+        self.assertIs(first, same)
+        self.assertIsNot(first, second)
+
+    def test_run_async_reuses_clients_across_runs(self):
+        """测试多次运行共用常驻事件循环，异步客户端与翻译器的客户端保持复用"""
+        translator = OpenAIBaseedTranslator(self.config)
+
+        async def fetch():
+            return (
+                get_async_http_client("https://api.example.com/v1", self.config),
+                translator.async_client,
+            )
+
+        first = run_async(fetch())
+        second = run_async(fetch())
+        self.assertIs(first[0], second[0])
+        self.assertIs(first[1], second[1])
+        self.assertFalse(first[0].is_closed)
+
+    def test_aclose_async_http_clients(self):
+        """测试关闭当前事件循环中的异步客户端"""
+
+        async def fetch_and_close():
+            client = get_async_http_client("https://api.example.com/v1", self.config)
+            await aclose_async_http_clients()
+            return client
+
+        self.assertTrue(asyncio.run(fetch_and_close()).is_closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+增量本地化测试文件
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import yaml
+
+# 添加src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from src.core.incremental import IncrementalManifest
+from src.core.Localization import LocalizationProcessor, TranslatorFactory
+from src.translators.BaseTranslator import BaseTranslator, LocalizationConfig
+
+
+class RecordingTranslator(BaseTranslator):
+    """记录被翻译文本的模拟翻译器"""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.translated = []
+
+    def translate_text(self, text, target_lang, style=None, comment=None):
+        self.translated.append(text)
+        return f"{target_lang}:{text}"
+
+
+class TestIncremental(unittest.TestCase):
+    """增量本地化测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        config_path = os.path.join(self.temp_dir.name, "config.yaml")
+        with open(config_path, "w", encoding="utf-8") as f:
+            yaml.dump(
+                {
+                    "model_type": "DeepSeek",
+                    "model": "test-model",
+                    "use_cache": False,
+                    "cache_path": os.path.join(self.temp_dir.name, "cache.db"),
+                },
+                f,
+            )
+        self.config = LocalizationConfig(config_path)
+        self.translator = RecordingTranslator(self.config)
+        with mock.patch.object(
+            TranslatorFactory, "create_translator", return_value=self.translator
+        ):
+            self.processor = LocalizationProcessor(self.config, incremental=True)
+        self.source_path = os.path.join(self.temp_dir.name, "source.json")
+        self.output_dir = os.path.join(self.temp_dir.name, "out")
+        os.makedirs(self.output_dir)
+
+    def tearDown(self):
+        """测试后清理"""
+        self.config.translation_cache.close()
+        self.temp_dir.cleanup()
+
+    def write_source(self, data: dict):
+        with open(self.source_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    def read_output(self, lang: str) -> dict:
+        with open(os.path.join(self.output_dir, f"{lang}.json"), encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_only_delta_is_translated(self):
+        """测试只翻译新增和修改的键，并删除已移除的键"""
+        self.write_source(
+            {
+                "a": {"text": "甲", "comment": ""},
+                "b": {"text": "乙", "comment": ""},
+                "c": {"text": "丙", "comment": ""},
+            }
+        )
+        self.processor.generate_localization(
+            self.source_path, ["en"], self.output_dir, "formal"
+        )
+        self.assertEqual(self.translator.translated, ["甲", "乙", "丙"])
+
+        self.translator.translated = []
+        self.write_source(
+            {
+                "a": {"text": "甲", "comment": ""},
+                "b": {"text": "乙", "comment": "新注释"},
+                "d": {"text": "丁", "comment": ""},
+            }
+        )
+        self.processor.generate_localization(
+            self.source_path, ["en"], self.output_dir, "formal"
+        )
+
+        self.assertEqual(self.translator.translated, ["乙", "丁"])
+        self.assertEqual(
+            self.read_output("en"), {"a": "en:甲", "b": "en:乙", "d": "en:丁"}
+        )
+
+    def test_new_language_is_fully_translated(self):
+        """测试新增的目标语言没有清单记录时全量翻译"""
+        self.write_source({"a": {"text": "甲", "comment": ""}})
+        self.processor.generate_localization(
+            self.source_path, ["en"], self.output_dir, "formal"
+        )
+        self.processor.generate_localization(
+            self.source_path, ["en", "ja"], self.output_dir, "formal"
+        )
+
+        self.assertEqual(self.translator.translated, ["甲", "甲"])
+        self.assertEqual(self.read_output("ja"), {"a": "ja:甲"})
+
+    def test_failed_translation_is_retried(self):
+        """测试译文为空的键不记录指纹，下次运行会重新翻译"""
+        manifest = IncrementalManifest(self.output_dir)
+        self.addCleanup(manifest.close)
+        source = {"a": {"text": "甲", "comment": ""}, "b": {"text": "乙"}}
+        manifest.begin("en")
+        manifest.update(source, "en", {"a": "A", "b": ""})
+        manifest.commit("en")
+
+        output_path = os.path.join(self.output_dir, "en.json")
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump({"a": "A", "b": ""}, f)
+        manifest.load_existing("en", output_path)
+        reused, pending, stats = manifest.plan(source, "en")
+        self.assertEqual(reused, {"a": "A"})
+        self.assertEqual(list(pending.keys()), ["b"])
+        self.assertEqual(stats["changed"], 1)
+        self.assertEqual(stats["matched"], 2)
+
+    def test_legacy_json_manifest_is_migrated(self):
+        """测试旧版 JSON 清单在首次打开时导入数据库"""
+        self.write_source({"a": {"text": "甲", "comment": ""}})
+        self.processor.generate_localization(
+            self.source_path, ["en"], self.output_dir, "formal"
+        )
+        manifest = IncrementalManifest(self.output_dir)
+        recorded = dict(
+            manifest.connection.execute("SELECT key, fingerprint FROM manifest")
+        )
+        manifest.close()
+        os.remove(manifest.path)
+        with open(manifest.legacy_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "languages": {"en": recorded}}, f)
+
+        self.translator.translated = []
+        self.processor.generate_localization(
+            self.source_path, ["en"], self.output_dir, "formal"
+        )
+        self.assertEqual(self.translator.translated, [])
+        self.assertFalse(manifest.legacy_path.exists())
+
+    def test_full_run_does_not_record_manifest(self):
+        """测试非增量运行不创建清单，并清除重新生成语言的旧指纹"""
+        self.write_source({"a": {"text": "甲", "comment": ""}})
+        self.processor.incremental = False
+        self.processor.generate_localization(
+            self.source_path, ["en"], self.output_dir, "formal"
+        )
+        manifest_path = os.path.join(self.output_dir, IncrementalManifest.FILE_NAME)
+        self.assertFalse(os.path.exists(manifest_path))
+
+        # 增量运行记录指纹后，非增量运行以不同的源文重新生成输出
+        self.processor.incremental = True
+        self.processor.generate_localization(
+            self.source_path, ["en"], self.output_dir, "formal"
+        )
+        self.processor.incremental = False
+        self.write_source({"a": {"text": "乙", "comment": ""}})
+        self.processor.generate_localization(
+            self.source_path, ["en"], self.output_dir, "formal"
+        )
+
+        # 源文改回原样时旧指纹已失效，不会复用与之不符的输出
+        self.processor.incremental = True
+        self.write_source({"a": {"text": "甲", "comment": ""}})
+        self.processor.generate_localization(
+            self.source_path, ["en"], self.output_dir, "formal"
+        )
+        self.assertEqual(self.read_output("en"), {"a": "en:甲"})
+
+
+if __name__ == "__main__":
+    unittest.main()
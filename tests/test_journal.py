@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+任务日志与断点续传测试文件
+"""
+
+import csv
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import yaml
+
+# 添加src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from src.core.csv_processor import CSVProcessor
+from src.core.journal import JobJournal
+from src.core.Localization import LocalizationProcessor, TranslatorFactory
+from src.translators.BaseTranslator import BaseTranslator, LocalizationConfig
+
+
+class CrashingTranslator(BaseTranslator):
+    """翻译指定条数后模拟进程中断的翻译器"""
+
+    IsSupportMultiTarget = False
+
+    def __init__(self, config, crash_after=None):
+        super().__init__(config)
+        self.crash_after = crash_after
+        self.translated = []
+
+    def translate_text(self, text, target_lang, style=None, comment=None):
+        if self.crash_after is not None and len(self.translated) >= self.crash_after:
+            raise KeyboardInterrupt
+        self.translated.append((target_lang, text))
+        return f"{target_lang}:{text}"
+
+
+class TestJobJournal(unittest.TestCase):
+    """任务日志测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "job.jsonl")
+
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+
+    def test_resume_skips_torn_line_and_changed_source(self):
+        """测试恢复时忽略写了一半的行，源文指纹变化的条目不复用"""
+        journal = JobJournal(self.path, "job-1")
+        journal.record("en", "a", "fp-a", "A")
+        journal.record("en", "b", "fp-b", "")
+        journal.close()
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"l": "en", "k": "c", "f"')
+
+        journal = JobJournal(self.path, "job-1", resume=True)
+        self.assertEqual(journal.lookup("en", "a", "fp-a"), "A")
+        self.assertIsNone(journal.lookup("en", "a", "fp-changed"))
+        self.assertIsNone(journal.lookup("en", "b", "fp-b"))
+        self.assertIsNone(journal.lookup("ja", "a", "fp-a"))
+        journal.discard()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_other_job_or_no_resume_starts_over(self):
+        """测试任务标识不同或未指定 resume 时清空日志"""
+        journal = JobJournal(self.path, "job-1")
+        journal.record("en", "a", "fp-a", "A")
+        journal.close()
+
+        self.assertIsNone(
+            JobJournal(self.path, "job-2", resume=True).lookup("en", "a", "fp-a")
+        )
+        journal = JobJournal(self.path, "job-2")
+        journal.close()
+        self.assertIsNone(
+            JobJournal(self.path, "job-2", resume=True).lookup("en", "a", "fp-a")
+        )
+
+
+class TestResume(unittest.TestCase):
+    """断点续传测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.temp_dir.name, "config.yaml")
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            yaml.dump(
+                {
+                    "model_type": "DeepSeek",
+                    "model": "test-model",
+                    "api_key": "test-key",
+                    "use_cache": False,
+                    "cache_path": os.path.join(self.temp_dir.name, "cache.db"),
+                },
+                f,
+            )
+        self.output_dir = os.path.join(self.temp_dir.name, "out")
+
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+
+    def run_json(self, translator, resume):
+        config = LocalizationConfig(self.config_path)
+        with mock.patch.object(
+            TranslatorFactory, "create_translator", return_value=translator(config)
+        ):
+            processor = LocalizationProcessor(config, resume=resume)
+        try:
+            processor.generate_localization(
+                self.source_path, ["en", "ja"], self.output_dir, "formal"
+            )
+        finally:
+            config.translation_cache.close()
+        return processor.translator
+
+    def test_json_resume_after_interrupt(self):
+        """测试 JSON 本地化中断后只翻译剩余的条目"""
+        self.source_path = os.path.join(self.temp_dir.name, "source.json")
+        with open(self.source_path, "w", encoding="utf-8") as f:
+            json.dump({k: {"text": k, "comment": ""} for k in "abc"}, f)
+
+        with self.assertRaises(KeyboardInterrupt):
+            self.run_json(lambda config: CrashingTranslator(config, 4), False)
+        self.assertTrue(
+            os.path.exists(os.path.join(self.output_dir, ".localization_journal.jsonl"))
+        )
+
+        translator = self.run_json(CrashingTranslator, True)
+        self.assertEqual(translator.translated, [("ja", "b"), ("ja", "c")])
+        with open(os.path.join(self.output_dir, "ja.json"), encoding="utf-8") as f:
+            self.assertEqual(json.load(f), {"a": "ja:a", "b": "ja:b", "c": "ja:c"})
+        self.assertFalse(
+            os.path.exists(os.path.join(self.output_dir, ".localization_journal.jsonl"))
+        )
+
+    def test_csv_resume_after_interrupt(self):
+        """测试 CSV 处理中断后只翻译剩余的行，且保留已写出的行"""
+        csv_path = os.path.join(self.temp_dir.name, "sheet.csv")
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["ID", "zh-CN", "en", "ja"])
+            for i in range(3):
+                writer.writerow([f"id{i}", f"文本{i}", "", ""])
+
+        processor = CSVProcessor(self.config_path)
+        processor.translator = CrashingTranslator(processor.config, 3)
+        with self.assertRaises(KeyboardInterrupt):
+            processor.process_file(csv_path, self.output_dir)
+        with open(os.path.join(self.output_dir, "sheet.csv"), encoding="utf-8") as f:
+            self.assertEqual(len(list(csv.reader(f))), 2)
+        processor.config.translation_cache.close()
+
+        processor = CSVProcessor(self.config_path, resume=True)
+        processor.translator = CrashingTranslator(processor.config)
+        processor.process_file(csv_path, self.output_dir)
+        self.assertEqual(
+            processor.translator.translated,
+            [("ja", "文本1"), ("en", "文本2"), ("ja", "文本2")],
+        )
+        with open(os.path.join(self.output_dir, "sheet.csv"), encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[2], ["id1", "文本1", "en:文本1", "ja:文本1"])
+        processor.config.translation_cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+流式JSON读写测试文件
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import yaml
+
+# 添加src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from src.core.json_stream import JsonObjectWriter, iter_json_object
+from src.core.Localization import LocalizationProcessor, TranslatorFactory
+from src.translators.BaseTranslator import BaseTranslator, LocalizationConfig
+
+
+class EchoTranslator(BaseTranslator):
+    """原样返回带语言前缀文本的模拟翻译器"""
+
+    def translate_text(self, text, target_lang, style=None, comment=None):
+        return f"{target_lang}:{text}"
+
+
+class TestJsonStream(unittest.TestCase):
+    """流式JSON读写测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "data.json")
+        self.data = {
+            f"key{i}": {"text": f'文本 "{i}"\n' * (i % 5), "comment": "", "n": i * 7}
+            for i in range(500)
+        }
+
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+
+    def test_reader_matches_json_load(self):
+        """测试不同块大小与缩进下读取结果与 json.load 一致"""
+        for indent in (None, 2):
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self.data, f, ensure_ascii=False, indent=indent)
+            for chunk_size in (1, 13, 4096):
+                with self.subTest(indent=indent, chunk_size=chunk_size):
+                    self.assertEqual(
+                        dict(iter_json_object(self.path, chunk_size)), self.data
+                    )
+
+    def test_reader_is_incremental(self):
+        """测试读取是增量的：文件尾部损坏前的条目可以先被产出"""
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write('{"a": 1, "b": 2, "c": ')
+        iterator = iter_json_object(self.path, chunk_size=4)
+        self.assertEqual(next(iterator), ("a", 1))
+        self.assertEqual(next(iterator), ("b", 2))
+        with self.assertRaises(ValueError):
+            next(iterator)
+
+    def test_writer_matches_json_dump(self):
+        """测试写出格式与 json.dump(indent=2) 完全一致"""
+        for data in ({}, {"a": "译文", "b": 'quote "x"'}, {"a": {"nested": [1, 2]}}):
+            with self.subTest(data=data):
+                with JsonObjectWriter(self.path) as writer:
+                    for key, value in data.items():
+                        writer.write(key, value)
+                with open(self.path, encoding="utf-8") as f:
+                    self.assertEqual(
+                        f.read(), json.dumps(data, ensure_ascii=False, indent=2)
+                    )
+
+    def test_writer_abort_keeps_previous_output(self):
+        """测试中途出错时保留原有输出文件"""
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write('{"old": "value"}')
+        with self.assertRaises(RuntimeError):
+            with JsonObjectWriter(self.path) as writer:
+                writer.write("new", "value")
+                raise RuntimeError("interrupted")
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f), {"old": "value"})
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_generate_localization_in_windows(self):
+        """测试按窗口流式生成的输出与源顺序一致"""
+        config_path = os.path.join(self.temp_dir.name, "config.yaml")
+        with open(config_path, "w", encoding="utf-8") as f:
+            yaml.dump(
+                {
+                    "model_type": "DeepSeek",
+                    "model": "test-model",
+                    "cache_path": os.path.join(self.temp_dir.name, "cache.db"),
+                    "stream_window": 7,
+                },
+                f,
+            )
+        config = LocalizationConfig(config_path)
+        with mock.patch.object(
+            TranslatorFactory,
+            "create_translator",
+            return_value=EchoTranslator(config),
+        ):
+            processor = LocalizationProcessor(config)
+
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, ensure_ascii=False)
+        processor.generate_localization(self.path, ["en"], self.temp_dir.name)
+
+        with open(os.path.join(self.temp_dir.name, "en.json"), encoding="utf-8") as f:
+            output = f.read()
+        expected = {key: f"en:{value['text']}" for key, value in self.data.items()}
+        self.assertEqual(output, json.dumps(expected, ensure_ascii=False, indent=2))
+        config.translation_cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
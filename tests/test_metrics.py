@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+请求指标与运行报告测试文件
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+import urllib.request
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import yaml
+
+# 添加src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from src.core.Localization import LocalizationProcessor, TranslatorFactory
+from src.translators.BaseTranslator import BaseTranslator, LocalizationConfig
+from src.translators.metrics import RequestMetrics, RequestTrace, serve_metrics
+
+
+class StatusError(Exception):
+    """与 SDK 状态错误结构一致的异常"""
+
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers={})
+
+
+class MeteredTranslator(BaseTranslator):
+    """按脚本抛出异常，并在响应中返回 token 用量的模拟翻译器"""
+
+    def __init__(self, config, errors=()):
+        super().__init__(config)
+        self.errors = list(errors)
+
+    def _build_payload(self, text, target_lang, style, comment):
+        return {"text": text, "lang": target_lang}
+
+    def _create_completion(self, payload):
+        if self.errors:
+            raise self.errors.pop(0)
+        return SimpleNamespace(
+            choices=[
+                SimpleNamespace(
+                    message=SimpleNamespace(
+                        content=f"{payload['lang']}:{payload['text']}"
+                    )
+                )
+            ],
+            usage=SimpleNamespace(
+                prompt_tokens=7, completion_tokens=3, total_tokens=10
+            ),
+        )
+
+
+class TestRequestMetrics(unittest.TestCase):
+    """请求指标测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.temp_dir.name, "config.yaml")
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            yaml.dump(
+                {
+                    "model_type": "DeepSeek",
+                    "model": "test-model",
+                    # 每个测试使用独立的熔断器
+                    "api_key": uuid.uuid4().hex,
+                    "cache_path": os.path.join(self.temp_dir.name, "cache.db"),
+                    "use_cache": True,
+                    "rate_limit": 60000,
+                    "rate_limit_shared": False,
+                    "max_retries": 2,
+                    "retry_base_delay": 0.001,
+                },
+                f,
+            )
+        self.config = LocalizationConfig(self.config_path)
+
+    def tearDown(self):
+        """测试后清理"""
+        self.config.translation_cache.close()
+        self.temp_dir.cleanup()
+
+    def test_translator_records_requests(self):
+        """测试翻译器记录延迟、重试、token 用量与错误分类"""
+        translator = MeteredTranslator(self.config, [StatusError(503)])
+        translator.translate_text("确定", "en")
+        translator.errors = [StatusError(400)]
+        translator.translate_text("取消", "ja")
+
+        report = translator.metrics.report()
+        self.assertEqual(report["totals"]["requests"], 2)
+        self.assertEqual(report["totals"]["retries"], 1)
+        self.assertEqual(report["totals"]["errors"], 1)
+        en, ja = report["series"]
+        self.assertEqual((en["provider"], en["lang"]), ("DeepSeek/test-model", "en"))
+        self.assertEqual((en["prompt_tokens"], en["completion_tokens"]), (7, 3))
+        self.assertIsNotNone(en["latency_p50"])
+        self.assertEqual(ja["errors"], {"fatal": 1})
+
+    def test_prometheus_text(self):
+        """测试 Prometheus 文本格式的计数器与直方图"""
+        metrics = RequestMetrics()
+        trace = RequestTrace('Kimi/"m"', "en", 5)
+        trace.latency = 0.3
+        metrics.observe(trace)
+        metrics.record_cache('Kimi/"m"', "en", True)
+        text = metrics.to_prometheus()
+        labels = 'provider="Kimi/\\"m\\"",lang="en"'
+        self.assertIn(f"localization_requests_total{{{labels}}} 1", text)
+        self.assertIn(f"localization_items_total{{{labels}}} 5", text)
+        self.assertIn(f"localization_cache_hits_total{{{labels}}} 1", text)
+        self.assertIn(
+            f'localization_request_latency_seconds_bucket{{{labels},le="0.25"}} 0', text
+        )
+        self.assertIn(
+            f'localization_request_latency_seconds_bucket{{{labels},le="0.5"}} 1', text
+        )
+        self.assertIn(
+            f'localization_request_latency_seconds_bucket{{{labels},le="+Inf"}} 1', text
+        )
+
+    def test_exporter_serves_current_metrics(self):
+        """测试指标服务返回最新的指标，同一端口再次启动时切换指标对象"""
+        first = RequestMetrics()
+        port = serve_metrics(first, 0)
+        second = RequestMetrics()
+        second.observe(RequestTrace("p", "fr", 1))
+        self.assertEqual(serve_metrics(second, port), port)
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+            body = response.read().decode("utf-8")
+        self.assertIn('localization_requests_total{provider="p",lang="fr"} 1', body)
+
+    def test_run_report_contains_requests(self):
+        """测试运行报告包含请求指标与按语言划分的缓存命中"""
+        source_path = os.path.join(self.temp_dir.name, "source.json")
+        with open(source_path, "w", encoding="utf-8") as f:
+            json.dump({"a": {"text": "确定", "comment": ""}}, f)
+        translator = MeteredTranslator(self.config)
+        with mock.patch.object(
+            TranslatorFactory, "create_translator", return_value=translator
+        ):
+            processor = LocalizationProcessor(self.config)
+        processor.generate_localization(source_path, ["en"], self.temp_dir.name)
+        processor.generate_localization(source_path, ["en"], self.temp_dir.name)
+
+        with open(
+            os.path.join(self.temp_dir.name, LocalizationProcessor.REPORT_FILE),
+            encoding="utf-8",
+        ) as f:
+            report = json.load(f)["requests"]
+        self.assertEqual(report["totals"]["requests"], 1)
+        self.assertEqual(report["totals"]["cache_hits"], 1)
+        self.assertEqual(report["series"][0]["cache_misses"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
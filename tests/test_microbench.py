@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+微基准测试工具测试文件
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# 添加src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from tools.json_to_csv import Head, merge_outputs
+from tools.microbench import STAGES, Workspace, compare, measure
+
+
+class TestMicrobench(unittest.TestCase):
+    """微基准测试工具测试类"""
+
+    def test_compare_flags_regressions(self):
+        """测试超出容差的耗时与内存被判定为回退，微小的绝对差异不计入"""
+        baselines = {"1k": {"a": {"seconds": 1.0, "peak_mb": 10.0}}}
+        results = {
+            "1k": {
+                "a": {"seconds": 2.5, "peak_mb": 20.0},
+                "b": {"seconds": 9.0, "peak_mb": 90.0},
+            }
+        }
+        regressions = compare(results, baselines, 2.0, 1.5)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(all(r.startswith("1k a:") for r in regressions))
+
+        tiny = {"1k": {"a": {"seconds": 0.001, "peak_mb": 0.1}}}
+        results = {"1k": {"a": {"seconds": 0.01, "peak_mb": 0.5}}}
+        self.assertEqual(compare(results, tiny, 2.0, 1.5), [])
+
+    def test_stages_run_on_small_catalog(self):
+        """测试不依赖 Excel 的阶段在小规模目录上可以运行"""
+        with tempfile.TemporaryDirectory() as root:
+            ws = Workspace(root, 20)
+            for name, prepare, run in STAGES:
+                if name in ("excel_to_json", "csv_process"):
+                    continue
+                result = measure(ws, prepare, run)
+                self.assertGreaterEqual(result["seconds"], 0)
+                self.assertGreaterEqual(result["peak_mb"], 0)
+
+    def test_merge_outputs_skips_hidden_files(self):
+        """测试合并输出时跳过运行报告等隐藏文件"""
+        with tempfile.TemporaryDirectory() as root:
+            source = os.path.join(root, "source.json")
+            with open(source, "w", encoding="utf-8") as f:
+                json.dump({"ok": {"text": "确定", "comment": "按钮"}}, f)
+            output = os.path.join(root, "output")
+            os.makedirs(output)
+            with open(os.path.join(output, "en.json"), "w", encoding="utf-8") as f:
+                json.dump({"ok": "OK"}, f)
+            with open(
+                os.path.join(output, ".localization_report.json"), "w", encoding="utf-8"
+            ) as f:
+                json.dump({"cache": {}}, f)
+
+            df = merge_outputs(source, output)
+            self.assertEqual(list(df.columns), ["Key", "Comment", Head, "en"])
+            self.assertEqual(df.iloc[0]["en"], "OK")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+离线模拟服务测试文件
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+import uuid
+from pathlib import Path
+
+import yaml
+
+# 添加src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from src.translators.BaseTranslator import LocalizationConfig
+from src.translators.OpenAIBaseedTranslator import OpenAIBaseedTranslator
+from src.translators.TongYiQwenTranslator import TongYiQwenTranslator
+from tools.mock_llm_server import LatencyModel, MockLLMServer, percentile
+
+
+class TestMockLLMServer(unittest.TestCase):
+    """模拟服务协议兼容性测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.server = MockLLMServer(seed=1).start()
+        self.configs = []
+
+    def tearDown(self):
+        """测试后清理"""
+        self.server.stop()
+        for config in self.configs:
+            config.translation_cache.close()
+        self.temp_dir.cleanup()
+
+    def _config(self, model_type, **extra):
+        config_path = os.path.join(self.temp_dir.name, f"{model_type}.yaml")
+        with open(config_path, "w", encoding="utf-8") as f:
+            yaml.dump(
+                dict(
+                    {
+                        "model_type": model_type,
+                        "model": "mock-model",
+                        "base_url": self.server.base_url,
+                        # 每个测试使用独立的熔断器
+                        "api_key": uuid.uuid4().hex,
+                        "system_prompt": "你是一个专业的翻译助手。",
+                        "cache_path": os.path.join(self.temp_dir.name, "cache.db"),
+                        "rate_limit": 60000,
+                        "rate_limit_shared": False,
+                        "retry_base_delay": 0.001,
+                    },
+                    **extra,
+                ),
+                f,
+            )
+        config = LocalizationConfig(config_path)
+        self.configs.append(config)
+        return config
+
+    def test_single_batch_and_multi_target(self):
+        """测试单条、批量与多目标语言请求"""
+        translator = OpenAIBaseedTranslator(self._config("DeepSeek"))
+        self.assertEqual(translator.translate_text("确定", "en"), "[en] 确定")
+        self.assertEqual(
+            translator.translate_batch([("确定", "按钮"), ("取消", "")], "ja"),
+            ["[ja] 确定", "[ja] 取消"],
+        )
+        self.assertEqual(
+            translator.translate_multi([("确定", "")], ["en", "fr"]),
+            [{"en": "[en] 确定", "fr": "[fr] 确定"}],
+        )
+        stats = self.server.stats.snapshot()
+        self.assertEqual(stats["requests"], 3)
+        self.assertGreater(stats["prompt_tokens"], 0)
+        self.assertGreater(stats["completion_tokens"], 0)
+
+    def test_qwen_translation_options(self):
+        """测试通义千问机翻模型的 translation_options"""
+        translator = TongYiQwenTranslator(self._config("TongYiQwen"))
+        self.assertEqual(translator.translate_text("确定", "English"), "[English] 确定")
+
+    def test_throttling_is_retried(self):
+        """测试注入的 429 被客户端按 Retry-After 重试"""
+        self.server.rpm_limit = 1
+        self.server.retry_after = 0
+        translator = OpenAIBaseedTranslator(self._config("DeepSeek", max_retries=2))
+        self.assertEqual(translator.translate_text("确定", "en"), "[en] 确定")
+        self.assertEqual(translator.translate_text("取消", "en"), "")
+        stats = self.server.stats.snapshot()
+        self.assertEqual(stats["throttled"], 3)
+        self.assertEqual(len(translator.dead_letters), 1)
+
+    def test_latency_model(self):
+        """测试延迟分布的取值范围与分位数"""
+        uniform = LatencyModel("uniform", 0.1, 0.05, seed=1)
+        samples = [uniform.sample() for _ in range(100)]
+        self.assertTrue(all(0.05 <= sample <= 0.15 for sample in samples))
+        lognormal = LatencyModel("lognormal", 0.1, 0.5, seed=1)
+        samples = sorted(lognormal.sample() for _ in range(2000))
+        self.assertAlmostEqual(sum(samples) / len(samples), 0.1, delta=0.01)
+        self.assertEqual(percentile([1, 2, 3, 4], 50), 2)
+        self.assertEqual(percentile([1, 2, 3, 4], 95), 4)
+        with self.assertRaises(ValueError):
+            LatencyModel("bimodal")
+
+
+if __name__ == "__main__":
+    unittest.main()
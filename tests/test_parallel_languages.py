@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多语言并行生成测试文件
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import unittest
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import yaml
+
+# 添加src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from src.core.Localization import LocalizationProcessor, TranslatorFactory
+from src.translators.BaseTranslator import BaseTranslator, LocalizationConfig
+
+
+class LanguageDelayTranslator(BaseTranslator):
+    """按目标语言设定延迟的模拟翻译器，记录所有语言合计的在途请求数"""
+
+    def __init__(self, config, delays, output_dir):
+        super().__init__(config)
+        self.delays = delays
+        self.output_dir = output_dir
+        self.in_flight = 0
+        self.max_in_flight = 0
+        # 每次请求开始时已经写出的输出文件
+        self.seen_outputs = []
+
+    def translate_text(self, text, target_lang, style=None, comment=None):
+        return f"{target_lang}:{text}"
+
+    async def translate_text_async(self, text, target_lang, style=None, comment=None):
+        self.seen_outputs.append(
+            (
+                target_lang,
+                {
+                    name[: -len(".json")]
+                    for name in os.listdir(self.output_dir)
+                    if name.endswith(".json")
+                },
+            )
+        )
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delays.get(target_lang, 0.001))
+        self.in_flight -= 1
+        return f"{target_lang}:{text}"
+
+
+class MultiTargetTranslator(BaseTranslator):
+    """支持批量与多目标语言请求的模拟翻译器，记录每次请求的语言与条目数"""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.IsSupportBatch = True
+        self.IsSupportMultiTarget = True
+        self.requests = []
+
+    def _build_payload(self, text, target_lang, style, comment):
+        return {"single": text, "target_lang": target_lang}
+
+    def _create_completion(self, payload):
+        if "single" in payload:
+            self.requests.append(((payload["target_lang"],), 1))
+            content = f"{payload['target_lang']}:{payload['single']}"
+        else:
+            system, user = payload["messages"]
+            entries = json.loads(user["content"])
+            if "分别直接翻译为以下语言：" in system["content"]:
+                langs = tuple(
+                    system["content"]
+                    .split("分别直接翻译为以下语言：")[1]
+                    .split("。")[0]
+                    .split("（")[0]
+                    .split(", ")
+                )
+                result = {
+                    entry["id"]: {lang: f"{lang}:{entry['text']}" for lang in langs}
+                    for entry in entries
+                }
+            else:
+                langs = (system["content"].split("直接翻译为")[1][:2],)
+                result = {
+                    entry["id"]: f"{langs[0]}:{entry['text']}" for entry in entries
+                }
+            self.requests.append((langs, len(entries)))
+            content = json.dumps(result, ensure_ascii=False)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=None,
+        )
+
+
+class TestParallelLanguages(unittest.TestCase):
+    """多语言并行生成测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.temp_dir.name, "output")
+        os.makedirs(self.output_dir)
+        self.source = {
+            f"key{i}": {"text": f"文本{i}", "comment": ""} for i in range(12)
+        }
+        self.source_path = os.path.join(self.temp_dir.name, "source.json")
+        with open(self.source_path, "w", encoding="utf-8") as f:
+            json.dump(self.source, f, ensure_ascii=False)
+
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+
+    def _config(self, **extra):
+        config_path = os.path.join(self.temp_dir.name, "config.yaml")
+        with open(config_path, "w", encoding="utf-8") as f:
+            yaml.dump(
+                dict(
+                    {
+                        "model_type": "DeepSeek",
+                        "model": "test-model",
+                        "api_key": uuid.uuid4().hex,
+                        "cache_path": os.path.join(self.temp_dir.name, "test.cache"),
+                        "rate_limit": 60000,
+                        "stream_window": 4,
+                    },
+                    **extra,
+                ),
+                f,
+            )
+        config = LocalizationConfig(config_path)
+        self.addCleanup(config.translation_cache.close)
+        return config
+
+    def _processor(self, delays, **extra):
+        config_path = os.path.join(self.temp_dir.name, "config.yaml")
+        with open(config_path, "w", encoding="utf-8") as f:
+            yaml.dump(
+                dict(
+                    {
+                        "model_type": "DeepSeek",
+                        "model": "test-model",
+                        "api_key": uuid.uuid4().hex,
+                        "cache_path": os.path.join(self.temp_dir.name, "test.cache"),
+                        "rate_limit": 60000,
+                        "rate_limit_shared": False,
+                        "stream_window": 4,
+                    },
+                    **extra,
+                ),
+                f,
+            )
+        config = LocalizationConfig(config_path)
+        translator = LanguageDelayTranslator(config, delays, self.output_dir)
+        with mock.patch.object(
+            TranslatorFactory, "create_translator", return_value=translator
+        ):
+            processor = LocalizationProcessor(config, concurrency=3)
+        self.addCleanup(config.translation_cache.close)
+        return processor, translator
+
+    def test_fast_language_written_before_slow_one_finishes(self):
+        """测试较快的语言完成后立即写出，且所有语言合计的在途请求数不超过上限"""
+        processor, translator = self._processor({"en": 0.001, "ja": 0.03})
+        processor.generate_localization(
+            self.source_path, ["ja", "en", "fr"], self.output_dir, "formal"
+        )
+
+        self.assertLessEqual(translator.max_in_flight, 3)
+        self.assertGreater(translator.max_in_flight, 1)
+        # ja 排在最前但最慢，仍有 ja 请求在 en.json 写出之后才开始
+        self.assertTrue(
+            any(lang == "ja" and "en" in seen for lang, seen in translator.seen_outputs)
+        )
+        for lang in ["ja", "en", "fr"]:
+            with open(
+                os.path.join(self.output_dir, f"{lang}.json"), encoding="utf-8"
+            ) as f:
+                output = json.load(f)
+            self.assertEqual(list(output), list(self.source))
+            self.assertEqual(output["key5"], f"{lang}:文本5")
+
+    def test_progress_reported_per_language(self):
+        """测试每种语言在写出窗口时报告进度，运行报告包含各语言的条目数"""
+        processor, _ = self._processor({})
+        processor.progress_interval = 3600
+        progress = []
+        processor.on_progress = lambda lang, done, total: progress.append(
+            (lang, done, total)
+        )
+        processor.generate_localization(
+            self.source_path, ["en", "ja"], self.output_dir, "formal"
+        )
+
+        for lang in ["en", "ja"]:
+            # 第一条译文完成时立即报告一次，之后的报告受间隔限制，只在写出窗口时报告
+            self.assertEqual(
+                [(done, total) for name, done, total in progress if name == lang],
+                [(1, 12), (4, 12), (8, 12), (12, 12)],
+            )
+        report = processor.run_report()["languages"]
+        self.assertEqual(report["en"]["entries"], 12)
+        self.assertGreaterEqual(report["ja"]["seconds"], 0)
+
+    def test_progress_reported_within_window(self):
+        """测试窗口写出之前就按完成的条目报告进度"""
+        processor, translator = self._processor({"en": 0.005}, stream_window=100)
+        processor.progress_interval = 0
+        progress = []
+        processor.on_progress = lambda lang, done, total: progress.append(
+            (done, os.path.exists(os.path.join(self.output_dir, "en.json")))
+        )
+        processor.generate_localization(
+            self.source_path, ["en"], self.output_dir, "formal"
+        )
+
+        done = [count for count, _ in progress]
+        self.assertEqual(done, sorted(done))
+        self.assertEqual(done[-1], 12)
+        # 整个源文件只有一个窗口，输出文件写出之前已经报告了逐条完成的进度
+        before_flush = [count for count, written in progress if not written]
+        self.assertGreaterEqual(len(set(before_flush)), 10)
+
+    def test_parallel_languages_limit(self):
+        """测试 parallel_languages 限制同时处理的语言数"""
+        processor, translator = self._processor({}, parallel_languages=1)
+        processor.generate_localization(
+            self.source_path, ["en", "ja"], self.output_dir, "formal"
+        )
+        # 同一时间只处理一种语言，ja 的请求全部在 en.json 写出之后
+        for lang, seen in translator.seen_outputs:
+            self.assertEqual("en" in seen, lang == "ja")
+
+    def test_multi_target_requests_all_languages_at_once(self):
+        """测试多目标语言模式下一次请求返回所有语言，只缺部分语言的条目单独请求"""
+        source = {f"key{i}": {"text": f"文本{i % 6}", "comment": ""} for i in range(12)}
+        with open(self.source_path, "w", encoding="utf-8") as f:
+            json.dump(source, f, ensure_ascii=False)
+        config = self._config(batch_size=10, multi_target=True, use_cache=True)
+        translator = MultiTargetTranslator(config)
+        with mock.patch.object(
+            TranslatorFactory, "create_translator", return_value=translator
+        ):
+            processor = LocalizationProcessor(config, concurrency=3)
+        # en 已有“文本1”的译文，只需要请求 ja
+        processor.cache.put("文本1", "", "en", "formal", "cached:文本1")
+
+        processor.generate_localization(
+            self.source_path, ["en", "ja"], self.output_dir, "formal"
+        )
+
+        self.assertIn((("en", "ja"), 3), translator.requests)
+        self.assertIn((("ja",), 1), translator.requests)
+        self.assertTrue(all(langs != ("en",) for langs, _ in translator.requests))
+        # 相同的原文跨窗口只请求一次
+        self.assertEqual(sum(count for _, count in translator.requests), 6)
+        for lang in ["en", "ja"]:
+            with open(
+                os.path.join(self.output_dir, f"{lang}.json"), encoding="utf-8"
+            ) as f:
+                output = json.load(f)
+            self.assertEqual(list(output), list(source))
+            self.assertEqual(output["key8"], f"{lang}:文本2")
+        self.assertEqual(output["key7"], "ja:文本1")
+        with open(os.path.join(self.output_dir, "en.json"), encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["key7"], "cached:文本1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多提供商号池测试文件
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import yaml
+
+# 添加src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from src.core.Localization import LocalizationProcessor, TranslatorFactory
+from src.translators.BaseTranslator import BaseTranslator, LocalizationConfig
+from src.translators.pool import PooledTranslator
+
+
+class StatusError(Exception):
+    """与 SDK 状态错误结构一致的异常"""
+
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers={})
+
+
+class MemberTranslator(BaseTranslator):
+    """记录调用次数的模拟成员，down 为 True 时所有请求返回 503"""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.name = config.get_config("name")
+        self.down = config.get_config("down", False)
+        self.status = config.get_config("status", 503)
+        self.calls = 0
+
+    def _build_payload(self, text, target_lang, style, comment):
+        return {"text": text, "lang": target_lang}
+
+    def _create_completion(self, payload):
+        self.calls += 1
+        if self.down:
+            raise StatusError(self.status)
+        content = f"{self.name}:{payload['text']}"
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=None,
+        )
+
+
+class FakeClock:
+    """可手动推进的时钟"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestPooledTranslator(unittest.TestCase):
+    """号池分配与故障转移测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config = None
+
+    def tearDown(self):
+        """测试后清理"""
+        if self.config is not None:
+            self.config.translation_cache.close()
+        self.temp_dir.cleanup()
+
+    def _pool(self, providers, clock=None, **extra):
+        config_path = os.path.join(self.temp_dir.name, "config.yaml")
+        with open(config_path, "w", encoding="utf-8") as f:
+            yaml.dump(
+                {
+                    "model_type": "Pool",
+                    "cache_path": os.path.join(self.temp_dir.name, "cache.db"),
+                    "rate_limit_shared": False,
+                    "max_retries": 0,
+                    "providers": [
+                        # 每个成员使用独立的限流器与熔断器
+                        dict(
+                            {
+                                "model_type": "DeepSeek",
+                                "model": provider["name"],
+                                "api_key": uuid.uuid4().hex,
+                                "rate_limit": 60000,
+                            },
+                            **provider,
+                        )
+                        for provider in providers
+                    ],
+                    **extra,
+                },
+                f,
+            )
+        self.config = LocalizationConfig(config_path)
+        return PooledTranslator(self.config, MemberTranslator, clock or FakeClock())
+
+    def test_work_is_spread_by_weight(self):
+        """测试按权重分配请求"""
+        pool = self._pool([{"name": "a", "weight": 3}, {"name": "b", "weight": 1}])
+        for i in range(8):
+            pool.translate_text(f"t{i}", "en")
+        calls = {m.translator.name: m.translator.calls for m in pool.members}
+        self.assertEqual(calls, {"a": 6, "b": 2})
+
+    def test_weight_defaults_to_rate_limit(self):
+        """测试未配置 weight 时按 rate_limit 计算权重"""
+        pool = self._pool(
+            [{"name": "a", "rate_limit": 100}, {"name": "b", "rate_limit": 300}]
+        )
+        self.assertEqual([m.weight for m in pool.members], [100, 300])
+
+    def test_slow_member_gets_less_weight(self):
+        """测试延迟高的成员有效权重降低"""
+        pool = self._pool([{"name": "a"}, {"name": "b"}])
+        fast, slow = pool.members
+        fast.latency, slow.latency = 0.1, 0.4
+        self.assertAlmostEqual(pool.effective_weight(slow), slow.weight / 4)
+        self.assertEqual(pool.effective_weight(fast), fast.weight)
+
+    def test_failover_to_healthy_member(self):
+        """测试故障成员的条目转给其他成员，并在冷却期内不再分配"""
+        clock = FakeClock()
+        pool = self._pool(
+            [{"name": "down", "down": True, "weight": 10}, {"name": "up", "weight": 1}],
+            clock,
+        )
+        down, up = pool.members
+        results = pool.translate_batch([("确定", ""), ("取消", "")], "en")
+        self.assertEqual(results, ["up:确定", "up:取消"])
+        self.assertEqual(down.failures, 1)
+        self.assertEqual(pool.dead_letters, [])
+
+        calls = down.translator.calls
+        self.assertEqual(pool.translate_text("返回", "en"), "up:返回")
+        self.assertEqual(down.translator.calls, calls)
+        clock.now += pool.cooldown
+        pool.translate_text("退出", "en")
+        self.assertGreater(down.translator.calls, calls)
+
+    def test_rate_limited_member_fails_over_without_backoff(self):
+        """测试成员被限流时立即转给其他成员，不在该成员上退避重试"""
+        pool = self._pool(
+            [
+                {"name": "limited", "down": True, "status": 429, "weight": 10},
+                {"name": "up", "weight": 1},
+            ],
+            max_retries=3,
+            retry_base_delay=60,
+        )
+        limited, up = pool.members
+        with mock.patch("time.sleep") as sleep:
+            self.assertEqual(pool.translate_text("确定", "en"), "up:确定")
+        sleep.assert_not_called()
+        self.assertEqual(limited.translator.calls, 1)
+
+        # 只剩最后一个成员时仍按重试策略等待
+        with mock.patch("time.sleep") as sleep:
+            limited.translator.calls = 0
+            up.translator.down = True
+            limited.cooldown_until = 0.0
+            up.cooldown_until = 10**9
+            pool.translate_text("取消", "en")
+        self.assertGreater(sleep.call_count, 0)
+
+    def test_waits_for_cooldown_when_all_members_cool_down(self):
+        """测试所有成员都在冷却中时先等待最早结束的冷却，再发送请求"""
+        clock = FakeClock()
+        pool = self._pool(
+            [{"name": "a", "down": True}, {"name": "b", "down": True}], clock
+        )
+        pool.translate_text("确定", "en")
+        for member in pool.members:
+            member.translator.down = False
+        with mock.patch("time.sleep") as sleep:
+            self.assertIn(pool.translate_text("取消", "en"), ("a:取消", "b:取消"))
+        sleep.assert_called_once_with(pool.cooldown)
+
+    def test_async_failover_is_logged(self):
+        """测试异步翻译转给其他提供商时与同步版本一样打印提示"""
+        pool = self._pool(
+            [{"name": "down", "down": True, "weight": 10}, {"name": "up", "weight": 1}]
+        )
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            results = asyncio.run(pool.translate_batch_async([("确定", "")], "en"))
+        self.assertEqual(results, ["up:确定"])
+        self.assertIn("转给其他提供商", output.getvalue())
+
+    def test_clear_dead_letters_clears_members(self):
+        """测试清空号池的失败条目时同时清空各成员的失败条目"""
+        pool = self._pool([{"name": "a", "down": True}, {"name": "b", "down": True}])
+        pool.translate_text("确定", "en")
+        self.assertTrue(pool.members[0].translator.dead_letters)
+        pool.clear_dead_letters()
+        self.assertEqual(pool.dead_letters, [])
+        self.assertTrue(all(not m.translator.dead_letters for m in pool.members))
+
+    def test_multi_target_async_fails_over(self):
+        """测试异步多目标语言翻译同样转给健康的成员"""
+        pool = self._pool(
+            [{"name": "down", "down": True, "weight": 10}, {"name": "up", "weight": 1}]
+        )
+        results = asyncio.run(pool.translate_multi_async([("确定", "")], ["en", "ja"]))
+        self.assertEqual(results, [{"en": "up:确定", "ja": "up:确定"}])
+
+    def test_all_members_failed_goes_to_dead_letters(self):
+        """测试所有成员都失败时条目进入号池的 dead_letters"""
+        pool = self._pool([{"name": "a", "down": True}, {"name": "b", "down": True}])
+        self.assertEqual(pool.translate_text("确定", "en", "formal"), "")
+        self.assertEqual(len(pool.dead_letters), 1)
+        self.assertEqual(pool.dead_letters[0]["category"], "failover_exhausted")
+
+    def test_factory_creates_pool(self):
+        """测试工厂根据 model_type: Pool 创建号池，成员按各自的 model_type 创建"""
+        config_path = os.path.join(self.temp_dir.name, "config.yaml")
+        with open(config_path, "w", encoding="utf-8") as f:
+            yaml.dump(
+                {
+                    "model_type": "Pool",
+                    "cache_path": os.path.join(self.temp_dir.name, "cache.db"),
+                    "rate_limit_shared": False,
+                    "system_prompt": "shared prompt",
+                    "providers": [
+                        {"model_type": "DeepSeek", "model": "m1", "api_key": "k1"},
+                        {"model_type": "Kimi", "model": "m2", "api_key": "k2"},
+                    ],
+                },
+                f,
+            )
+        self.config = LocalizationConfig(config_path)
+        pool = TranslatorFactory.create_translator(self.config)
+        self.assertIsInstance(pool, PooledTranslator)
+        self.assertEqual(pool.model, "pool:m1+m2")
+        self.assertEqual(
+            pool.members[1].translator.config.get_config("system_prompt"),
+            "shared prompt",
+        )
+
+    def test_processor_reports_pool_stats(self):
+        """测试运行报告包含号池成员的统计"""
+        pool = self._pool([{"name": "a"}, {"name": "b"}])
+        source_path = os.path.join(self.temp_dir.name, "source.json")
+        with open(source_path, "w", encoding="utf-8") as f:
+            json.dump({f"k{i}": {"text": f"t{i}", "comment": ""} for i in range(4)}, f)
+        with mock.patch.object(
+            TranslatorFactory, "create_translator", return_value=pool
+        ):
+            processor = LocalizationProcessor(self.config)
+        processor.generate_localization(source_path, ["en"], self.temp_dir.name)
+
+        report = processor.run_report()["pool"]
+        self.assertEqual(sum(member["successes"] for member in report), 4)
+        with open(os.path.join(self.temp_dir.name, "en.json"), encoding="utf-8") as f:
+            output = json.load(f)
+        self.assertTrue(all(value.split(":")[0] in "ab" for value in output.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
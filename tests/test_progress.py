@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+进度汇总与任务取消测试文件
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+import uuid
+from pathlib import Path
+from unittest import mock
+
+import yaml
+
+# 添加src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from src.core.Localization import (
+    LocalizationCancelled,
+    LocalizationProcessor,
+    TranslatorFactory,
+)
+from src.core.progress import ProgressTracker, format_duration
+from src.translators.BaseTranslator import BaseTranslator, LocalizationConfig
+
+
+class CancellingTranslator(BaseTranslator):
+    """翻译到指定条数后从另一个线程请求取消的模拟翻译器"""
+
+    def __init__(self, config, cancel_after):
+        super().__init__(config)
+        self.cancel_after = cancel_after
+        self.processor = None
+        self.calls = 0
+
+    def _maybe_cancel(self):
+        self.calls += 1
+        if self.calls == self.cancel_after:
+            thread = threading.Thread(target=self.processor.cancel)
+            thread.start()
+            thread.join()
+
+    def translate_text(self, text, target_lang, style=None, comment=None):
+        self._maybe_cancel()
+        return f"{target_lang}:{text}"
+
+    async def translate_text_async(self, text, target_lang, style=None, comment=None):
+        self._maybe_cancel()
+        await asyncio.sleep(0.1)
+        return f"{target_lang}:{text}"
+
+
+class TestProgressTracker(unittest.TestCase):
+    """进度汇总测试类"""
+
+    def test_snapshot_rate_and_eta(self):
+        """测试总体进度按各语言合计，未报告的语言按已知总数估计"""
+        now = [100.0]
+        tracker = ProgressTracker(["en", "ja"], clock=lambda: now[0])
+        self.assertIsNone(tracker.snapshot()["total"])
+
+        now[0] = 110.0
+        snapshot = tracker.update("en", 50, 100)
+        self.assertEqual((snapshot["done"], snapshot["total"]), (50, 200))
+        self.assertEqual(snapshot["percent"], 25)
+        self.assertAlmostEqual(snapshot["rate"], 5.0)
+        self.assertAlmostEqual(snapshot["eta"], 30.0)
+        self.assertEqual(snapshot["languages"]["ja"], {"done": 0, "total": None})
+
+    def test_format_duration(self):
+        """测试时长格式化"""
+        self.assertEqual(format_duration(None), "--:--")
+        self.assertEqual(format_duration(65), "01:05")
+        self.assertEqual(format_duration(3725), "1:02:05")
+
+
+class TestCancellation(unittest.TestCase):
+    """任务取消测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.temp_dir.name, "output")
+        source = {f"key{i}": {"text": f"文本{i}", "comment": ""} for i in range(20)}
+        self.source_path = os.path.join(self.temp_dir.name, "source.json")
+        with open(self.source_path, "w", encoding="utf-8") as f:
+            json.dump(source, f, ensure_ascii=False)
+
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+
+    def _processor(self, cancel_after, concurrency):
+        config_path = os.path.join(self.temp_dir.name, "config.yaml")
+        with open(config_path, "w", encoding="utf-8") as f:
+            yaml.dump(
+                {
+                    "model_type": "DeepSeek",
+                    "model": "test-model",
+                    "api_key": uuid.uuid4().hex,
+                    "cache_path": os.path.join(self.temp_dir.name, "test.cache"),
+                    "use_cache": True,
+                    "rate_limit": 60000,
+                    "rate_limit_shared": False,
+                    "stream_window": 5,
+                    "parallel_languages": 1,
+                },
+                f,
+            )
+        config = LocalizationConfig(config_path)
+        translator = CancellingTranslator(config, cancel_after)
+        with mock.patch.object(
+            TranslatorFactory, "create_translator", return_value=translator
+        ):
+            processor = LocalizationProcessor(config, concurrency=concurrency)
+        translator.processor = processor
+        self.addCleanup(config.translation_cache.close)
+        return processor, translator
+
+    def _assert_cancelled(self, concurrency):
+        processor, translator = self._processor(25, concurrency)
+        with self.assertRaises(LocalizationCancelled):
+            processor.generate_localization(
+                self.source_path, ["en", "ja"], self.output_dir, "formal"
+            )
+        # 已完成的语言保留输出文件，未完成的语言不留下不完整的文件
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, "en.json")))
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, "ja.json")))
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, "ja.json.tmp")))
+        self.assertLess(translator.calls, 40)
+        self.assertGreaterEqual(processor.cache.stores, 20)
+        self.assertFalse(processor.cancelled)
+
+        # 取消请求已清除，再次运行时已完成的语言全部命中缓存，只翻译剩余的条目
+        calls = translator.calls
+        processor.generate_localization(
+            self.source_path, ["en", "ja"], self.output_dir, "formal"
+        )
+        self.assertGreaterEqual(processor.cache.hits, 20)
+        self.assertLessEqual(translator.calls - calls, 20)
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, "ja.json")))
+
+    def test_cancel_sequential(self):
+        """测试顺序模式在当前批次结束后停止"""
+        self._assert_cancelled(concurrency=1)
+
+    def test_cancel_concurrent(self):
+        """测试并发模式取消所有语言的任务"""
+        self._assert_cancelled(concurrency=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+限流器测试文件
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+import yaml
+
+# 添加src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from src.translators.BaseTranslator import BaseTranslator, LocalizationConfig
+from src.translators.rate_limiter import (
+    RateLimiter,
+    TokenBucket,
+    estimate_tokens,
+    get_rate_limiter,
+)
+
+
+class FakeClock:
+    """可手动推进的时钟"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRateLimiter(unittest.TestCase):
+    """限流器测试类"""
+
+    def test_rate_limit_is_per_minute(self):
+        """测试 rate_limit 按每分钟请求数计算"""
+        bucket = TokenBucket(rate_per_minute=60)
+        self.assertEqual(bucket.reserve(1, 0.0), 0.0)
+        # 第二个请求需要等待 1 秒（60 RPM）
+        self.assertAlmostEqual(bucket.reserve(1, 0.0), 1.0)
+        self.assertAlmostEqual(bucket.reserve(1, 0.0), 2.0)
+
+        slow_bucket = TokenBucket(rate_per_minute=3)
+        slow_bucket.reserve(1, 0.0)
+        self.assertAlmostEqual(slow_bucket.reserve(1, 0.0), 20.0)
+
+    def test_token_budget_and_adjust(self):
+        """测试 TPM 预约与按实际用量校正"""
+        clock = FakeClock()
+        limiter = RateLimiter("tpm-test", rpm=None, tpm=600, clock=clock)
+        # 容量为 10 token/秒
+        self.assertEqual(limiter.reserve(10), 0.0)
+        self.assertAlmostEqual(limiter.reserve(20), 2.0)
+        # 实际用量比预约少 20，归还后不再需要等待
+        limiter.adjust_tokens(-20)
+        self.assertEqual(limiter.reserve(0), 0.0)
+
+    def test_shared_state_across_instances(self):
+        """测试两个限流器实例（模拟两个进程）通过状态文件共享配额"""
+        clock = FakeClock()
+        with tempfile.TemporaryDirectory() as shared_dir:
+            first = RateLimiter("shared", rpm=60, shared_dir=shared_dir, clock=clock)
+            second = RateLimiter("shared", rpm=60, shared_dir=shared_dir, clock=clock)
+            self.assertEqual(first.reserve(), 0.0)
+            self.assertAlmostEqual(second.reserve(), 1.0)
+            self.assertAlmostEqual(first.reserve(), 2.0)
+
+    def test_sharing_is_opt_in_and_scoped_per_config(self):
+        """测试默认不跨进程共享，开启后状态目录按配置文件区分"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = []
+            for name, shared in (("a.yaml", False), ("a.yaml", True), ("b.yaml", True)):
+                config_path = os.path.join(temp_dir, name)
+                with open(config_path, "w", encoding="utf-8") as f:
+                    yaml.dump(
+                        {
+                            "model_type": "DeepSeek",
+                            "model": "test-model",
+                            "cache_path": os.path.join(temp_dir, "test.cache"),
+                            "rate_limit_shared": shared,
+                        },
+                        f,
+                    )
+                config = LocalizationConfig(config_path)
+                translator = BaseTranslator(config)
+                paths.append(translator.rate_limiter._state_path)
+                config.translation_cache.close()
+        self.assertIsNone(paths[0])
+        self.assertIsNotNone(paths[1])
+        self.assertNotEqual(paths[1].parent, paths[2].parent)
+
+    def test_thread_safe_reservations(self):
+        """测试多线程并发预约时每个请求得到不同的等待时间"""
+        clock = FakeClock()
+        limiter = RateLimiter("threads", rpm=60, clock=clock)
+        waits = []
+        lock = threading.Lock()
+
+        def worker():
+            wait = limiter.reserve()
+            with lock:
+                waits.append(round(wait, 6))
+
+        threads = [threading.Thread(target=worker) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(waits), [float(i) for i in range(10)])
+
+    def test_acquire_async(self):
+        """测试异步获取在不限流时立即返回"""
+        limiter = RateLimiter("async", rpm=6000)
+        asyncio.run(limiter.acquire_async(10))
+
+    def test_registry_shares_instance_per_provider_and_key(self):
+        """测试同一提供商与 API Key 共享限流器实例"""
+        first = get_rate_limiter("DeepSeek", "key-a", 3)
+        second = get_rate_limiter("DeepSeek", "key-a", 3)
+        other = get_rate_limiter("DeepSeek", "key-b", 3)
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertNotIn("key-a", first.name)
+
+    def test_estimate_tokens(self):
+        """测试 token 估算"""
+        self.assertEqual(estimate_tokens(""), 0)
+        self.assertEqual(estimate_tokens("欢迎使用"), 4)
+        self.assertEqual(estimate_tokens("abcdefgh"), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
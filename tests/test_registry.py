@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+翻译器注册表与启动导入测试文件
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import yaml
+
+# 添加src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from src.core.Localization import TranslatorFactory
+from src.translators import registry
+from src.translators.BaseTranslator import BaseTranslator, LocalizationConfig
+from tools.importtime import check, heavy_imports, measure, parse_importtime
+
+
+class TestRegistry(unittest.TestCase):
+    """翻译器注册表测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        registry_state = dict(registry._registry)
+        self.addCleanup(registry._registry.update, registry_state)
+        self.addCleanup(registry._registry.clear)
+
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+
+    def _config(self, model_type):
+        config_path = os.path.join(self.temp_dir.name, "config.yaml")
+        with open(config_path, "w", encoding="utf-8") as f:
+            yaml.dump(
+                {
+                    "model_type": model_type,
+                    "model": "test-model",
+                    "cache_path": os.path.join(self.temp_dir.name, "test.cache"),
+                    "rate_limit_shared": False,
+                },
+                f,
+            )
+        config = LocalizationConfig(config_path)
+        self.addCleanup(config.translation_cache.close)
+        return config
+
+    def test_builtin_and_pool_registered(self):
+        """测试内置提供商与号池都已注册"""
+        available = registry.available_translators()
+        for model_type in ["Doubao", "DeepSeek", "Kimi", "TongYi", "TongYiQwen"]:
+            self.assertIn(model_type, available)
+        self.assertIn("Pool", available)
+
+    def test_register_by_module_path(self):
+        """测试按 "模块:属性" 注册的翻译器在首次使用时才解析"""
+        registry.register_translator(
+            "Plugin", "src.translators.BaseTranslator:BaseTranslator"
+        )
+        self.assertIsInstance(registry._registry["Plugin"], str)
+        translator = TranslatorFactory.create_translator(self._config("Plugin"))
+        self.assertIsInstance(translator, BaseTranslator)
+        self.assertIs(registry._registry["Plugin"], BaseTranslator)
+
+    def test_entry_points_loaded_on_unknown_type(self):
+        """测试未注册的类型从入口点查找，找不到时抛出 ValueError"""
+        entry_point = SimpleNamespace(
+            name="EntryPlugin", value="src.translators.BaseTranslator:BaseTranslator"
+        )
+        with mock.patch.object(registry, "_entry_points_loaded", False), mock.patch(
+            "importlib.metadata.entry_points", return_value=[entry_point]
+        ):
+            self.assertIs(
+                registry.get_translator_factory("EntryPlugin"), BaseTranslator
+            )
+            with self.assertRaises(ValueError) as context:
+                registry.get_translator_factory("Missing")
+        self.assertIn("Unsupported model type", str(context.exception))
+
+
+class TestStartupImports(unittest.TestCase):
+    """启动导入测试类"""
+
+    def test_parse_importtime(self):
+        """测试解析入口的累计耗时与导入的模块"""
+        output = "\n".join(
+            [
+                "import time: self [us] | cumulative | imported package",
+                "import time:       120 |        120 |     yaml.reader",
+                "import time:        30 |        150 |   yaml",
+                "import time:        40 |        400 | main",
+            ]
+        )
+        cumulative, modules = parse_importtime(output, "main")
+        self.assertEqual(cumulative, 400)
+        self.assertEqual(modules, ["yaml.reader", "yaml", "main"])
+        self.assertEqual(heavy_imports(["pandas.core", "yaml"]), ["pandas"])
+        self.assertEqual(heavy_imports(["pandas.core"], ["pandas"]), [])
+
+    def test_check_budget(self):
+        """测试超出预算与导入重量级依赖都会被报告"""
+        results = {
+            "main": {"ms": 90.0, "modules": ["main"]},
+            "bunny": {"ms": 50.0, "modules": ["openai"]},
+            "gui_main": {"error": "ModuleNotFoundError"},
+        }
+        budgets = {"main": {"budget_ms": 80}, "bunny": {"budget_ms": 100}}
+        failures = check(results, budgets)
+        self.assertEqual(len(failures), 2)
+        self.assertEqual(check(results, budgets, tolerance=1.5)[0][:5], "bunny")
+
+    def test_entry_points_do_not_import_heavy_dependencies(self):
+        """测试命令行入口启动时不导入提供商 SDK 与 pandas"""
+        for module in ["main", "csv_main", "tools.BunnyLocalization"]:
+            with self.subTest(module=module):
+                result = measure(module, repeat=1)
+                self.assertNotIn("error", result)
+                self.assertEqual(heavy_imports(result["modules"]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+重试、熔断与失败条目记录测试文件
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import unittest
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import yaml
+
+# 添加src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from src.core.Localization import LocalizationProcessor, TranslatorFactory
+from src.translators.BaseTranslator import BaseTranslator, LocalizationConfig
+from src.translators.resilience import (
+    AUTH,
+    FATAL,
+    RATE_LIMITED,
+    TRANSIENT,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    classify_error,
+)
+
+
+class StatusError(Exception):
+    """与 SDK 状态错误结构一致的异常"""
+
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers={})
+
+
+class APIConnectionError(Exception):
+    """与 SDK 连接错误同名、没有状态码的异常"""
+
+
+class FlakyTranslator(BaseTranslator):
+    """按脚本依次抛出异常，脚本用完后正常返回的模拟翻译器"""
+
+    def __init__(self, config, errors=()):
+        super().__init__(config)
+        self.errors = list(errors)
+        self.calls = 0
+
+    def _build_payload(self, text, target_lang, style, comment):
+        return {"text": text, "lang": target_lang}
+
+    def _create_completion(self, payload):
+        self.calls += 1
+        if self.errors:
+            error = self.errors.pop(0)
+            if error is not None:
+                raise error
+        content = f"{payload['lang']}:{payload['text']}"
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=None,
+        )
+
+
+class TestResiliencePrimitives(unittest.TestCase):
+    """错误分类、退避与熔断器测试类"""
+
+    def test_classify_error(self):
+        """测试错误分类"""
+        self.assertEqual(classify_error(StatusError(429)), RATE_LIMITED)
+        self.assertEqual(classify_error(StatusError(503)), TRANSIENT)
+        self.assertEqual(classify_error(StatusError(401)), AUTH)
+        self.assertEqual(classify_error(StatusError(400)), FATAL)
+        self.assertEqual(classify_error(APIConnectionError()), TRANSIENT)
+        self.assertEqual(classify_error(TimeoutError()), TRANSIENT)
+        self.assertEqual(classify_error(KeyError("choices")), FATAL)
+
+    def test_backoff_is_bounded_and_respects_retry_after(self):
+        """测试退避时间不超过上限，且不短于 Retry-After"""
+        policy = RetryPolicy(3, base_delay=1.0, max_delay=4.0, rng=random.Random(1))
+        for attempt in range(10):
+            self.assertLessEqual(policy.delay(attempt), 4.0)
+        self.assertGreaterEqual(policy.delay(0, retry_after=5.0), 5.0)
+
+    def test_circuit_breaker_states(self):
+        """测试连续故障后熔断，到期后只放行一个探测请求"""
+        now = [0.0]
+        breaker = CircuitBreaker("test", 2, 10.0, clock=lambda: now[0])
+        breaker.record_failure(RATE_LIMITED)
+        breaker.record_failure(FATAL)
+        breaker.record_failure(TRANSIENT)
+        breaker.check()
+        breaker.record_failure(TRANSIENT)
+        with self.assertRaises(CircuitOpenError) as context:
+            breaker.check()
+        self.assertAlmostEqual(context.exception.retry_in, 10.0)
+
+        now[0] = 10.0
+        breaker.check()
+        with self.assertRaises(CircuitOpenError):
+            breaker.check()
+        breaker.record_failure(TRANSIENT)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        now[0] = 20.0
+        breaker.check()
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        breaker.check()
+        breaker.check()
+
+
+class TestTranslatorResilience(unittest.TestCase):
+    """翻译器重试与失败条目测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.temp_dir.name, "config.yaml")
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            yaml.dump(
+                {
+                    "model_type": "DeepSeek",
+                    "model": "test-model",
+                    # 每个测试使用独立的熔断器
+                    "api_key": uuid.uuid4().hex,
+                    "cache_path": os.path.join(self.temp_dir.name, "cache.db"),
+                    "rate_limit": 60000,
+                    "rate_limit_shared": False,
+                    "max_retries": 2,
+                    "retry_base_delay": 0.001,
+                    "circuit_failure_threshold": 3,
+                    "circuit_reset_timeout": 60,
+                },
+                f,
+            )
+        self.config = LocalizationConfig(self.config_path)
+
+    def tearDown(self):
+        """测试后清理"""
+        self.config.translation_cache.close()
+        self.temp_dir.cleanup()
+
+    def test_transient_errors_are_retried(self):
+        """测试偶发的 5xx 与连接错误重试后成功"""
+        translator = FlakyTranslator(
+            self.config, [StatusError(503), APIConnectionError()]
+        )
+        self.assertEqual(translator.translate_text("确定", "en"), "en:确定")
+        self.assertEqual(translator.calls, 3)
+        self.assertEqual(translator.dead_letters, [])
+
+    def test_fatal_error_goes_to_dead_letters(self):
+        """测试不可重试的错误不重试，条目进入 dead_letters"""
+        translator = FlakyTranslator(self.config, [StatusError(400)])
+        self.assertEqual(translator.translate_text("确定", "en", "formal"), "")
+        self.assertEqual(translator.calls, 1)
+        self.assertEqual(len(translator.dead_letters), 1)
+        self.assertEqual(translator.dead_letters[0]["category"], FATAL)
+        self.assertEqual(translator.dead_letters[0]["target_lang"], "en")
+
+    def test_open_circuit_fails_fast(self):
+        """测试熔断后不再发起请求"""
+        translator = FlakyTranslator(self.config, [StatusError(502)] * 10)
+        with mock.patch("time.sleep"):
+            self.assertEqual(translator.translate_text("确定", "en"), "")
+            self.assertEqual(translator.calls, 3)
+            self.assertEqual(translator.translate_text("取消", "en"), "")
+        self.assertEqual(translator.calls, 3)
+        self.assertEqual(translator.circuit_breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(
+            [entry["text"] for entry in translator.dead_letters], ["确定", "取消"]
+        )
+
+    def test_processor_writes_dead_letters(self):
+        """测试本地化结束后失败条目写入输出目录"""
+        source_path = os.path.join(self.temp_dir.name, "source.json")
+        with open(source_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "a": {"text": "确定", "comment": ""},
+                    "b": {"text": "取消", "comment": ""},
+                },
+                f,
+            )
+        translator = FlakyTranslator(self.config, [None, StatusError(422)])
+        with mock.patch.object(
+            TranslatorFactory, "create_translator", return_value=translator
+        ):
+            processor = LocalizationProcessor(self.config)
+        processor.generate_localization(source_path, ["en"], self.temp_dir.name)
+
+        path = os.path.join(self.temp_dir.name, LocalizationProcessor.DEAD_LETTER_FILE)
+        with open(path, encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual([entry["text"] for entry in entries], ["取消"])
+        self.assertEqual(processor.run_report()["dead_letters"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
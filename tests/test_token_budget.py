@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+token 预算打包测试文件
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+import yaml
+
+# 添加src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from src.translators.BaseTranslator import BaseTranslator, LocalizationConfig
+from src.translators.token_budget import TokenBudget
+
+
+class UsageTranslator(BaseTranslator):
+    """返回批量译文与固定倍数 token 用量的翻译器，记录每次请求的条目数与 max_tokens"""
+
+    def __init__(self, config, completion_factor=1.0):
+        super().__init__(config)
+        self.IsSupportBatch = True
+        self.completion_factor = completion_factor
+        self.requests = []
+
+    def _build_payload(self, text, target_lang, style, comment):
+        return {"messages": [{"role": "user", "content": text}]}
+
+    def _create_completion(self, payload):
+        entries = json.loads(payload["messages"][1]["content"])
+        self.requests.append((len(entries), payload["max_tokens"]))
+        content = json.dumps({entry["id"]: entry["text"].upper() for entry in entries})
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(
+                prompt_tokens=100,
+                completion_tokens=int(payload["max_tokens"] * self.completion_factor),
+                total_tokens=0,
+            ),
+        )
+
+
+class TestTokenBudget(unittest.TestCase):
+    """token 预算测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+
+    def _config(self, **extra):
+        config_path = os.path.join(self.temp_dir.name, "config.yaml")
+        with open(config_path, "w", encoding="utf-8") as f:
+            yaml.dump(
+                dict(
+                    {
+                        "model_type": "DeepSeek",
+                        "model": "test-model",
+                        "cache_path": os.path.join(self.temp_dir.name, "test.cache"),
+                        "rate_limit": 60000,
+                        "rate_limit_shared": False,
+                    },
+                    **extra,
+                ),
+                f,
+            )
+        return LocalizationConfig(config_path)
+
+    def test_plan_respects_output_limit_and_item_cap(self):
+        """测试按输出上限与条目数上限划分连续区间"""
+        budget = TokenBudget(context_window=100000, max_output_tokens=100)
+        # 每条预估输出 2 * 10 + 8 = 28 token，输出上限的 80% 最多容纳 2 条
+        items = [("x" * 40, None)] * 5
+        self.assertEqual(budget.plan(items, 0), [(0, 2), (2, 4), (4, 5)])
+        # 两种目标语言时每条的输出翻倍
+        self.assertEqual(budget.plan(items, 0, langs=2), [(i, i + 1) for i in range(5)])
+        budget = TokenBudget(context_window=100000, max_output_tokens=10000)
+        self.assertEqual(budget.plan(items, 0, max_items=3), [(0, 3), (3, 5)])
+
+    def test_plan_respects_context_window(self):
+        """测试输入与 max_tokens 之和不超过上下文窗口，超大条目单独成批"""
+        budget = TokenBudget(context_window=200, max_output_tokens=1000)
+        items = [("确" * 30, None)] * 3 + [("确" * 500, None)] + [("确", None)]
+        self.assertEqual(
+            budget.plan(items, 20), [(0, 1), (1, 2), (2, 3), (3, 4), (4, 5)]
+        )
+        budget = TokenBudget(context_window=300, max_output_tokens=1000)
+        self.assertEqual(budget.plan(items[:3], 20), [(0, 2), (2, 3)])
+
+    def test_max_tokens_bounds(self):
+        """测试 max_tokens 不低于下限，也不超过模型输出上限"""
+        budget = TokenBudget(max_output_tokens=4096, min_output_tokens=1024)
+        self.assertEqual(budget.max_tokens(10), 1024)
+        self.assertEqual(budget.max_tokens(2000), 2500)
+        self.assertEqual(budget.max_tokens(100000), 4096)
+
+    def test_small_batch_requests_less_than_max_tokens(self):
+        """测试 max_tokens 配置不再是下限：小批次请求的 max_tokens 低于配置值"""
+        config = self._config(batch_size=5, max_tokens=1024)
+        translator = UsageTranslator(config)
+        self.assertEqual(translator.token_budget.max_output_tokens, 4096)
+        translator.translate_batch([("text", None), ("more", None)], "en")
+        self.assertEqual(len(translator.requests), 1)
+        limit = translator.requests[0][1]
+        self.assertGreaterEqual(limit, 64)
+        self.assertLess(limit, 1024)
+        config.translation_cache.close()
+
+    def test_usage_calibrates_batches(self):
+        """测试实际输出多于预估时校正系数增大，后续批次打包的条目变少"""
+        config = self._config(batch_size="auto", max_output_tokens=2000, max_tokens=1)
+        translator = UsageTranslator(config, completion_factor=1.0)
+        self.assertEqual(translator.batch_size, 200)
+        items = [(f"text{i:04d}" * 4, None) for i in range(200)]
+        before = len(translator.plan_batches(items))
+
+        # 实际输出等于 max_tokens，即预估值的 1/headroom 倍
+        for _ in range(10):
+            translator.translate_batch(items[:20], "en")
+        self.assertGreater(translator.token_budget.output_scale, 1.2)
+        self.assertGreater(len(translator.plan_batches(items)), before)
+        config.translation_cache.close()
+
+    def test_translate_batch_splits_oversized_batch(self):
+        """测试超出 token 预算的批次自动拆分，所有请求的 max_tokens 不超过输出上限"""
+        config = self._config(batch_size=50, max_output_tokens=300, max_tokens=64)
+        translator = UsageTranslator(config, completion_factor=0.1)
+        items = [(f"text{i:04d}" * 4, None) for i in range(50)]
+        results = translator.translate_batch(items, "en")
+
+        self.assertEqual(results, [text.upper() for text, _ in items])
+        self.assertGreater(len(translator.requests), 1)
+        self.assertEqual(sum(count for count, _ in translator.requests), 50)
+        self.assertTrue(all(limit <= 300 for _, limit in translator.requests))
+        config.translation_cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+内容寻址翻译缓存测试文件
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import yaml
+
+# 添加src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from src.core.Localization import LocalizationProcessor, TranslatorFactory
+from src.translators.BaseTranslator import BaseTranslator, LocalizationConfig
+from src.translators.translation_cache import TranslationCache, normalize_text
+from src.translators.translation_memory import TranslationMemory
+
+
+class CountingTranslator(BaseTranslator):
+    """统计调用次数的模拟翻译器"""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.calls = 0
+
+    def translate_text(self, text, target_lang, style=None, comment=None):
+        self.calls += 1
+        return f"{target_lang}:{text}"
+
+
+class TestTranslationCache(unittest.TestCase):
+    """翻译缓存测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.memory = TranslationMemory(os.path.join(self.temp_dir.name, "tm.db"))
+
+    def tearDown(self):
+        """测试后清理"""
+        self.memory.close()
+        self.temp_dir.cleanup()
+
+    def test_key_depends_on_content_not_position(self):
+        """测试缓存键只与内容有关，且规范化后相同的文本命中同一条目"""
+        cache = TranslationCache(self.memory, "model-a", "prompt-1")
+        cache.put("确定", None, "en", "formal", "OK")
+
+        self.assertEqual(cache.get(" 确定\r\n", None, "en", "formal"), "OK")
+        self.assertIsNone(cache.get("确定", "按钮", "en", "formal"))
+        self.assertIsNone(cache.get("确定", None, "ja", "formal"))
+        self.assertIsNone(cache.get("确定", None, "en", "casual"))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 3)
+
+    def test_model_and_prompt_changes_miss(self):
+        """测试模型或提示词变化后不命中旧译文"""
+        TranslationCache(self.memory, "model-a", "prompt-1").put(
+            "确定", None, "en", "formal", "OK"
+        )
+        self.assertIsNone(
+            TranslationCache(self.memory, "model-b", "prompt-1").get(
+                "确定", None, "en", "formal"
+            )
+        )
+        self.assertIsNone(
+            TranslationCache(self.memory, "model-a", "prompt-2").get(
+                "确定", None, "en", "formal"
+            )
+        )
+
+    def test_empty_translation_not_stored(self):
+        """测试失败产生的空译文不会写入缓存"""
+        cache = TranslationCache(self.memory, "m", "p")
+        cache.put("确定", None, "en", "formal", "  ")
+        self.assertIsNone(cache.get("确定", None, "en", "formal"))
+
+    def test_normalize_text(self):
+        """测试文本规范化"""
+        self.assertEqual(normalize_text(None), "")
+        self.assertEqual(normalize_text(" a\r\nb "), "a\nb")
+
+    def test_reuse_across_files_and_keys(self):
+        """测试不同文件、不同键名的相同文本复用缓存"""
+        config_path = os.path.join(self.temp_dir.name, "config.yaml")
+        with open(config_path, "w", encoding="utf-8") as f:
+            yaml.dump(
+                {
+                    "model_type": "DeepSeek",
+                    "model": "test-model",
+                    "use_cache": True,
+                    "cache_path": os.path.join(self.temp_dir.name, "cache.db"),
+                },
+                f,
+            )
+        config = LocalizationConfig(config_path)
+        translator = CountingTranslator(config)
+        with mock.patch.object(
+            TranslatorFactory, "create_translator", return_value=translator
+        ):
+            processor = LocalizationProcessor(config)
+
+        first = os.path.join(self.temp_dir.name, "first.json")
+        second = os.path.join(self.temp_dir.name, "second.json")
+        with open(first, "w", encoding="utf-8") as f:
+            json.dump({"ok_button": {"text": "确定", "comment": ""}}, f)
+        with open(second, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "confirm": {"text": "确定", "comment": ""},
+                    "cancel": {"text": "取消", "comment": ""},
+                },
+                f,
+            )
+
+        processor.generate_localization(first, ["en"], self.temp_dir.name, "formal")
+        processor.generate_localization(second, ["en"], self.temp_dir.name, "formal")
+
+        self.assertEqual(translator.calls, 2)
+        self.assertEqual(processor.cache.stats()["saved_requests"], 1)
+        with open(os.path.join(self.temp_dir.name, "en.json"), encoding="utf-8") as f:
+            self.assertEqual(json.load(f), {"confirm": "en:确定", "cancel": "en:取消"})
+        config.translation_cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+翻译记忆库测试文件
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+# 添加src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from src.translators.translation_memory import TranslationMemory
+
+
+class TestTranslationMemory(unittest.TestCase):
+    """翻译记忆库测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "translations.cache")
+
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+
+    def test_lazy_creation(self):
+        """测试未访问时不会创建数据库文件"""
+        TranslationMemory(self.db_path)
+        self.assertFalse(os.path.exists(self.db_path))
+
+    def test_upsert_is_visible_without_save(self):
+        """测试写入立即落盘，新实例无需 save 即可读取（模拟进程崩溃）"""
+        memory = TranslationMemory(self.db_path)
+        memory.put("k1", "Hello", source_hash="h1", lang="en", style="formal")
+        memory["k1"] = "Hello!"
+
+        reopened = TranslationMemory(self.db_path)
+        self.assertEqual(reopened.get("k1"), "Hello!")
+        self.assertIn("k1", reopened)
+        self.assertNotIn("k2", reopened)
+        self.assertEqual(len(reopened), 1)
+        memory.close()
+        reopened.close()
+
+    def test_lookup_by_source_hash(self):
+        """测试按原文摘要、语言、风格与模型查询"""
+        memory = TranslationMemory(self.db_path)
+        memory.put(
+            "k1", "Bonjour", source_hash="h1", lang="fr", style="formal", model="m"
+        )
+        memory.put(
+            "k2", "Hello", source_hash="h1", lang="en", style="formal", model="m"
+        )
+
+        self.assertEqual(memory.lookup("h1", "fr", "formal", "m"), "Bonjour")
+        self.assertIsNone(memory.lookup("h1", "fr", "casual", "m"))
+        memory.close()
+
+    def test_migrate_json_cache(self):
+        """测试首次访问时迁移旧版 JSON 缓存"""
+        with open(self.db_path, "w", encoding="utf-8") as f:
+            json.dump({"k1": "Hello", "broken": {"a": "b"}}, f)
+
+        memory = TranslationMemory(self.db_path)
+        self.assertEqual(memory["k1"], "Hello")
+        self.assertNotIn("broken", memory)
+        self.assertTrue(os.path.exists(self.db_path + ".json.bak"))
+        memory.close()
+
+        # 再次打开时不会重复迁移
+        self.assertEqual(TranslationMemory(self.db_path).get("k1"), "Hello")
+
+    def test_concurrent_readers(self):
+        """测试多线程并发读取"""
+        memory = TranslationMemory(self.db_path)
+        for i in range(50):
+            memory.put(f"k{i}", f"v{i}")
+
+        errors = []
+
+        def reader():
+            try:
+                for i in range(50):
+                    if memory.get(f"k{i}") != f"v{i}":
+                        errors.append(i)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        memory.close()
+
+    def test_close_all_closes_connections_of_other_threads(self):
+        """测试 close_all 关闭其他线程（例如常驻事件循环线程）打开的连接"""
+        memory = TranslationMemory(self.db_path)
+        memory.put("k1", "v1")
+        opened = []
+        ready, release = threading.Event(), threading.Event()
+
+        def worker():
+            opened.append(memory.connection)
+            ready.set()
+            release.wait()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        ready.wait()
+        memory.close_all()
+        release.set()
+        thread.join()
+
+        with self.assertRaises(sqlite3.ProgrammingError):
+            opened[0].execute("SELECT 1")
+        # 关闭后再次访问会重新打开连接
+        self.assertEqual(memory.get("k1"), "v1")
+        memory.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,19 +2,20 @@ import argparse
 import json
 import os
 import sys
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
-import pandas as pd
 import yaml
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from src.core.Localization import *
+from src.core.Localization import LocalizationConfig, LocalizationProcessor
 
 """
 BunnyLocalization.py 是一个基于多语言本地化工具的脚本，主要功能包括：
 
 配置文件加载：从 YAML 配置文件中读取配置信息。
 Excel 转 JSON：将 Excel 文件中的数据转换为指定的 JSON 格式。
+    只读取键、原文、注释三列；sheet_names 指定工作表（默认第一个，"*" 为全部），
+    direct_excel 为 true 时条目直接送入本地化流程，不生成中间 JSON 文件。
 本地化处理：根据配置文件中的设置，生成多语言本地化文件。
 命令行支持：通过命令行参数指定配置文件路径
 """
@@ -49,30 +50,297 @@ class Configuration:
             return yaml.safe_load(f)
 
 
-def excel_to_json(config: Configuration):
+def _cell_text(value: Any) -> str:
     """
-    将Excel文件转换为JSON文件。
+    把单元格的值转换为文本，空单元格为空字符串，整数值的浮点数不带小数部分。
 
     Args:
-        config (Configuration): 包含配置信息的Configuration对象。
+        value (Any): 读取到的单元格值。
+
+    Returns:
+        str: 单元格文本。
+    """
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _select_sheets(available: List[str], sheet_names: Union[str, List[str], None]):
+    """
+    按配置选择工作表。
+
+    Args:
+        available (List[str]): 工作簿中的工作表名称。
+        sheet_names (Union[str, List[str], None]): None 为第一个工作表，"*" 为全部工作表。
+
+    Returns:
+        Tuple[List[str], bool]: (要读取的工作表, 缺少键或原文列时是否报错)。
     """
-    # 读取Excel文件
+    if sheet_names is None:
+        return available[:1], True
+    if sheet_names == "*":
+        return available, False
+    names = [sheet_names] if isinstance(sheet_names, str) else list(sheet_names)
+    for name in names:
+        if name not in available:
+            raise ValueError(f"Sheet '{name}' not found in the Excel file.")
+    return names, True
+
+
+def _entries_from_columns(
+    keys: Iterator[Any], texts: Iterator[Any], comments: Iterator[Any]
+) -> Iterator[Tuple[str, Dict[str, str]]]:
+    """按列组合条目，键为空的行被跳过。"""
+    for key, text, comment in zip(keys, texts, comments):
+        key = _cell_text(key).strip()
+        if key:
+            yield key, {"text": _cell_text(text), "comment": _cell_text(comment)}
+
+
+def iter_excel_entries(
+    excel_file_path: str,
+    key_name: str,
+    value_name: str,
+    comment_name: Optional[str] = None,
+    sheet_names: Union[str, List[str], None] = None,
+) -> Iterator[Tuple[str, Dict[str, str]]]:
+    """
+    逐行读取 Excel 中的键、原文、注释三列。
+
+    .xlsx/.xlsm 使用 openpyxl 的只读模式逐行读取，其他格式（如 .xls）
+    交给 pandas 按列读取。
+
+    Args:
+        excel_file_path (str): Excel 文件路径。
+        key_name (str): 键所在列的表头。
+        value_name (str): 原文所在列的表头。
+        comment_name (Optional[str]): 注释所在列的表头，没有该列时注释为空。
+        sheet_names (Union[str, List[str], None]): 要读取的工作表，None 为第一个工作表，
+            "*" 为所有包含键与原文列的工作表。
+
+    Yields:
+        Tuple[str, Dict[str, str]]: (键, {"text": 原文, "comment": 注释})。
+    """
+    suffix = os.path.splitext(excel_file_path)[1].lower()
+    if suffix not in (".xlsx", ".xlsm"):
+        yield from _iter_excel_entries_pandas(
+            excel_file_path, key_name, value_name, comment_name, sheet_names
+        )
+        return
+
+    # openpyxl 导入较慢，只在需要时导入
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(excel_file_path, read_only=True, data_only=True)
+    try:
+        names, required = _select_sheets(workbook.sheetnames, sheet_names)
+        for name in names:
+            rows = workbook[name].iter_rows(values_only=True)
+            # 表头为第一个包含键列标题的行，其上方的空行或标题行被跳过，数据从表头的下一行开始
+            header = next(
+                (
+                    row
+                    for row in rows
+                    if any(
+                        value is not None and str(value).strip() == key_name
+                        for value in row
+                    )
+                ),
+                (),
+            )
+            columns = {
+                str(title).strip(): index
+                for index, title in enumerate(header)
+                if title is not None
+            }
+            if key_name not in columns or value_name not in columns:
+                if required:
+                    raise ValueError(
+                        f"Sheet '{name}' has no '{key_name}' or '{value_name}' column."
+                    )
+                continue
+            key_at, value_at = columns[key_name], columns[value_name]
+            comment_at = columns.get(comment_name)
+            for row in rows:
+                key = _cell_text(_cell(row, key_at)).strip()
+                if not key:
+                    continue
+                yield key, {
+                    "text": _cell_text(_cell(row, value_at)),
+                    "comment": _cell_text(_cell(row, comment_at)),
+                }
+    finally:
+        workbook.close()
+
+
+def _cell(row: tuple, index: Optional[int]) -> Any:
+    """行中指定列的值，列不存在或超出该行范围时为 None。"""
+    if index is None or index >= len(row):
+        return None
+    return row[index]
+
+
+def _iter_excel_entries_pandas(
+    excel_file_path: str,
+    key_name: str,
+    value_name: str,
+    comment_name: Optional[str],
+    sheet_names: Union[str, List[str], None],
+) -> Iterator[Tuple[str, Dict[str, str]]]:
+    """非 xlsx 格式的回退路径：pandas 只读取所需的列，按列而不是逐行构造条目。"""
+    # pandas 导入较慢，只在需要时导入
+    import pandas as pd
+
+    names, required = _select_sheets(
+        list(pd.ExcelFile(excel_file_path).sheet_names), sheet_names
+    )
+    wanted = {key_name, value_name, comment_name} - {None}
+    frames = pd.read_excel(
+        excel_file_path,
+        sheet_name=names,
+        usecols=lambda title: str(title).strip() in wanted,
+        dtype=object,
+    )
+    for name in names:
+        df = frames[name].rename(columns=lambda title: str(title).strip())
+        df = df.astype(object).where(df.notna(), None)
+        if key_name not in df.columns or value_name not in df.columns:
+            if required:
+                raise ValueError(
+                    f"Sheet '{name}' has no '{key_name}' or '{value_name}' column."
+                )
+            continue
+        comments = (
+            df[comment_name].tolist()
+            if comment_name in df.columns
+            else [None] * len(df)
+        )
+        yield from _entries_from_columns(
+            df[key_name].tolist(), df[value_name].tolist(), comments
+        )
+
+
+def _excel_entries(config: Configuration) -> Iterator[Tuple[str, Dict[str, str]]]:
+    """按配置逐行读取 Excel 中的条目，保留重复的键。"""
     excel_file_path = config.config["excel_file_path"]
     if not excel_file_path:
         raise ValueError("Excel file path not found in the configuration file.")
 
-    df = pd.read_excel(excel_file_path)
+    return iter_excel_entries(
+        excel_file_path,
+        config.config["key_name"],
+        config.config["value_name"],
+        config.config.get("comment_name"),
+        config.config.get("sheet_names"),
+    )
+
+
+def _warn_duplicates(keys: List[str]):
+    """打印被后面的行覆盖的重复键。"""
+    if keys:
+        print(
+            f"warning: {len(keys)} duplicate keys in excel, "
+            f"the last row of each is used: {', '.join(keys)}"
+        )
+
+
+def find_duplicate_keys(
+    entries: Iterator[Tuple[str, Dict[str, str]]],
+) -> Dict[str, Dict[str, str]]:
+    """
+    找出重复的键并打印警告，只保存重复键最后一行的条目。
+
+    Args:
+        entries (Iterator[Tuple[str, Dict[str, str]]]): 读取到的条目。
+
+    Returns:
+        Dict[str, Dict[str, str]]: {重复的键: 最后一行的条目}。
+    """
+    seen = set()
+    duplicates = {}
+    for key, entry in entries:
+        if key in seen:
+            duplicates[key] = entry
+        else:
+            seen.add(key)
+    _warn_duplicates(list(duplicates))
+    return duplicates
+
+
+def unique_entries(
+    entries: Iterator[Tuple[str, Dict[str, str]]],
+    duplicates: Dict[str, Dict[str, str]],
+) -> Iterator[Tuple[str, Dict[str, str]]]:
+    """
+    逐条去除重复的键，与转换为字典的结果一致：
+    键位于第一次出现的位置，内容取最后一行。
+
+    Args:
+        entries (Iterator[Tuple[str, Dict[str, str]]]): 读取到的条目。
+        duplicates (Dict[str, Dict[str, str]]): find_duplicate_keys 的结果。
+
+    Yields:
+        Tuple[str, Dict[str, str]]: 去除重复键后的条目。
+    """
+    emitted = set()
+    for key, entry in entries:
+        if key in duplicates:
+            if key in emitted:
+                continue
+            emitted.add(key)
+            entry = duplicates[key]
+        yield key, entry
+
+
+def iter_config_entries(
+    config: Configuration, duplicates: Optional[Dict[str, Dict[str, str]]] = None
+) -> Iterator[Tuple[str, Dict[str, str]]]:
+    """
+    按配置流式读取 Excel 中的条目，重复的键以最后一行为准。
 
-    # 转换为字典结构
+    Args:
+        config (Configuration): 包含配置信息的Configuration对象。
+        duplicates (Optional[Dict[str, Dict[str, str]]]): 预先找出的重复键
+            （find_duplicate_keys），为 None 时先读取一遍文件查找。
+
+    Yields:
+        Tuple[str, Dict[str, str]]: (键, {"text": 原文, "comment": 注释})。
+    """
+    if duplicates is None:
+        duplicates = find_duplicate_keys(_excel_entries(config))
+    yield from unique_entries(_excel_entries(config), duplicates)
+
+
+def read_excel_entries(config: Configuration) -> Dict[str, Dict[str, str]]:
+    """
+    按配置读取 Excel 中的全部条目，重复的键以最后一行为准并打印警告。
+
+    Args:
+        config (Configuration): 包含配置信息的Configuration对象。
+
+    Returns:
+        Dict[str, Dict[str, str]]: {键: {"text": 原文, "comment": 注释}}。
+    """
     result = {}
-    for _, row in df.iterrows():
-        key = row[config.config["key_name"]]
-        result[key] = {
-            "text": str(row[config.config["value_name"]]),
-            "comment": str(
-                row.get(config.config["comment_name"], "")
-            ),  # 假设可能有"comment"列，没有则留空
-        }
+    duplicates = {}
+    for key, entry in _excel_entries(config):
+        if key in result:
+            duplicates[key] = None
+        result[key] = entry
+    _warn_duplicates(list(duplicates))
+    return result
+
+
+def excel_to_json(config: Configuration):
+    """
+    将Excel文件转换为JSON文件。
+
+    Args:
+        config (Configuration): 包含配置信息的Configuration对象。
+    """
+    result = read_excel_entries(config)
 
     # 保存为JSON文件
     out_json_path = config.config["out_json_path"]
@@ -94,20 +362,53 @@ def main():
     parser.add_argument(
         "--config_model", default="config.yaml", help="Config file path"
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Max in-flight requests per provider (default: config 'concurrency' or 1)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        default=None,
+        help="Only translate keys added or changed since the last run",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        default=None,
+        help="Resume an interrupted run from the job journal in the output directory",
+    )
     args = parser.parse_args()
 
     # 加载配置文件
     config = Configuration(args.config)
-    if not config.config["skip_file_transfor"]:
+    # direct_excel：Excel 条目直接送入本地化流程，不生成中间 JSON 文件
+    direct_excel = config.config.get("direct_excel", False)
+    if not direct_excel and not config.config["skip_file_transfor"]:
         excel_to_json(config)
 
     # 加载本地化配置并执行本地化处理
     config_model = LocalizationConfig(args.config_model)
-    processor = LocalizationProcessor(config_model)
+    processor = LocalizationProcessor(
+        config_model,
+        concurrency=args.concurrency,
+        incremental=args.incremental,
+        resume=args.resume,
+    )
+    source_path = config_model.get_config("source")
+    if direct_excel:
+        # 任务日志按源路径区分任务，直接读取 Excel 时使用 Excel 文件路径；
+        # 每次读取都重新流式解析文件，不在内存中保存全部条目
+        source_path = config.config["excel_file_path"]
+        # 重复的键只在开始时查找并警告一次，之后每次读取按其去重
+        duplicates = find_duplicate_keys(_excel_entries(config))
+        processor.source_reader = lambda _: iter_config_entries(config, duplicates)
 
     try:
         processor.generate_localization(
-            source_path=config_model.get_config("source"),
+            source_path=source_path,
             target_langs=config_model.get_config("target_languages"),
             output_dir=config_model.get_config("output"),
             style=config_model.get_config("translation_style", "formal"),
@@ -0,0 +1,287 @@
+import argparse
+import csv
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import yaml
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.mock_llm_server import LatencyModel, MockLLMServer
+
+"""
+benchmark.py 是端到端吞吐量压测脚本，在本地模拟服务上运行完整的命令行流程：
+
+启动 mock_llm_server 的模拟服务，生成指定规模的合成数据，
+依次以子进程运行 main.py（JSON）、csv_main.py（CSV）与 tools/BunnyLocalization.py（Excel）的工作负载，
+汇总每个工作负载的吞吐量（条/秒）、请求延迟 p50/p95、请求数与 429 次数
+"""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKLOADS = ("json", "csv", "bunny")
+
+
+def synthetic_entries(count: int) -> Dict[str, dict]:
+    """生成合成的源文本，约十分之一的文本重复出现，接近真实目录中的重复率"""
+    return {
+        f"key_{i:07d}": {
+            "text": f"第{i % max(1, count - count // 10)}条测试文本",
+            "comment": "按钮" if i % 3 == 0 else "",
+        }
+        for i in range(count)
+    }
+
+
+class Benchmark:
+    """在模拟服务上运行各工作负载并收集指标"""
+
+    def __init__(self, server: MockLLMServer, args):
+        self.server = server
+        self.args = args
+        self.langs = [lang.strip() for lang in args.languages.split(",") if lang]
+        self.entries = synthetic_entries(args.strings)
+
+    def _model_config(self, work_dir: str, **extra) -> str:
+        base_url = (
+            self.server.ark_base_url
+            if self.args.provider == "Doubao"
+            else self.server.base_url
+        )
+        config = {
+            "model_type": self.args.provider,
+            "model": "mock-model",
+            "base_url": base_url,
+            "api_key": "mock-key",
+            "system_prompt": "你是一个专业的翻译助手。",
+            "cache_path": os.path.join(work_dir, "translations.cache"),
+            "target_languages": self.langs,
+            "rate_limit": 1000000,
+            "rate_limit_shared": False,
+            "batch_size": self.args.batch_size,
+            "concurrency": self.args.concurrency,
+            "retry_base_delay": 0.05,
+        }
+        config.update(extra)
+        path = os.path.join(work_dir, "model_config.yaml")
+        with open(path, "w", encoding="utf-8") as f:
+            yaml.dump(config, f, allow_unicode=True)
+        return path
+
+    def _write_json(self, work_dir: str) -> str:
+        path = os.path.join(work_dir, "source.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        return path
+
+    def _command(self, workload: str, work_dir: str) -> List[str]:
+        output = os.path.join(work_dir, "output")
+        if workload == "json":
+            config = self._model_config(work_dir)
+            source = self._write_json(work_dir)
+            return [
+                sys.executable,
+                "main.py",
+                "-s",
+                source,
+                "-o",
+                output,
+                "--config",
+                config,
+            ]
+        if workload == "csv":
+            config = self._model_config(work_dir)
+            source = os.path.join(work_dir, "source.csv")
+            with open(source, "w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["ID", "zh-CN", "Comment"] + self.langs)
+                for key, value in self.entries.items():
+                    writer.writerow(
+                        [key, value["text"], value["comment"]] + [""] * len(self.langs)
+                    )
+            return [
+                sys.executable,
+                "csv_main.py",
+                "-s",
+                source,
+                "-o",
+                output,
+                "--config",
+                config,
+            ]
+
+        # BunnyLocalization：Excel 转 JSON 后本地化
+        source = os.path.join(work_dir, "source.json")
+        excel = os.path.join(work_dir, "source.xlsx")
+        try:
+            import pandas as pd
+
+            pd.DataFrame(
+                [
+                    {"key": key, "value": value["text"], "comment": value["comment"]}
+                    for key, value in self.entries.items()
+                ]
+            ).to_excel(excel, index=False)
+            skip = False
+        except ImportError:
+            # 没有安装 openpyxl 时跳过 Excel 转换，只压测本地化部分
+            self._write_json(work_dir)
+            skip = True
+        config = self._model_config(work_dir, source=source, output=output)
+        bunny_config = os.path.join(work_dir, "bunny_config.yaml")
+        with open(bunny_config, "w", encoding="utf-8") as f:
+            yaml.dump(
+                {
+                    "skip_file_transfor": skip,
+                    "excel_file_path": excel,
+                    "key_name": "key",
+                    "value_name": "value",
+                    "comment_name": "comment",
+                    "out_json_path": source,
+                },
+                f,
+            )
+        return [
+            sys.executable,
+            os.path.join("tools", "BunnyLocalization.py"),
+            "--config",
+            bunny_config,
+            "--config_model",
+            config,
+        ]
+
+    def run(self, workload: str) -> dict:
+        with tempfile.TemporaryDirectory() as work_dir:
+            command = self._command(workload, work_dir)
+            self.server.stats.reset()
+            started = time.perf_counter()
+            completed = subprocess.run(
+                command,
+                cwd=ROOT,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                encoding="utf-8",
+            )
+            elapsed = time.perf_counter() - started
+        stats = self.server.stats.snapshot()
+        if completed.returncode != 0 and self.args.verbose is False:
+            print(completed.stdout[-2000:])
+        if self.args.verbose:
+            print(completed.stdout)
+        strings = len(self.entries) * len(self.langs)
+        return {
+            "workload": workload,
+            "returncode": completed.returncode,
+            "strings": strings,
+            "seconds": round(elapsed, 3),
+            "strings_per_sec": round(strings / elapsed, 1) if elapsed else None,
+            "requests": stats["requests"],
+            "throttled": stats["throttled"],
+            "p50_latency": stats["p50_latency"],
+            "p95_latency": stats["p95_latency"],
+            "prompt_tokens": stats["prompt_tokens"],
+            "completion_tokens": stats["completion_tokens"],
+        }
+
+
+def format_table(results: List[dict]) -> str:
+    columns = [
+        ("workload", "workload"),
+        ("strings", "strings"),
+        ("seconds", "seconds"),
+        ("strings_per_sec", "strings/s"),
+        ("requests", "requests"),
+        ("throttled", "429"),
+        ("p50_latency", "p50(s)"),
+        ("p95_latency", "p95(s)"),
+    ]
+    rows = [[title for _, title in columns]] + [
+        [str(result[key]) for key, _ in columns] for result in results
+    ]
+    widths = [max(len(row[i]) for row in rows) for i in range(len(columns))]
+    return "\n".join(
+        "  ".join(cell.rjust(width) for cell, width in zip(row, widths)) for row in rows
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="End-to-end throughput benchmark against the offline mock server"
+    )
+    parser.add_argument(
+        "--workloads",
+        default=",".join(WORKLOADS),
+        help="Comma separated workloads: json, csv, bunny",
+    )
+    parser.add_argument(
+        "--provider",
+        choices=["DeepSeek", "Kimi", "TongYi", "TongYiQwen", "Doubao"],
+        default="DeepSeek",
+        help="model_type used by the generated config",
+    )
+    parser.add_argument("--strings", type=int, default=500, help="Source strings")
+    parser.add_argument(
+        "--languages", default="en,ja,fr", help="Comma separated target languages"
+    )
+    parser.add_argument("--batch-size", type=int, default=20, help="Items per request")
+    parser.add_argument("--concurrency", type=int, default=8, help="In-flight requests")
+    parser.add_argument(
+        "--latency",
+        choices=["fixed", "uniform", "lognormal"],
+        default="lognormal",
+        help="Mock server latency distribution",
+    )
+    parser.add_argument(
+        "--latency-ms", type=float, default=100, help="Mean latency in milliseconds"
+    )
+    parser.add_argument(
+        "--spread",
+        type=float,
+        default=0.5,
+        help="Half-width in ms for uniform, log standard deviation for lognormal",
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Probability of a 429 response"
+    )
+    parser.add_argument(
+        "--rpm-limit", type=int, default=0, help="Mock server requests per minute"
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--json", help="Write the results to this JSON file")
+    parser.add_argument(
+        "--verbose", action="store_true", help="Print the output of each workload"
+    )
+    args = parser.parse_args()
+
+    spread = args.spread / 1000 if args.latency == "uniform" else args.spread
+    latency = LatencyModel(args.latency, args.latency_ms / 1000, spread, args.seed)
+    results = []
+    with MockLLMServer(
+        latency=latency,
+        error_rate=args.error_rate,
+        rpm_limit=args.rpm_limit,
+        retry_after=0.2,
+        seed=args.seed,
+    ) as server:
+        benchmark = Benchmark(server, args)
+        for workload in args.workloads.split(","):
+            workload = workload.strip()
+            if workload not in WORKLOADS:
+                raise ValueError(f"Unknown workload: {workload}")
+            print(f"running {workload} ...")
+            results.append(benchmark.run(workload))
+
+    print(format_table(results))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    if any(result["returncode"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+import argparse
+import json
+import math
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+"""
+importtime.py 用 `python -X importtime` 测量各入口的导入耗时：
+
+每个入口在新的解释器中导入多次取最小值，与 `tools/importtime_budget.json` 中的预算比较，
+并检查入口是否提前导入了只有部分功能才需要的重量级依赖（提供商 SDK、pandas 等）。
+超出预算或导入了禁止的依赖时返回非零退出码
+"""
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "importtime_budget.json"
+)
+
+# 入口名称 -> 被导入的模块
+ENTRY_POINTS = {
+    "main": "main",
+    "csv_main": "csv_main",
+    "gui_main": "gui_main",
+    "bunny": "tools.BunnyLocalization",
+}
+
+# 启动时不应导入的依赖：只在使用对应提供商或功能时才导入
+HEAVY_MODULES = ["openai", "volcenginesdkarkruntime", "httpx", "pandas", "openpyxl"]
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def parse_importtime(output: str, module: str) -> Tuple[Optional[int], List[str]]:
+    """
+    解析 -X importtime 的输出
+
+    返回:
+    Tuple[Optional[int], List[str]]: (module 的累计导入耗时（微秒），导入过的全部模块名)
+    """
+    cumulative = None
+    modules = []
+    for line in output.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        name = match.group(4)
+        modules.append(name)
+        # 顶层（缩进最少）的同名记录即为该入口的累计耗时
+        if name == module and len(match.group(3)) == 1:
+            cumulative = int(match.group(2))
+    return cumulative, modules
+
+
+def heavy_imports(modules: List[str], allowed: List[str] = ()) -> List[str]:
+    """导入过的重量级依赖（按顶层包名），allowed 中的依赖除外"""
+    found = {name.split(".")[0] for name in modules}
+    return [name for name in HEAVY_MODULES if name in found and name not in allowed]
+
+
+def measure(module: str, repeat: int = 5) -> dict:
+    """
+    在新的解释器中导入 module，返回 {"ms": 最小累计耗时, "modules": 导入的模块}；
+    入口依赖的包未安装时返回 {"error": 错误信息}
+    """
+    best = None
+    modules = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            lines = result.stderr.strip().splitlines()
+            return {"error": lines[-1] if lines else f"exit {result.returncode}"}
+        cumulative, modules = parse_importtime(result.stderr, module)
+        if cumulative is not None and (best is None or cumulative < best):
+            best = cumulative
+    return {
+        "ms": round(best / 1000, 1) if best is not None else None,
+        "modules": modules,
+    }
+
+
+def check(
+    results: Dict[str, dict], budgets: Dict[str, dict], tolerance: float = 1.0
+) -> List[str]:
+    """与预算比较，返回超出预算或导入了重量级依赖的入口说明"""
+    failures = []
+    for name, result in results.items():
+        if "error" in result:
+            continue
+        budget = budgets.get(name, {})
+        limit = budget.get("budget_ms")
+        if limit is not None and result["ms"] is not None:
+            if result["ms"] > limit * tolerance:
+                failures.append(f"{name}: {result['ms']}ms > budget {limit}ms")
+        heavy = heavy_imports(result["modules"], budget.get("allow", []))
+        if heavy:
+            failures.append(f"{name}: imports {', '.join(heavy)} at startup")
+    return failures
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure the import time of each entry point against a budget"
+    )
+    parser.add_argument(
+        "--entries",
+        default=",".join(ENTRY_POINTS),
+        help="Comma separated entry points: " + ", ".join(ENTRY_POINTS),
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per entry point")
+    parser.add_argument("--budget", default=BUDGET_PATH, help="Budget JSON file")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1.0,
+        help="Factor applied to the budgets, e.g. 1.5 on slower machines",
+    )
+    parser.add_argument(
+        "--update-budget",
+        action="store_true",
+        help="Store 1.5x the measured times (rounded up to 10ms) as the new budgets",
+    )
+    args = parser.parse_args(argv)
+
+    entries = [entry.strip() for entry in args.entries.split(",") if entry.strip()]
+    for entry in entries:
+        if entry not in ENTRY_POINTS:
+            raise ValueError(f"Unknown entry point: {entry}")
+
+    budgets = {}
+    if os.path.exists(args.budget):
+        with open(args.budget, "r", encoding="utf-8") as f:
+            budgets = json.load(f)
+
+    results = {}
+    for entry in entries:
+        results[entry] = measure(ENTRY_POINTS[entry], args.repeat)
+        result = results[entry]
+        if "error" in result:
+            print(f"{entry:10s} skipped ({result['error']})")
+        else:
+            limit = budgets.get(entry, {}).get("budget_ms", "-")
+            print(f"{entry:10s} {result['ms']:8.1f}ms  budget {limit}ms")
+
+    if args.update_budget:
+        for entry, result in results.items():
+            if result.get("ms") is not None:
+                budgets.setdefault(entry, {})["budget_ms"] = int(
+                    math.ceil(result["ms"] * 1.5 / 10) * 10
+                )
+        with open(args.budget, "w", encoding="utf-8") as f:
+            json.dump(budgets, f, indent=2)
+        print(f"budget updated: {args.budget}")
+        return 0
+
+    failures = check(results, budgets, args.tolerance)
+    for failure in failures:
+        print(f"OVER BUDGET {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
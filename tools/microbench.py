@@ -0,0 +1,415 @@
+import argparse
+import csv
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Tuple
+
+import yaml
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core.csv_processor import CSVProcessor
+from src.core.json_stream import JsonObjectWriter, iter_json_object
+from src.translators.BaseTranslator import BaseTranslator, LocalizationConfig
+from src.translators.translation_cache import TranslationCache
+
+"""
+microbench.py 是本地热路径的微基准测试，不发起任何网络请求：
+
+用合成的目录（1k/100k 个键、10 种语言）分别测量各阶段的耗时与 Python 堆内存峰值，
+包括缓存写入与读取、缓存键计算、JSON 流式读写、CSV 读取与 CSVProcessor 全流程、
+Excel 转 JSON（tools/BunnyLocalization.py）以及多语言输出合并（tools/json_to_csv.py）。
+结果可与保存的基线比较，超出容差时返回非零退出码，用于发现性能回退
+"""
+
+LANGUAGES = ["en", "ja", "ko", "de", "fr", "es", "it", "ru", "zh-TW", "pt"]
+# CSVProcessor 只识别其支持的语言列
+CSV_LANGUAGES = [lang for lang in LANGUAGES if lang in CSVProcessor.SUPPORTED_LANGUAGES]
+# 翻译记忆库每次写入都会提交，缓存写入阶段在更大规模下耗时过长，只提供有基线的两种规模
+SIZES = {"1k": 1_000, "100k": 100_000}
+BASELINE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "microbench_baselines.json"
+)
+
+
+class EchoTranslator(BaseTranslator):
+    """立即返回的本地翻译器，只测量翻译请求之外的开销"""
+
+    def _create_completion(self, payload: dict):
+        content = f"[{payload['lang']}] {payload['text']}"
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=None,
+        )
+
+    def _build_payload(self, text, target_lang, style, comment):
+        return {"text": text, "lang": target_lang}
+
+
+class Workspace:
+    """一个规模的合成数据，文件在首次使用时生成，生成时间不计入测量"""
+
+    def __init__(self, root: str, size: int):
+        self.root = root
+        self.size = size
+        self._files: Dict[str, str] = {}
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    def entries(self):
+        for i in range(self.size):
+            yield f"key_{i:07d}", {
+                "text": f"第{i}条测试文本，包含一些常见的界面用语",
+                "comment": "按钮" if i % 3 == 0 else "",
+            }
+
+    def _once(self, name: str, build: Callable[[str], None]) -> str:
+        if name not in self._files:
+            path = self.path(name)
+            build(path)
+            self._files[name] = path
+        return self._files[name]
+
+    def source_json(self) -> str:
+        def build(path):
+            with JsonObjectWriter(path) as writer:
+                for key, value in self.entries():
+                    writer.write(key, value)
+
+        return self._once("source.json", build)
+
+    def source_csv(self) -> str:
+        def build(path):
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["ID", "zh-CN", "Comment"] + CSV_LANGUAGES)
+                for key, value in self.entries():
+                    writer.writerow(
+                        [key, value["text"], value["comment"]]
+                        + [""] * len(CSV_LANGUAGES)
+                    )
+
+        return self._once("source.csv", build)
+
+    def source_excel(self) -> str:
+        def build(path):
+            import pandas as pd
+
+            pd.DataFrame(
+                [
+                    {"key": key, "value": value["text"], "comment": value["comment"]}
+                    for key, value in self.entries()
+                ]
+            ).to_excel(path, index=False)
+
+        return self._once("source.xlsx", build)
+
+    def outputs(self) -> str:
+        def build(path):
+            os.makedirs(path)
+            for lang in LANGUAGES:
+                with JsonObjectWriter(os.path.join(path, f"{lang}.json")) as writer:
+                    for key, value in self.entries():
+                        writer.write(key, f"[{lang}] {value['text']}")
+
+        return self._once("outputs", build)
+
+    def model_config(self, name: str) -> str:
+        """每次调用生成独立的缓存文件，避免上一轮测量的数据影响下一轮"""
+        path = self.path(f"{name}.yaml")
+        with open(path, "w", encoding="utf-8") as f:
+            yaml.dump(
+                {
+                    "model_type": "DeepSeek",
+                    "model": "bench-model",
+                    "api_key": "bench-key",
+                    "cache_path": self.path(f"{name}.cache"),
+                    "rate_limit": 10**9,
+                    "rate_limit_shared": False,
+                    "multi_target": False,
+                },
+                f,
+            )
+        return path
+
+
+def _cache(config: LocalizationConfig) -> TranslationCache:
+    return TranslationCache(config.translation_cache, "bench-model", "bench", True)
+
+
+def _items(ws: Workspace):
+    for _, value in ws.entries():
+        for lang in LANGUAGES:
+            yield value["text"], value["comment"], lang
+
+
+# 每个阶段由 prepare（不计时）与 run 组成，prepare 的返回值作为 run 的参数
+def prepare_nothing(ws: Workspace, run_index: int):
+    return None
+
+
+def run_cache_key(ws: Workspace, _):
+    """翻译缓存的键计算（TranslationCache.make_key），每次查询与写入都会调用"""
+    cache = TranslationCache(None, "bench-model", "bench")
+    for text, comment, lang in _items(ws):
+        cache.make_key(text, comment, lang, "formal")
+
+
+def prepare_cache_save(ws: Workspace, run_index: int):
+    return LocalizationConfig(ws.model_config(f"cache_save_{run_index}"))
+
+
+def run_cache_save(ws: Workspace, config: LocalizationConfig):
+    cache = _cache(config)
+    for text, comment, lang in _items(ws):
+        cache.put(text, comment, lang, "formal", f"[{lang}] {text}")
+    config.save_cache()
+    config.translation_cache.close()
+
+
+def prepare_cache_load(ws: Workspace, run_index: int):
+    path = ws.model_config(f"cache_load_{run_index}")
+    config = LocalizationConfig(path)
+    run_cache_save(ws, config)
+    return path
+
+
+def run_cache_load(ws: Workspace, path: str):
+    config = LocalizationConfig(path)
+    cache = _cache(config)
+    for text, comment, lang in _items(ws):
+        cache.get(text, comment, lang, "formal")
+    config.translation_cache.close()
+
+
+def prepare_json_read(ws: Workspace, run_index: int):
+    return ws.source_json()
+
+
+def run_json_read(ws: Workspace, path: str):
+    for _ in iter_json_object(path):
+        pass
+
+
+def run_json_write(ws: Workspace, run_index):
+    with JsonObjectWriter(ws.path(f"write_{run_index}.json")) as writer:
+        for key, value in ws.entries():
+            writer.write(key, value)
+
+
+def prepare_csv_read(ws: Workspace, run_index: int):
+    return CSVProcessor(ws.model_config(f"csv_read_{run_index}")), ws.source_csv()
+
+
+def run_csv_read(ws: Workspace, args):
+    processor, path = args
+    headers = processor.read_headers(path)
+    _, id_idx, _, _ = processor.detect_languages(headers)
+    for _ in processor.iter_rows(path, id_idx):
+        pass
+    processor.config.translation_cache.close()
+
+
+def prepare_csv_process(ws: Workspace, run_index: int):
+    processor = CSVProcessor(ws.model_config(f"csv_process_{run_index}"))
+    processor.translator = EchoTranslator(processor.config)
+    return processor, ws.source_csv(), ws.path(f"csv_out_{run_index}")
+
+
+def run_csv_process(ws: Workspace, args):
+    processor, path, output = args
+    processor.process_file(path, output)
+    processor.config.translation_cache.close()
+
+
+def prepare_excel_to_json(ws: Workspace, run_index: int):
+    return SimpleNamespace(
+        config={
+            "excel_file_path": ws.source_excel(),
+            "key_name": "key",
+            "value_name": "value",
+            "comment_name": "comment",
+            "out_json_path": ws.path(f"excel_{run_index}.json"),
+        }
+    )
+
+
+def run_excel_to_json(ws: Workspace, configuration):
+    from tools.BunnyLocalization import excel_to_json
+
+    excel_to_json(configuration)
+
+
+def prepare_json_merge(ws: Workspace, run_index: int):
+    return ws.source_json(), ws.outputs()
+
+
+def run_json_merge(ws: Workspace, args):
+    from tools.json_to_csv import merge_outputs
+
+    merge_outputs(*args)
+
+
+STAGES: List[Tuple[str, Callable, Callable]] = [
+    ("cache_key", prepare_nothing, run_cache_key),
+    ("cache_save", prepare_cache_save, run_cache_save),
+    ("cache_load", prepare_cache_load, run_cache_load),
+    ("json_read", prepare_json_read, run_json_read),
+    ("json_write", lambda ws, run_index: run_index, run_json_write),
+    ("csv_read", prepare_csv_read, run_csv_read),
+    ("csv_process", prepare_csv_process, run_csv_process),
+    ("excel_to_json", prepare_excel_to_json, run_excel_to_json),
+    ("json_merge", prepare_json_merge, run_json_merge),
+]
+
+
+def measure(ws: Workspace, prepare: Callable, run: Callable) -> dict:
+    """分两次运行：一次只计时，一次用 tracemalloc 统计 Python 堆内存峰值"""
+    args = prepare(ws, 0)
+    gc.collect()
+    started = time.perf_counter()
+    run(ws, args)
+    seconds = time.perf_counter() - started
+
+    args = prepare(ws, 1)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run(ws, args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": round(seconds, 4), "peak_mb": round(peak / 2**20, 2)}
+
+
+def run_suite(sizes: List[str], stages: List[str]) -> Dict[str, Dict[str, dict]]:
+    results = {}
+    selected = [stage for stage in STAGES if stage[0] in stages]
+    for size in sizes:
+        results[size] = {}
+        with tempfile.TemporaryDirectory() as root:
+            ws = Workspace(root, SIZES[size])
+            for name, prepare, run in selected:
+                # 各阶段会打印进度信息，测量期间屏蔽标准输出
+                with open(os.devnull, "w") as devnull:
+                    stdout, sys.stdout = sys.stdout, devnull
+                    try:
+                        result = measure(ws, prepare, run)
+                    finally:
+                        sys.stdout = stdout
+                results[size][name] = result
+                print(
+                    f"{size:>5} {name:<14} {result['seconds']:>10.4f}s "
+                    f"{result['peak_mb']:>10.2f}MB"
+                )
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, dict]],
+    baselines: Dict[str, Dict[str, dict]],
+    time_tolerance: float,
+    memory_tolerance: float,
+) -> List[str]:
+    """
+    与基线比较，返回回退的阶段说明
+
+    耗时超过基线的 time_tolerance 倍（且多出 50ms 以上）或内存峰值超过
+    基线的 memory_tolerance 倍（且多出 1MB 以上）视为回退
+    """
+    regressions = []
+    for size, stages in results.items():
+        for name, result in stages.items():
+            baseline = baselines.get(size, {}).get(name)
+            if baseline is None:
+                continue
+            if (
+                result["seconds"] > baseline["seconds"] * time_tolerance
+                and result["seconds"] - baseline["seconds"] > 0.05
+            ):
+                regressions.append(
+                    f"{size} {name}: {result['seconds']}s > baseline {baseline['seconds']}s"
+                )
+            if (
+                result["peak_mb"] > baseline["peak_mb"] * memory_tolerance
+                and result["peak_mb"] - baseline["peak_mb"] > 1
+            ):
+                regressions.append(
+                    f"{size} {name}: {result['peak_mb']}MB > baseline {baseline['peak_mb']}MB"
+                )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Micro-benchmarks for the local hot paths (no network)"
+    )
+    parser.add_argument(
+        "--sizes", default="1k", help="Comma separated catalog sizes: 1k, 100k"
+    )
+    parser.add_argument(
+        "--stages",
+        default=",".join(name for name, _, _ in STAGES),
+        help="Comma separated stages to run",
+    )
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store the results as the new baseline for the measured sizes",
+    )
+    parser.add_argument(
+        "--time-tolerance",
+        type=float,
+        default=2.0,
+        help="Allowed slowdown factor before a stage counts as a regression",
+    )
+    parser.add_argument(
+        "--memory-tolerance",
+        type=float,
+        default=1.5,
+        help="Allowed peak memory growth factor",
+    )
+    parser.add_argument("--json", help="Write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    sizes = [size.strip().lower() for size in args.sizes.split(",") if size.strip()]
+    for size in sizes:
+        if size not in SIZES:
+            raise ValueError(f"Unknown size: {size}")
+    stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    results = run_suite(sizes, stages)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baselines = json.load(f)
+
+    if args.update_baseline:
+        for size, stage_results in results.items():
+            baselines.setdefault(size, {}).update(stage_results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2)
+        print(f"baseline updated: {args.baseline}")
+        return 0
+
+    regressions = compare(
+        results, baselines, args.time_tolerance, args.memory_tolerance
+    )
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,379 @@
+import argparse
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.translators.rate_limiter import estimate_tokens
+
+"""
+mock_llm_server.py 是一个离线的大模型服务替身，用于在没有 API Key 的情况下测试与压测：
+
+协议兼容：实现 OpenAI 兼容的 chat/completions 接口（/v1、/compatible-mode/v1 与方舟的 /api/v3 前缀），
+支持单条、批量（JSON 数组）与多目标语言请求，以及通义千问机翻模型的 translation_options。
+延迟模拟：固定、均匀分布或对数正态分布的响应延迟。
+限流模拟：按概率或按每分钟请求数返回 429 与 Retry-After。
+用量统计：按请求返回 usage，并在 GET /stats 汇总请求数、429 次数、token 数与延迟分位数
+"""
+
+_SINGLE = re.compile(r"直接翻译为(.+?):\s(.*)$", re.S)
+_BATCH_LANG = re.compile(r"直接翻译为(.+?)(?:（|，)")
+_MULTI_LANGS = re.compile(r"分别直接翻译为以下语言：(.+?)(?:（|。)")
+
+
+def translate(lang: str, text: str) -> str:
+    """模拟译文：在原文前加上目标语言标记，便于校验结果"""
+    return f"[{lang}] {text}"
+
+
+def _message(messages: List[dict], role: str) -> str:
+    for message in reversed(messages):
+        if message.get("role") == role:
+            return message.get("content") or ""
+    return ""
+
+
+def respond(body: dict) -> str:
+    """根据请求体生成模拟的模型输出"""
+    messages = body.get("messages") or []
+    user = _message(messages, "user")
+    system = _message(messages, "system")
+
+    options = body.get("translation_options")
+    if options:
+        return translate(options.get("target_lang", ""), user)
+
+    try:
+        rows = json.loads(user)
+    except ValueError:
+        rows = None
+    if isinstance(rows, list) and all(isinstance(row, dict) for row in rows):
+        multi = _MULTI_LANGS.search(system)
+        if multi:
+            langs = [lang.strip() for lang in multi.group(1).split(",")]
+            result = {
+                row["id"]: {lang: translate(lang, row["text"]) for lang in langs}
+                for row in rows
+            }
+        else:
+            match = _BATCH_LANG.search(system)
+            lang = match.group(1) if match else ""
+            result = {row["id"]: translate(lang, row["text"]) for row in rows}
+        return json.dumps(result, ensure_ascii=False)
+
+    match = _SINGLE.search(user)
+    if match:
+        return translate(match.group(1), match.group(2))
+    return translate("", user)
+
+
+class LatencyModel:
+    """响应延迟分布，单位为秒"""
+
+    def __init__(
+        self,
+        distribution: str = "fixed",
+        mean: float = 0.0,
+        spread: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        if distribution not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unsupported latency distribution: {distribution}")
+        self.distribution = distribution
+        self.mean = mean
+        self.spread = spread
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        with self._lock:
+            if self.distribution == "uniform":
+                return max(
+                    0.0,
+                    self.rng.uniform(self.mean - self.spread, self.mean + self.spread),
+                )
+            if self.distribution == "lognormal" and self.mean > 0:
+                # spread 为对数标准差，均值保持为 mean
+                sigma = self.spread
+                mu = math.log(self.mean) - sigma * sigma / 2
+                return self.rng.lognormvariate(mu, sigma)
+            return self.mean
+
+
+class ServerStats:
+    """服务端统计：请求数、429 次数、token 数与每个请求的处理时间"""
+
+    def __init__(self):
+        self.requests = 0
+        self.throttled = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latencies: List[float] = []
+        self.models: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, prompt: int, completion: int, latency: float):
+        with self._lock:
+            self.requests += 1
+            self.prompt_tokens += prompt
+            self.completion_tokens += completion
+            self.latencies.append(latency)
+            self.models[model] = self.models.get(model, 0) + 1
+
+    def record_throttled(self):
+        with self._lock:
+            self.requests += 1
+            self.throttled += 1
+
+    def reset(self):
+        with self._lock:
+            self.requests = self.throttled = 0
+            self.prompt_tokens = self.completion_tokens = 0
+            self.latencies = []
+            self.models = {}
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            latencies = sorted(self.latencies)
+            return {
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "p50_latency": percentile(latencies, 50),
+                "p95_latency": percentile(latencies, 95),
+                "models": dict(self.models),
+            }
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """最近秩法计算分位数，输入需已排序"""
+    if not sorted_values:
+        return None
+    rank = max(0, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1)
+    return round(sorted_values[min(rank, len(sorted_values) - 1)], 4)
+
+
+class MockLLMServer:
+    """
+    离线大模型服务
+
+    可以在进程内启动（测试与压测），也可以通过命令行单独运行
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: LatencyModel = None,
+        error_rate: float = 0.0,
+        rpm_limit: int = 0,
+        retry_after: float = 1.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        初始化模拟服务
+
+        参数:
+        host (str): 监听地址
+        port (int): 监听端口，0 表示自动分配
+        latency (LatencyModel): 响应延迟分布
+        error_rate (float): 随机返回 429 的概率
+        rpm_limit (int): 每分钟请求数上限，超过后返回 429，0 表示不限制
+        retry_after (float): 429 响应中的 Retry-After 秒数
+        seed (int): 随机种子
+        """
+        self.latency = latency or LatencyModel()
+        self.error_rate = error_rate
+        self.rpm_limit = rpm_limit
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.stats = ServerStats()
+        self._window: List[float] = []
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def ark_base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/api/v3"
+
+    def _throttle(self) -> bool:
+        """是否对本次请求返回 429"""
+        with self._lock:
+            if self.error_rate and self.rng.random() < self.error_rate:
+                return True
+            if not self.rpm_limit:
+                return False
+            now = time.monotonic()
+            self._window = [t for t in self._window if now - t < 60.0]
+            if len(self._window) >= self.rpm_limit:
+                return True
+            self._window.append(now)
+            return False
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: dict, headers: dict = None):
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path.rstrip("/") == "/stats":
+                    self._send(200, server.stats.snapshot())
+                else:
+                    self._send(404, {"error": {"message": "not found"}})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length)
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send(404, {"error": {"message": "not found"}})
+                    return
+                started = time.monotonic()
+                if server._throttle():
+                    server.stats.record_throttled()
+                    self._send(
+                        429,
+                        {"error": {"message": "rate limited", "type": "rate_limit"}},
+                        {"Retry-After": f"{server.retry_after:g}"},
+                    )
+                    return
+                try:
+                    body = json.loads(raw or b"{}")
+                except ValueError:
+                    self._send(400, {"error": {"message": "invalid json"}})
+                    return
+
+                time.sleep(server.latency.sample())
+                content = respond(body)
+                prompt = sum(
+                    estimate_tokens(message.get("content") or "")
+                    for message in body.get("messages") or []
+                )
+                completion = estimate_tokens(content)
+                model = body.get("model") or ""
+                server.stats.record(
+                    model, prompt, completion, time.monotonic() - started
+                )
+                self._send(
+                    200,
+                    {
+                        "id": f"mock-{server.stats.requests}",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": model,
+                        "choices": [
+                            {
+                                "index": 0,
+                                "message": {"role": "assistant", "content": content},
+                                "finish_reason": "stop",
+                            }
+                        ],
+                        "usage": {
+                            "prompt_tokens": prompt,
+                            "completion_tokens": completion,
+                            "total_tokens": prompt + completion,
+                        },
+                    },
+                )
+
+        return Handler
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline mock LLM server")
+    parser.add_argument("--host", default="127.0.0.1", help="Listen address")
+    parser.add_argument("--port", type=int, default=8765, help="Listen port")
+    parser.add_argument(
+        "--latency",
+        choices=["fixed", "uniform", "lognormal"],
+        default="fixed",
+        help="Latency distribution",
+    )
+    parser.add_argument(
+        "--latency-ms", type=float, default=200, help="Mean latency in milliseconds"
+    )
+    parser.add_argument(
+        "--spread",
+        type=float,
+        default=0.0,
+        help="Half-width in ms for uniform, log standard deviation for lognormal",
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Probability of a 429 response"
+    )
+    parser.add_argument(
+        "--rpm-limit", type=int, default=0, help="Requests per minute before 429"
+    )
+    parser.add_argument(
+        "--retry-after", type=float, default=1.0, help="Retry-After seconds on 429"
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    args = parser.parse_args()
+
+    spread = args.spread / 1000 if args.latency == "uniform" else args.spread
+    server = MockLLMServer(
+        args.host,
+        args.port,
+        LatencyModel(args.latency, args.latency_ms / 1000, spread, args.seed),
+        args.error_rate,
+        args.rpm_limit,
+        args.retry_after,
+        args.seed,
+    )
+    print(
+        f"Mock LLM server listening on {server.base_url} (Ark: {server.ark_base_url})"
+    )
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()